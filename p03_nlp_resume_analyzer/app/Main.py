@@ -7,16 +7,16 @@ import re
 import pandas as pd
 import plotly.express as px
 from pathlib import Path
-from io import BytesIO
 from datetime import datetime
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from typing import Dict
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # Import analyzer and helpers from nlp_core
-from scripts.nlp_core import analyze_resume_vs_jd, read_resume, load_skills_yaml, _flatten_skills, clean_text
+from scripts.nlp_core import IncrementalAnalyzer, generation_targets, read_resume_bytes
+from scripts.generation import submit_bullets
+from scripts.recommendations import COVERAGE_THRESHOLD, generate_recommendations
+from scripts.reports import submit_report
+from scripts.metrics import METRICS, start_metrics_server
 
 ROOT = Path(__file__).resolve().parent.parent
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -43,108 +43,82 @@ with st.sidebar.expander("🧭 Model Info"):
     • **Optional Generator:** `bigscience/bloomz-1b1`
     """)
 
+# Optional scrape endpoint: /metrics (Prometheus) and /metrics.json
+if os.getenv("NLP_METRICS_PORT"):
+    start_metrics_server(int(os.getenv("NLP_METRICS_PORT")))
+
+
+def render_latency_panel():
+    snap = METRICS.snapshot()
+    with st.sidebar.expander("⏱️ Stage Latency"):
+        if not snap["stages"]:
+            st.caption("No analyses timed yet.")
+            return
+        st.dataframe(
+            pd.DataFrame.from_dict(snap["stages"], orient="index")[["count", "p50_ms", "p90_ms", "p99_ms"]],
+            use_container_width=True,
+        )
+        for name, val in snap["counters"].items():
+            st.caption(f"{name}: {val:g}")
+        for cache, rate in snap["hit_rates"].items():
+            st.caption(f"{cache} hit rate: {rate:.1%}")
+        st.download_button("JSON", data=METRICS.to_json(), file_name="nlp_metrics.json", mime="application/json")
+        st.download_button("Prometheus", data=METRICS.to_prometheus(), file_name="nlp_metrics.prom", mime="text/plain")
+
 skills_yaml_default = taxonomy_path
 
 
-# ---------------- Utility: Dynamic recommendations ---------------- #
-def build_category_skill_map(yaml_path: str = skills_yaml_default) -> Dict[str, set]:
-    raw = load_skills_yaml(yaml_path)
-    if not raw:
-        return {}
-    mapping = {}
-    for cat, items in raw.items():
-        flat = _flatten_skills(items)
-        mapping[cat] = set([clean_text(s) for s in flat if s and isinstance(s, str)])
-    return mapping
-
-
-def infer_candidates_for_category(cat: str, out: dict, cat_skill_set: set) -> list:
-    cands = []
-    sem_missing = out.get("semantic_missing", []) or []
-    jd_kws = out.get("jd_keywords", []) or []
-
-    def matches_skill_set(token: str):
-        t = clean_text(token)
-        for s in cat_skill_set:
-            if not t or not s or len(t) < 3 or len(s) < 3:
-                continue
-            if t in s or s in t:
-                return True
-        return False
-
-    for tok in sem_missing:
-        if matches_skill_set(tok) and tok not in cands:
-            cands.append(tok)
-    if not cands:
-        for tok in jd_kws:
-            if matches_skill_set(tok) and tok not in cands:
-                cands.append(tok)
-    if not cands:
-        fallback = [t for t in sem_missing + jd_kws if len(clean_text(t)) > 3]
-        for t in fallback[:3]:
-            if t not in cands:
-                cands.append(t)
-    return cands
-
-
-def generate_recommendations(cov: dict, out: dict, yaml_path: str = skills_yaml_default) -> dict:
-    cat_map = build_category_skill_map(yaml_path)
-    recs = {}
-    threshold = 60.0
-
-    for cat, info in cov.items():
-        pct = info.get("coverage_pct", 0.0)
-        missing = info.get("missing", []) or []
-        recs[cat] = {"coverage_pct": pct, "missing": missing, "inferred": [], "suggestions": []}
-
-        if pct >= threshold:
-            continue
-
-        if missing:
-            candidates = missing
-        else:
-            cat_skill_set = cat_map.get(cat, set())
-            candidates = infer_candidates_for_category(cat, out, cat_skill_set)
-
-        if not missing:
-            recs[cat]["inferred"] = candidates
-
-        suggestions = []
-        for cand in candidates:
-            c = clean_text(cand)
-            if any(tok in c for tok in ["deploy", "deployment", "production", "monitor"]):
-                suggestion = "Emphasize model deployment and monitoring practices (MLOps)."
-                example = "💡 *Add a line like:* 'Deployed ML models with Docker and CI/CD; monitored drift with MLflow.'"
-            elif any(tok in c for tok in ["pipeline", "etl", "airflow", "data pipeline"]):
-                suggestion = "Highlight ETL pipelines and data orchestration supporting ML."
-                example = "💡 *Add a line like:* 'Built automated ETL pipelines and retraining workflows using Airflow.'"
-            elif any(tok in c for tok in ["aws", "gcp", "azure", "sagemaker", "vertex"]):
-                suggestion = "Show cloud ML experience (AWS, GCP, Azure)."
-                example = "💡 *Add a line like:* 'Trained and deployed ML models using AWS SageMaker and GCP Vertex AI.'"
-            elif any(tok in c for tok in ["git", "version", "ci", "cd"]):
-                suggestion = "Mention version control and CI/CD for reproducible ML workflows."
-                example = "💡 *Add a line like:* 'Used Git and CI/CD to manage model lifecycle and deployment automation.'"
-            elif any(tok in c for tok in ["metric", "validate", "test", "evaluation"]):
-                suggestion = "Include model evaluation and validation methods."
-                example = "💡 *Add a line like:* 'Performed cross-validation and tracked performance metrics to improve accuracy.'"
-            elif any(tok in c for tok in ["communicat", "collabor", "present"]):
-                suggestion = "Emphasize collaboration and stakeholder communication."
-                example = "💡 *Add a line like:* 'Partnered with engineering and product teams to translate insights into deployed ML systems.'"
-            else:
-                suggestion = f"Add or refine a bullet highlighting experience with **{cand}**."
-                example = f"💡 *Add a line like:* 'Applied {cand} in an end-to-end ML project to enhance predictive performance.'"
-            suggestions.append({"term": cand, "suggestion": suggestion, "example": example})
-
-        if not suggestions:
-            jd_kws = out.get("jd_keywords", []) or []
-            sample = jd_kws[:2]
-            if sample:
-                suggestion = f"The job emphasizes {', '.join(sample)} which aren't clearly reflected in your resume."
-                example = f"💡 *Add:* 'Worked with {', '.join(sample)} in production ML workflows.'"
-                suggestions.append({"term": ", ".join(sample), "suggestion": suggestion, "example": example})
-        recs[cat]["suggestions"] = suggestions
-
-    return recs
+def render_report_download():
+    if "report_error" in st.session_state:
+        st.error(f"Report rendering failed: {st.session_state['report_error']}")
+    elif "report_pdf" in st.session_state:
+        filename = f"resume_analysis_report_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
+        st.download_button("⬇️ Download PDF Report", data=st.session_state["report_pdf"], file_name=filename,
+                           mime="application/pdf")
+    elif "report_future" in st.session_state:
+        poll_report()
+
+
+@st.fragment(run_every=1)
+def poll_report():
+    # Only rendered while the report is pending; once done the page reruns without this fragment
+    future = st.session_state["report_future"]
+    if not future.done():
+        st.caption("Rendering report…")
+        return
+    try:
+        st.session_state["report_pdf"] = future.result()
+    except Exception as e:
+        st.session_state["report_error"] = str(e)
+    st.session_state.pop("report_future", None)
+    st.rerun()
+
+
+def render_suggested_bullets():
+    out = st.session_state.get("analysis_result") or {}
+    st.markdown("### ✨ Suggested Resume Bullets")
+    if "bullets_error" in st.session_state:
+        st.error(f"Bullet generation failed: {st.session_state['bullets_error']}")
+    elif "suggested_bullets" in out:
+        for b in out["suggested_bullets"]:
+            st.markdown(f"- {enforce_ml_caps(b)}")
+    elif "bullets_future" in st.session_state:
+        poll_bullets()
+
+
+@st.fragment(run_every=1)
+def poll_bullets():
+    # Polls the background generation; reruns only this fragment, and stops once the bullets are in
+    future = st.session_state["bullets_future"]
+    if not future.done():
+        st.caption("Generating bullets…")
+        return
+    try:
+        st.session_state["analysis_result"]["suggested_bullets"] = future.result()
+    except Exception as e:
+        st.session_state["bullets_error"] = str(e)
+    st.session_state.pop("bullets_future", None)
+    st.rerun()
 
 
 # ---------------- Main Inputs ---------------- #
@@ -157,12 +131,8 @@ with col2:
 
 # ---------------- File Handling ---------------- #
 if uploaded:
-    tmpdir = ROOT / "tmp_uploads"
-    tmpdir.mkdir(exist_ok=True)
-    upath = tmpdir / uploaded.name
-    with open(upath, "wb") as f:
-        f.write(uploaded.getbuffer())
-    resume_input = read_resume(str(upath))
+    # Parsed from memory; reruns with the same file are served from the content-hash cache
+    resume_input = read_resume_bytes(uploaded.getvalue(), uploaded.name)
     st.success(f"Loaded {uploaded.name}")
 
 # ---------------- Analysis ---------------- #
@@ -173,10 +143,18 @@ if st.button("🔍 Analyze"):
         st.warning("Please paste or upload a resume.")
     else:
         with st.spinner("Running analysis..."):
-            st.session_state["analysis_result"] = analyze_resume_vs_jd(resume_input, job_input, skills_yaml_default)
+            # Per-session paragraph memo: after an edit only the changed paragraphs are re-encoded
+            analyzer = st.session_state.setdefault("analyzer", IncrementalAnalyzer(skills_yaml_default))
+            result = analyzer.analyze(resume_input, job_input, generate_bullets=False)
+        # Bullets come from a slow remote model; generate them in the background and fill in below
+        st.session_state["analysis_result"] = result
+        for key in ("report_future", "report_pdf", "report_error", "bullets_error"):
+            st.session_state.pop(key, None)
+        st.session_state["bullets_future"] = submit_bullets(resume_input, job_input, generation_targets(result))
         st.success("Analysis complete ✅")
 
 out = st.session_state.get("analysis_result", None)
+render_latency_panel()
 
 # ---------------- Results Rendering ---------------- #
 if out:
@@ -225,7 +203,7 @@ if out:
     st.markdown("## 🎯 Targeted Skill Recommendations")
 
     recs = generate_recommendations(cov, out, skills_yaml_default)
-    improvement_cats = [c for c, v in recs.items() if v["coverage_pct"] < 60.0]
+    improvement_cats = [c for c, v in recs.items() if v["coverage_pct"] < COVERAGE_THRESHOLD]
 
     if improvement_cats:
         for cat in improvement_cats:
@@ -248,36 +226,14 @@ if out:
     else:
         st.success("🟩 No major skill gaps detected — resume aligns strongly with the JD!")
 
+    render_suggested_bullets()
+
     # ---------------- PDF Report ---------------- #
     st.markdown("---")
     st.subheader("📄 Downloadable Report")
     if st.button("Generate PDF Report"):
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer)
-        styles = getSampleStyleSheet()
-        story = []
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-        story.append(Paragraph(f"<b>Report generated:</b> {timestamp}", styles["Normal"]))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph(f"<b>Resume–JD Similarity:</b> {enforce_ml_caps(f'{similarity:.2f}%')}", styles["Normal"]))
-        avg_cov = df["Coverage (%)"].mean() if not df.empty else 0
-        story.append(Paragraph(f"<b>Average Taxonomy Coverage:</b> {avg_cov:.1f}%", styles["Normal"]))
-        story.append(Spacer(1, 12))
-
-        story.append(Paragraph("<b>Targeted Skill Recommendations:</b>", styles["Heading3"]))
-        for cat in improvement_cats:
-            meta = recs[cat]
-            story.append(Paragraph(f"<b>{cat.replace('_', ' ').title()}</b> — {meta['coverage_pct']:.1f}% coverage", styles["Normal"]))
-            if meta["missing"]:
-                story.append(Paragraph("Detected Gaps: " + ", ".join(meta["missing"]), styles["Normal"]))
-            if meta["inferred"]:
-                story.append(Paragraph("Inferred from JD: " + ", ".join(meta["inferred"]), styles["Normal"]))
-            for s in meta["suggestions"]:
-                story.append(Paragraph(f"- {s['term']}: {s['suggestion']}", styles["Normal"]))
-                story.append(Paragraph(f"  {s['example']}", styles["Normal"]))
-            story.append(Spacer(1, 8))
-
-        doc.build(story)
-        pdf_data = buffer.getvalue()
-        filename = f"resume_analysis_report_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
-        st.download_button("⬇️ Download PDF Report", data=pdf_data, file_name=filename, mime="application/pdf")
+        # Rendered off the script thread; bytes are cached per analysis result
+        st.session_state.pop("report_pdf", None)
+        st.session_state.pop("report_error", None)
+        st.session_state["report_future"] = submit_report(out, skills_yaml_default)
+    render_report_download()
@@ -0,0 +1,123 @@
+# scripts/batching.py
+
+"""
+Dynamic micro-batching of encoder calls across concurrent requests.
+
+`MicroBatcher` runs a configurable number of worker threads, each holding its
+own encoder. Callers enqueue texts and block on a Future. A worker takes the
+oldest pending call, then keeps collecting calls until the batch reaches
+`max_batch` texts or `max_wait` seconds have passed, and encodes them all in a
+single forward pass.
+
+`BatchingEncoder` gives the batcher the `SentenceTransformer.encode` signature
+and KeyBERT's `embed`, so it can be installed with
+`nlp_core.set_embed_encoder` and every embedding and KeyBERT call in the
+analyzer is batched.
+"""
+
+from typing import Callable, List, Optional
+from concurrent.futures import Future
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from scripts.metrics import METRICS, timer
+
+MAX_BATCH = int(os.getenv("NLP_BATCH_MAX_SIZE", "64"))
+MAX_WAIT_MS = float(os.getenv("NLP_BATCH_MAX_WAIT_MS", "10"))
+ENCODER_WORKERS = int(os.getenv("NLP_ENCODER_WORKERS", "1"))
+
+
+class MicroBatcher:
+    def __init__(self, encoder_factory: Callable, workers: int = ENCODER_WORKERS,
+                 max_batch: int = MAX_BATCH, max_wait: float = MAX_WAIT_MS / 1000, max_pending: int = 0):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._threads = []
+        for i in range(max(1, workers)):
+            # Each worker holds its own model instance, so forward passes run side by side
+            t = threading.Thread(target=self._worker, args=(encoder_factory(),), name=f"encoder-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    @property
+    def workers(self) -> int:
+        return len(self._threads)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, texts: List[str]) -> Future:
+        fut: Future = Future()
+        if not texts:
+            fut.set_result(np.zeros((0, 0), dtype=np.float32))
+            return fut
+        self._queue.put((list(texts), fut))
+        return fut
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return self.submit(texts).result()
+
+    def _collect(self) -> list:
+        first = self._queue.get()
+        batch, size = [first], len(first[0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _worker(self, encoder):
+        while True:
+            batch = self._collect()
+            texts = [t for texts, _ in batch for t in texts]
+            # Mean batch size = batch.texts / batch.calls
+            METRICS.incr("batch.calls")
+            METRICS.incr("batch.texts", len(texts))
+            try:
+                with timer("batch.encode"):
+                    embs = np.asarray(encoder.encode(texts, batch_size=self.max_batch, convert_to_numpy=True))
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            i = 0
+            for texts_i, fut in batch:
+                fut.set_result(embs[i:i + len(texts_i)])
+                i += len(texts_i)
+
+
+def _base_embedder():
+    # KeyBERT only accepts SentenceTransformer instances or BaseEmbedder subclasses
+    try:
+        from keybert.backend import BaseEmbedder
+        return BaseEmbedder
+    except Exception:
+        return object
+
+
+class BatchingEncoder(_base_embedder()):
+    """Encoder facade over a MicroBatcher: `encode` for nlp_core, `embed` for KeyBERT."""
+
+    def __init__(self, batcher: MicroBatcher):
+        self.embedding_model = None
+        self.batcher = batcher
+
+    def encode(self, sentences, batch_size: Optional[int] = None, convert_to_numpy: bool = True, **kwargs):
+        single = isinstance(sentences, str)
+        out = self.batcher.encode([sentences] if single else list(sentences))
+        return out[0] if single else out
+
+    def embed(self, documents, verbose: bool = False) -> np.ndarray:
+        return self.encode(list(documents))
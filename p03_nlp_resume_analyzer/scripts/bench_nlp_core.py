@@ -0,0 +1,369 @@
+# scripts/bench_nlp_core.py
+
+"""
+Offline benchmark suite for nlp_core.
+
+Generates synthetic resumes / JDs (1, 3 and 10 pages) and taxonomies (shipped
+skills.yaml up to 10x), then measures each public nlp_core function with cold
+and warm caches: wall time, throughput and peak RSS. Each case runs in a fresh
+interpreter, so its peak RSS (models and native buffers included) is its own
+rather than the high-water mark of every case before it. Results are written
+as JSON so two commits can be compared:
+
+    python scripts/bench_nlp_core.py --out bench_main.json
+    python scripts/bench_nlp_core.py --out bench_pr.json --compare bench_main.json
+
+Runs fully offline: real models are loaded from the local Hugging Face cache
+(HF_HUB_OFFLINE=1), or `--stand-in` swaps in a small hashing encoder so no
+model download is needed at all.
+"""
+
+import os
+
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+os.environ.pop("HF_API_TOKEN", None)  # bullets use the local template path
+os.environ.pop("NLP_TEXTGEN_URL", None)
+
+import argparse
+import gc
+import hashlib
+import json
+import platform
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts import doc_extract, nlp_core, phrase_store  # noqa: E402
+
+WORDS_PER_PAGE = 450
+PAGE_SIZES = (1, 3, 10)
+TAXONOMY_SCALES = (1, 3, 10)
+FILLER = (
+    "delivered measurable results across cross functional initiatives and owned the roadmap for "
+    "quarterly planning while mentoring junior colleagues on best practices for reliable delivery "
+    "partnered with stakeholders to define requirements and communicated progress in weekly reviews"
+).split()
+HEADINGS = ["SUMMARY", "EXPERIENCE", "PROJECTS", "SKILLS", "EDUCATION", "CERTIFICATIONS"]
+
+
+# ---------- STAND-IN MODELS ---------- #
+
+class HashingEncoder:
+    """Deterministic bag-of-hashed-tokens encoder with the SentenceTransformer.encode signature."""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.model_key = f"stand-in/hashing-{dim}"  # keeps its phrase vectors apart from the real model's
+
+    def _vec(self, text: str) -> np.ndarray:
+        v = np.zeros(self.dim, dtype=np.float32)
+        for tok in text.lower().split():
+            h = int(hashlib.md5(tok.encode("utf-8")).hexdigest()[:8], 16)
+            v[h % self.dim] += 1.0 if (h >> 16) & 1 else -1.0
+        n = np.linalg.norm(v)
+        return v / n if n else v
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_numpy: bool = True, **kwargs):
+        single = isinstance(sentences, str)
+        out = np.vstack([self._vec(s) for s in ([sentences] if single else sentences)])
+        return out[0] if single else out
+
+    # KeyBERT BaseEmbedder interface
+    def embed(self, documents, verbose: bool = False) -> np.ndarray:
+        return self.encode(list(documents))
+
+
+def install_stand_ins():
+    from keybert import KeyBERT
+    from keybert.backend import BaseEmbedder
+
+    class _Embedder(BaseEmbedder):
+        def __init__(self, encoder):
+            super().__init__()
+            self.encoder = encoder
+
+        def embed(self, documents, verbose=False):
+            return self.encoder.embed(documents, verbose)
+
+    encoder = HashingEncoder()
+    kw_model = KeyBERT(model=_Embedder(encoder))
+    nlp_core.load_embed_model = lambda name=nlp_core.EMBED_MODEL_NAME: encoder
+    nlp_core.load_kw_model = lambda embed_name=nlp_core.EMBED_MODEL_NAME: kw_model
+
+
+# ---------- SYNTHETIC DATA ---------- #
+
+def synthetic_taxonomy(scale: int, seed: int = 0) -> dict:
+    base = nlp_core.load_skills_yaml(nlp_core.taxonomy_path)
+    if scale <= 1:
+        return base
+    rng = random.Random(seed)
+    raw = {cat: list(nlp_core._flatten_skills(items)) for cat, items in base.items()}
+    target = sum(len(v) for v in raw.values()) * scale
+    seen = {s for v in raw.values() for s in v}
+    while len(seen) < target:
+        cat = rng.choice(list(raw))
+        skill = f"{rng.choice(list(seen))} {rng.choice(['platform', 'analysis', 'tooling', 'ops', 'design'])}"
+        if skill not in seen:
+            seen.add(skill)
+            raw[cat].append(skill)
+    return raw
+
+
+def synthetic_document(pages: int, skills: list, seed: int) -> str:
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(pages * 4):
+        lines.append(rng.choice(HEADINGS))
+        words = []
+        while len(words) < WORDS_PER_PAGE // 4:
+            words += rng.choice(skills).split() if rng.random() < 0.15 else [rng.choice(FILLER)]
+        lines.append(" ".join(words))
+        lines.append("")
+    return "\n".join(lines)
+
+
+# ---------- MEASUREMENT ---------- #
+
+def peak_rss_mb() -> float:
+    """This process's peak RSS: VmHWM on Linux, ru_maxrss elsewhere."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+def reset_caches(cache_root: Path):
+    """Cold state: drop loaded models and every nlp_core / doc_extract cache."""
+    for fn in (nlp_core.load_embed_model, nlp_core.load_kw_model, nlp_core.load_ner_model):
+        if hasattr(fn, "clear"):
+            fn.clear()
+    shutil.rmtree(cache_root, ignore_errors=True)
+    nlp_core._embed_cache = nlp_core.EmbeddingCache(root=cache_root / "embeddings")
+    # Work on a copy of the learned-term cache so benchmarking never rewrites data/
+    terms_copy = cache_root / "irrelevant_terms_cache.json"
+    if nlp_core.CACHE_PATH.exists():
+        shutil.copyfile(nlp_core.CACHE_PATH, terms_copy)
+    nlp_core._irrelevant_store = nlp_core.IrrelevantTermStore(path=terms_copy)
+    nlp_core._taxonomy_indexes.clear()
+    doc_extract.parse_cache = doc_extract.ParseCache(root=cache_root / "parsed")
+    phrase_store._store = phrase_store.PhraseEmbeddingStore(path=cache_root / "phrases.sqlite")
+    gc.collect()
+
+
+def measure(fn, words: int, repeat: int, cold_reset) -> dict:
+    cold_reset()
+    t0 = time.perf_counter()
+    fn()
+    cold_s = time.perf_counter() - t0
+
+    warm = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        warm.append(time.perf_counter() - t0)
+    warm_s = statistics.median(warm)
+    return {
+        "cold_ms": round(cold_s * 1000, 3),
+        "warm_ms": round(warm_s * 1000, 3),
+        "warm_min_ms": round(min(warm) * 1000, 3),
+        "calls_per_s": round(1 / warm_s, 2) if warm_s else None,
+        "words_per_s": round(words / warm_s, 1) if warm_s else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def build_cases(workdir: Path):
+    """(name, params, words, callable, setup) for each public function × document size × taxonomy size.
+
+    `setup` (or None) prepares a case's inputs outside the measurement, e.g.
+    the keywords that clean_keywords takes, so cases that don't need a model
+    never load one."""
+    base_skills = [s for v in nlp_core.load_skills_yaml(nlp_core.taxonomy_path).values() for s in nlp_core._flatten_skills(v)]
+    cases = []
+    for pages in PAGE_SIZES:
+        resume = synthetic_document(pages, base_skills, seed=pages)
+        jd = synthetic_document(max(1, pages // 3), base_skills, seed=100 + pages)
+        words = len(resume.split()) + len(jd.split())
+        resume_path = workdir / f"resume_{pages}p.txt"
+        resume_path.write_text(resume, encoding="utf-8")
+        kws: dict = {}
+
+        def prepare(j=jd, out=kws):
+            if "kws" not in out:
+                out["kws"] = [k for k, _ in nlp_core.extract_keywords(j, top_n=25)]
+        p = {"pages": pages}
+        cases += [
+            ("clean_text", p, words, lambda r=resume: nlp_core.clean_text(r)),
+            ("read_resume", p, words, lambda f=str(resume_path): nlp_core.read_resume(f)),
+            ("compute_similarity", p, words, lambda r=resume, j=jd: nlp_core.compute_similarity(r, j)),
+            ("extract_keywords", p, words, lambda j=jd: nlp_core.extract_keywords(j, top_n=25)),
+            ("find_missing_semantic", p, words, lambda r=resume, j=jd: nlp_core.find_missing_semantic(r, j)),
+            ("clean_keywords", p, words, lambda k=kws, j=jd: nlp_core.clean_keywords(k["kws"], j), prepare),
+            ("suggest_resume_bullets", p, words,
+             lambda r=resume, j=jd, k=kws: nlp_core.suggest_resume_bullets(r, j, k["kws"]), prepare),
+        ]
+        for scale in TAXONOMY_SCALES:
+            tax_path = workdir / f"skills_x{scale}.yaml"
+            if not tax_path.exists():
+                tax_path.write_text(yaml.safe_dump(synthetic_taxonomy(scale)), encoding="utf-8")
+            pt = {"pages": pages, "taxonomy_x": scale}
+            cases += [
+                ("taxonomy_coverage", pt, words, lambda r=resume, j=jd, t=str(tax_path): nlp_core.taxonomy_coverage(r, j, t)),
+                ("analyze_resume_vs_jd", pt, words, lambda r=resume, j=jd, t=str(tax_path): nlp_core.analyze_resume_vs_jd(r, j, t)),
+            ]
+        pool = [(f"r{i}", synthetic_document(pages, base_skills, seed=1000 + i)) for i in range(32)]
+        cases.append(("rank_resumes", {"pages": pages, "pool": len(pool)}, words * len(pool) // 2,
+                      lambda j=jd, pl=pool: nlp_core.rank_resumes(j, pl, batch_size=32)))
+    return [c if len(c) == 5 else (*c, None) for c in cases]
+
+
+def case_key(name: str, params: dict) -> str:
+    return name + "[" + ",".join(f"{k}={v}" for k, v in params.items()) + "]"
+
+
+def run_case(key: str, repeat: int, stand_in: bool) -> dict:
+    """Measure one case in a fresh interpreter, so its peak RSS is not inherited from earlier cases."""
+    cmd = [sys.executable, os.path.abspath(__file__), "--case", key, "--repeat", str(repeat)]
+    if stand_in:
+        cmd.append("--stand-in")
+    res = subprocess.run(cmd, capture_output=True, text=True)
+    if res.returncode != 0:
+        raise RuntimeError(f"{key} failed:\n{res.stderr[-2000:]}")
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+
+def measure_one(key: str, repeat: int):
+    """Child side of run_case: measure `key` and print its result as the last stdout line."""
+    workdir = Path(tempfile.mkdtemp(prefix="bench_nlp_"))
+    cache_root = workdir / "cache"
+    try:
+        reset_caches(cache_root)
+        name, params, words, fn, setup = next(c for c in build_cases(workdir) if case_key(c[0], c[1]) == key)
+        if setup:
+            setup()
+        m = measure(fn, words, repeat, lambda: reset_caches(cache_root))
+    finally:
+        nlp_core.get_irrelevant_store().flush()
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps(m))
+
+
+def measure_import(repeat: int) -> dict:
+    """Worker cold start: wall time of `import scripts.nlp_core` in a fresh interpreter."""
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    code = "import time; t = time.perf_counter(); import scripts.nlp_core; print(time.perf_counter() - t)"
+    times = []
+    for _ in range(max(1, repeat)):
+        res = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+        times.append(float(res.stdout.strip().splitlines()[-1]))
+    return {
+        "cold_ms": round(times[0] * 1000, 3),
+        "warm_ms": round(statistics.median(times) * 1000, 3),
+        "warm_min_ms": round(min(times) * 1000, 3),
+        "calls_per_s": None,
+        "words_per_s": None,
+        "peak_rss_mb": None,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(results: dict, baseline_path: str, tolerance: float) -> list:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {r["key"]: r for r in json.load(f)["results"]}
+    regressions = []
+    for r in results["results"]:
+        old = baseline.get(r["key"])
+        if not old or not old["warm_ms"]:
+            continue
+        ratio = r["warm_ms"] / old["warm_ms"]
+        r["vs_baseline"] = round(ratio, 3)
+        if ratio > 1 + tolerance:
+            regressions.append(f"{r['key']}: {old['warm_ms']:.2f} → {r['warm_ms']:.2f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--out", default="bench_nlp_core.json")
+    ap.add_argument("--compare", help="Baseline JSON from another commit")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="Allowed warm-time slowdown vs baseline")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--stand-in", action="store_true", help="Use a hashing encoder instead of MiniLM")
+    ap.add_argument("--only", nargs="*", help="Restrict to these function names")
+    ap.add_argument("--case", help=argparse.SUPPRESS)  # internal: measure one case in this process
+    args = ap.parse_args()
+
+    if args.stand_in:
+        install_stand_ins()
+    if args.case:
+        measure_one(args.case, args.repeat)
+        return
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_nlp_"))
+    cache_root = workdir / "cache"
+    try:
+        reset_caches(cache_root)
+        cases = [c for c in build_cases(workdir) if not args.only or c[0] in args.only]
+        results = []
+        if not args.only or "import" in args.only:
+            m = measure_import(args.repeat)
+            results.append({"key": "import[nlp_core]", "function": "import", "params": {}, **m})
+            print(f"🐍 import scripts.nlp_core (fresh interpreter): {m['warm_ms']:.1f} ms median\n")
+        print(f"{'function':<24} {'params':<28} {'cold ms':>10} {'warm ms':>10} {'words/s':>12} {'rss MB':>8}")
+        for name, params, words, _, _ in cases:
+            key = case_key(name, params)
+            m = run_case(key, args.repeat, args.stand_in)
+            results.append({"key": key, "function": name, "params": params, **m})
+            print(f"{name:<24} {json.dumps(params):<28} {m['cold_ms']:>10.1f} {m['warm_ms']:>10.2f} "
+                  f"{m['words_per_s'] or 0:>12,.0f} {m['peak_rss_mb']:>8.1f}")
+    finally:
+        nlp_core.get_irrelevant_store().flush()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "encoder": "stand-in" if args.stand_in else nlp_core.EMBED_MODEL_NAME,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.compare:
+        regressions = compare(report, args.compare, args.tolerance)
+        print(f"\n📊 Compared against {args.compare}: {len(regressions)} regression(s)")
+        for line in regressions:
+            print("  ⚠️", line)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved → {args.out}")
+    if args.compare and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# scripts/bench_taxonomy.py
+
+"""
+Benchmark the compiled TaxonomyIndex against the per-skill fuzz.partial_ratio scan.
+
+Builds synthetic taxonomies from the shipped skills.yaml up to 5,000 skills and
+times matching one ~2-page document against each. Skills planted in the
+document are the ground truth for recall; "matched" counts everything a
+matcher returned. Before timing, the index is checked for exact parity with the
+scan on the shipped skills.yaml, using documents that mention every skill
+verbatim and inflected ("hypothesis tests"); any difference exits non-zero
+unless the lossy NLP_TAXONOMY_NEAR_MISS_OVERLAP gate is enabled.
+
+    python scripts/bench_taxonomy.py --sizes 46 500 1000 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+from rapidfuzz import fuzz
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.nlp_core import (  # noqa: E402
+    NEAR_MISS_OVERLAP, TaxonomyIndex, _flatten_skills, clean_text, load_skills_yaml, taxonomy_path,
+)
+
+CONSONANTS, VOWELS = "bcdfghjklmnprstvwxz", "aeiou"
+VOCAB = [
+    "data", "cloud", "model", "pipeline", "stream", "graph", "vector", "search", "query", "cache",
+    "deploy", "monitor", "feature", "batch", "schema", "kernel", "sensor", "signal", "token", "agent",
+    "storage", "network", "security", "testing", "analytics", "forecast", "ranking", "retrieval",
+    "serving", "tuning", "privacy", "quality", "lineage", "catalog", "warehouse", "lakehouse",
+]
+
+
+def synthetic_taxonomy(n_skills: int, seed: int = 0) -> dict:
+    """Shipped taxonomy padded with made-up tool names and 2-word phrases up to n_skills."""
+    rng = random.Random(seed)
+    raw = {cat: list(_flatten_skills(items)) for cat, items in load_skills_yaml(taxonomy_path).items()}
+    seen = {s for items in raw.values() for s in items}
+    cats = list(raw.keys())
+    while len(seen) < n_skills:
+        name = "".join(rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(rng.randint(2, 4)))
+        skill = name if rng.random() < 0.6 else f"{name} {rng.choice(VOCAB)}"
+        if skill not in seen:
+            seen.add(skill)
+            raw[rng.choice(cats)].append(skill)
+    return raw
+
+
+def synthetic_document(raw: dict, n_words: int = 900, seed: int = 1):
+    """~2-page document of filler words with ~10% skill mentions; returns (text, planted skills)."""
+    rng = random.Random(seed)
+    skills = [s for items in raw.values() for s in items]
+    words, planted = [], set()
+    while len(words) < n_words:
+        if rng.random() < 0.1:
+            skill = rng.choice(skills)
+            planted.add(clean_text(skill))
+            words.extend(skill.split())
+        else:
+            words.append(rng.choice(VOCAB))
+    return clean_text(" ".join(words)), planted
+
+
+def scan_match(raw: dict, text_l: str, threshold: int) -> set:
+    """Previous implementation: re-flatten and partial_ratio every skill against the whole text."""
+    matched = set()
+    for items in raw.values():
+        for s in _flatten_skills(items):
+            s_clean = clean_text(s)
+            if s_clean and fuzz.partial_ratio(s_clean, text_l) >= threshold:
+                matched.add(s_clean)
+    return matched
+
+
+def inflect(skill: str) -> str:
+    """Crude inflection of a skill's last word: testing -> tests, model -> models."""
+    head, _, last = skill.rpartition(" ")
+    last = last[:-3] + "s" if last.endswith("ing") else last + "s"
+    return f"{head} {last}".strip()
+
+
+def parity_docs(raw: dict, seed: int = 2) -> list:
+    """Documents for the parity check: verbatim, inflected and mixed skill mentions."""
+    rng = random.Random(seed)
+    skills = [s for items in raw.values() for s in _flatten_skills(items)]
+    filler = lambda k: " ".join(rng.choice(VOCAB) for _ in range(k))  # noqa: E731
+    docs = [clean_text(f"{filler(5)} {s} {filler(5)}") for s in skills]
+    docs += [clean_text(f"we ran {inflect(s)} and built dashboards") for s in skills]
+    docs.append(clean_text(" ".join(inflect(s) if rng.random() < 0.5 else s for s in skills)))
+    return docs
+
+
+def check_parity(threshold: int) -> bool:
+    """TaxonomyIndex vs the per-skill scan on the shipped taxonomy; prints any difference."""
+    raw = load_skills_yaml(taxonomy_path)
+    index = TaxonomyIndex(raw)
+    docs = parity_docs(raw)
+    ok = True
+    for doc in docs:
+        fast = {s for found in index.match(doc, threshold).values() for s in found}
+        slow = scan_match(raw, doc, threshold)
+        if fast != slow:
+            ok = False
+            print(f"❌ parity: {doc[:60]!r} missing={sorted(slow - fast)} extra={sorted(fast - slow)}")
+    if ok:
+        print(f"✅ parity with the scan on {len(index)} shipped skills x {len(docs)} documents")
+    return ok
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[46, 500, 1000, 2500, 5000])
+    ap.add_argument("--threshold", type=int, default=70)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    if not check_parity(args.threshold) and NEAR_MISS_OVERLAP == 0:
+        sys.exit(1)
+
+    print(f"{'skills':>7} {'build ms':>9} {'index ms':>9} {'scan ms':>9} {'speedup':>8} "
+          f"{'recall idx/scan':>16} {'matched idx/scan':>17}")
+    for n in args.sizes:
+        raw = synthetic_taxonomy(n)
+        doc, planted = synthetic_document(raw)
+
+        t0 = time.perf_counter()
+        index = TaxonomyIndex(raw)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            fast = {s for found in index.match(doc, args.threshold).values() for s in found}
+        index_ms = (time.perf_counter() - t0) * 1000 / args.repeat
+
+        t0 = time.perf_counter()
+        slow = scan_match(raw, doc, args.threshold)
+        scan_ms = (time.perf_counter() - t0) * 1000
+
+        recall = f"{len(fast & planted) / len(planted):.3f}/{len(slow & planted) / len(planted):.3f}"
+        matched = f"{len(fast)}/{len(slow)}"
+        print(f"{len(index):>7} {build_ms:>9.1f} {index_ms:>9.2f} {scan_ms:>9.1f} {scan_ms / index_ms:>7.1f}x "
+              f"{recall:>16} {matched:>17}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# scripts/bulk_reports.py
+
+"""
+Render PDF reports for a batch of analysis results.
+
+Reads a JSONL file of results (e.g. the output of `rank_resumes.py --out
+scores.jsonl`, or saved `analyze_resume_vs_jd` dicts) and writes one PDF per
+line, rendered in a process pool. Results rendered before are served from the
+report cache.
+
+    python scripts/bulk_reports.py --results scores.jsonl --out-dir reports/
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.nlp_core import taxonomy_path  # noqa: E402
+from scripts.reports import REPORT_WORKERS, render_reports_bulk  # noqa: E402
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Render PDF reports for a batch of analysis results.")
+    ap.add_argument("--results", required=True, help="JSONL file with one analysis result per line")
+    ap.add_argument("--out-dir", required=True, help="Directory for the PDF reports")
+    ap.add_argument("--skills", default=taxonomy_path, help="Skill taxonomy YAML")
+    ap.add_argument("--batch-size", type=int, default=REPORT_WORKERS * 8)
+    return ap.parse_args()
+
+
+def _file_name(result: dict, line_no: int) -> str:
+    stem = os.path.splitext(os.path.basename(str(result.get("id", ""))))[0]
+    stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", stem) or f"result_{line_no}"
+    return f"{line_no:05d}_{stem}.pdf"
+
+
+def _write(batch, out_dir, skills) -> int:
+    pdfs = render_reports_bulk([r for _, r in batch], skills)
+    for (line_no, r), data in zip(batch, pdfs):
+        with open(os.path.join(out_dir, _file_name(r, line_no)), "wb") as f:
+            f.write(data)
+    return len(batch)
+
+
+def main():
+    args = parse_args()
+    os.makedirs(args.out_dir, exist_ok=True)
+    done, start, batch = 0, time.perf_counter(), []
+    print(f"🚀 Rendering reports from {args.results} ({REPORT_WORKERS} workers)...")
+    with open(args.results, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            batch.append((line_no, json.loads(line)))
+            if len(batch) >= args.batch_size:
+                done += _write(batch, args.out_dir, args.skills)
+                batch = []
+                print(f"✅ {done:,} reports ({done / (time.perf_counter() - start):.1f}/s)")
+    if batch:
+        done += _write(batch, args.out_dir, args.skills)
+    print(f"💾 {done:,} reports → {args.out_dir} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
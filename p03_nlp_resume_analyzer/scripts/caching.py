@@ -0,0 +1,77 @@
+# scripts/caching.py
+
+"""
+Pluggable resource cache for model loaders.
+
+`cache_resource` uses `st.cache_resource` when the code runs inside a Streamlit
+app, and a plain thread-safe process cache everywhere else (batch jobs, worker
+processes, benchmarks), so the core never needs Streamlit installed. The
+backend is checked on every call; `set_cache_backend` forces one.
+"""
+
+from typing import Callable, Dict, Optional
+from functools import wraps
+import inspect
+import sys
+import threading
+
+_forced_backend: Optional[str] = None
+
+
+def set_cache_backend(name: Optional[str]):
+    """Force "streamlit" or "process"; None restores auto-detection."""
+    global _forced_backend
+    _forced_backend = name
+
+
+def _streamlit_active() -> bool:
+    # Only look if the app already imported Streamlit; never import it here
+    if "streamlit" not in sys.modules:
+        return False
+    try:
+        from streamlit import runtime
+        return runtime.exists()
+    except Exception:
+        return False
+
+
+def active_backend() -> str:
+    if _forced_backend:
+        return _forced_backend
+    return "streamlit" if _streamlit_active() else "process"
+
+
+def cache_resource(fn: Callable) -> Callable:
+    """Memoize a loader by its arguments; exposes `.clear()` like `st.cache_resource`."""
+    store: Dict = {}
+    lock = threading.Lock()
+    st_cached: Dict[str, Callable] = {}
+    sig = inspect.signature(fn)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if active_backend() == "streamlit":
+            if "fn" not in st_cached:
+                import streamlit as st
+                st_cached["fn"] = st.cache_resource(fn)
+            return st_cached["fn"](*args, **kwargs)
+
+        # Normalize so f(), f(default) and f(name=default) share one entry
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(bound.arguments.items())
+        if key in store:
+            return store[key]
+        with lock:
+            if key not in store:
+                store[key] = fn(*args, **kwargs)
+            return store[key]
+
+    def clear():
+        with lock:
+            store.clear()
+        if "fn" in st_cached:
+            st_cached["fn"].clear()
+
+    wrapper.clear = clear
+    return wrapper
@@ -0,0 +1,126 @@
+# scripts/check_backend_parity.py
+
+"""
+Score parity of the ONNX / int8 embedding backends against PyTorch fp32.
+
+Encodes a fixture set of resume/JD pairs with every backend, then reports the
+drift of the resume–JD similarity score (in percentage points, as shown in the
+app), the embedding cosine to fp32, latency per encode and peak RSS. Each
+backend runs in its own interpreter, so its peak RSS covers only that model.
+Exits non-zero when any score drifts more than --tolerance points.
+
+    python scripts/check_backend_parity.py --backends onnx onnx-int8
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.nlp_core import EMBED_MODEL_NAME, chunk_text, chunked_similarity, load_embed_model  # noqa: E402
+
+FIXTURES = [
+    ("Data scientist with 5 years of Python, SQL and scikit-learn. Built churn models and A/B tests.",
+     "Seeking a data scientist skilled in Python, machine learning and experimentation."),
+    ("Machine learning engineer: PyTorch, MLflow, Docker, Kubernetes. Deployed models to production on AWS.",
+     "MLOps engineer to own model deployment, monitoring and CI/CD on AWS SageMaker."),
+    ("Data analyst experienced with Tableau, Power BI and Excel dashboards for finance stakeholders.",
+     "Analyst needed for executive reporting in Tableau; strong communication skills required."),
+    ("Backend developer in Go and Java, designing REST APIs and PostgreSQL schemas.",
+     "Looking for a data engineer to build Airflow pipelines and dbt models in Snowflake."),
+    ("NLP researcher: transformers, BERT fine-tuning, spaCy pipelines, information extraction.",
+     "Applied scientist for search relevance, embeddings and semantic retrieval."),
+    ("Registered nurse with ICU experience, patient triage and care coordination.",
+     "Senior data scientist for forecasting demand with time-series models."),
+    ("Cloud architect: Azure, Terraform, networking, identity and cost optimisation.",
+     "Platform engineer with GCP, Terraform and Kubernetes expertise."),
+    ("Product manager who led analytics roadmap, defined KPIs and partnered with data science.",
+     "Data product manager to define metrics and collaborate with ML engineers."),
+]
+
+
+def peak_rss_mb() -> float:
+    """This process's peak RSS: VmHWM on Linux, ru_maxrss elsewhere."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def score_fixtures(backend: str, name: str):
+    model = load_embed_model(name, backend)
+    scores, embs, times = [], [], []
+    for resume, jd in FIXTURES:
+        r_chunks, j_chunks = chunk_text(resume), chunk_text(jd)
+        t0 = time.perf_counter()
+        e = model.encode(r_chunks + j_chunks, convert_to_numpy=True)
+        times.append(time.perf_counter() - t0)
+        scores.append(chunked_similarity(e[:len(r_chunks)], e[len(r_chunks):]))
+        embs.append(e)
+    return np.array(scores), embs, times
+
+
+def score_in_subprocess(backend: str, name: str):
+    """score_fixtures in a fresh interpreter; returns (scores, embs, times, peak RSS MB)."""
+    cmd = [sys.executable, os.path.abspath(__file__), "--score-backend", backend, "--model", name]
+    res = subprocess.run(cmd, capture_output=True, text=True)
+    if res.returncode != 0:
+        raise RuntimeError(f"{backend} failed:\n{res.stderr[-2000:]}")
+    out = json.loads(res.stdout.strip().splitlines()[-1])
+    return np.array(out["scores"]), [np.array(e) for e in out["embs"]], out["times"], out["rss_mb"]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--backends", nargs="+", default=["onnx", "onnx-int8"])
+    ap.add_argument("--model", default=EMBED_MODEL_NAME)
+    ap.add_argument("--tolerance", type=float, default=1.0, help="Max allowed score drift (points)")
+    ap.add_argument("--score-backend", help=argparse.SUPPRESS)  # internal: score one backend in this process
+    args = ap.parse_args()
+
+    if args.score_backend:
+        scores, embs, times = score_fixtures(args.score_backend, args.model)
+        print(json.dumps({"scores": scores.tolist(), "embs": [e.tolist() for e in embs], "times": times,
+                          "rss_mb": peak_rss_mb()}))
+        return
+
+    base_scores, base_embs, base_times, base_rss = score_in_subprocess("torch", args.model)
+    print(f"🔥 torch fp32: {np.median(base_times) * 1000:.1f} ms/encode, peak RSS {base_rss:.0f} MB")
+
+    failed = False
+    for backend in args.backends:
+        scores, embs, times, rss = score_in_subprocess(backend, args.model)
+        drift = np.abs(scores - base_scores)
+        cos = [
+            float(np.mean(np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))))
+            for a, b in zip(embs, base_embs)
+        ]
+        speedup = np.median(base_times) / np.median(times)
+        print(f"\n⚙️  {backend}: {np.median(times) * 1000:.1f} ms/encode ({speedup:.2f}x vs fp32), "
+              f"peak RSS {rss:.0f} MB ({rss - base_rss:+.0f} MB vs fp32)")
+        print(f"   score drift: max {drift.max():.2f} / mean {drift.mean():.2f} points; "
+              f"embedding cosine to fp32: min {min(cos):.4f}")
+        for (resume, _), a, b in zip(FIXTURES, base_scores, scores):
+            print(f"   {a:6.2f} → {b:6.2f}  {resume[:60]}")
+        if drift.max() > args.tolerance:
+            failed = True
+            print(f"   ❌ drift exceeds {args.tolerance} points")
+        else:
+            print("   ✅ within tolerance")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
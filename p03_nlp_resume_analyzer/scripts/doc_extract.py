@@ -0,0 +1,225 @@
+# scripts/doc_extract.py
+
+"""
+Document extraction for resume uploads (PDF / DOCX / text).
+
+- PDFs with at least PARALLEL_PAGE_THRESHOLD pages are split into page ranges
+  and parsed in a shared process pool; smaller ones stay on the calling thread.
+- `iter_pages` streams page texts in order as they are parsed, so downstream
+  stages can start before the whole document is done.
+- Parsed pages are cached by sha256 of the file contents (in-memory LRU backed
+  by CACHE_DIR/parsed), so re-running on the same file never re-parses it.
+- Uploads are parsed straight from their bytes (`extract_document_bytes`) and
+  cached in memory only, so nothing user-supplied is written to disk.
+"""
+
+from typing import Iterator, List, Optional, Union
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+
+# CONFIGURATION
+CACHE_DIR = Path(".cache_nlp")  # same root as nlp_core.CACHE_DIR
+PARSE_CACHE_DIR = CACHE_DIR / "parsed"
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv("NLP_PARSE_CACHE_MAX_ENTRIES", "256"))
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("NLP_PDF_PARALLEL_PAGES", "8"))
+PAGES_PER_TASK = 4
+PDF_WORKERS = int(os.getenv("NLP_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+# ---------- PDF PAGE EXTRACTION ---------- #
+
+def _load_pdfplumber():
+    # Optional dependency, imported on first use to keep module import cheap
+    try:
+        import pdfplumber
+        return pdfplumber
+    except Exception:
+        return None
+
+
+# A document is a file path or its raw bytes (uploads)
+Source = Union[str, bytes]
+
+
+def _open_source(source: Source):
+    return BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+
+def _extract_page_range(source: Source, start: int, stop: int) -> List[str]:
+    """Worker: text of pages [start, stop) — runs in the process pool."""
+    pdfplumber = _load_pdfplumber()
+    with pdfplumber.open(_open_source(source)) as pdf:
+        return [pdf.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+        return _pool
+
+
+def iter_pdf_pages(source: Source, parallel_threshold: int = PARALLEL_PAGE_THRESHOLD) -> Iterator[str]:
+    """Yield page texts in order; page ranges are parsed in the process pool for long PDFs."""
+    pdfplumber = _load_pdfplumber()
+    if pdfplumber is None:
+        return
+    with pdfplumber.open(_open_source(source)) as pdf:
+        n_pages = len(pdf.pages)
+        if n_pages < parallel_threshold or PDF_WORKERS < 2:
+            for p in pdf.pages:
+                yield p.extract_text() or ""
+            return
+
+    pool = get_pdf_pool()
+    futures = [
+        pool.submit(_extract_page_range, source, start, min(start + PAGES_PER_TASK, n_pages))
+        for start in range(0, n_pages, PAGES_PER_TASK)
+    ]
+    for fut in futures:
+        yield from fut.result()
+
+
+def iter_docx_pages(source: Source) -> Iterator[str]:
+    try:
+        import docx
+    except Exception:
+        return
+    d = docx.Document(_open_source(source))
+    yield "\n".join([p.text for p in d.paragraphs if p.text])
+
+
+# ---------- PARSE CACHE ---------- #
+
+class ParseCache:
+    """sha256(content) -> page texts; bounded in-memory LRU with a JSON copy on disk."""
+
+    def __init__(self, root: Path = PARSE_CACHE_DIR, max_entries: int = PARSE_CACHE_MAX_ENTRIES):
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self._mem: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[List[str]]:
+        with self._lock:
+            if digest in self._mem:
+                self._mem.move_to_end(digest)
+                return self._mem[digest]
+        try:
+            with open(self.root / f"{digest}.json", "r", encoding="utf-8") as f:
+                pages = json.load(f)
+        except Exception:
+            return None
+        self._remember(digest, pages)
+        return pages
+
+    def put(self, digest: str, pages: List[str], persist: bool = True):
+        self._remember(digest, pages)
+        if not persist:
+            return
+        tmp = self.root / f".{digest}.{os.getpid()}.tmp"
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(pages, f)
+            os.replace(tmp, self.root / f"{digest}.json")
+        except Exception:
+            tmp.unlink(missing_ok=True)
+        self._evict_disk()
+
+    def _remember(self, digest: str, pages: List[str]):
+        with self._lock:
+            self._mem[digest] = pages
+            self._mem.move_to_end(digest)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+
+    def _evict_disk(self):
+        entries = []
+        for p in self.root.glob("*.json"):
+            try:
+                entries.append((p.stat().st_mtime, p))
+            except FileNotFoundError:
+                continue  # evicted by another process since the glob
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, p in entries[: len(entries) - self.max_entries]:
+            p.unlink(missing_ok=True)
+
+
+parse_cache = ParseCache()
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# ---------- PUBLIC API ---------- #
+
+def _iter_uncached(source: Source, ext: str) -> Iterator[str]:
+    if ext == ".pdf":
+        yield from iter_pdf_pages(source)
+    elif ext in [".docx", ".doc"]:
+        yield from iter_docx_pages(source)
+    elif isinstance(source, (bytes, bytearray)):
+        yield bytes(source).decode("utf-8", errors="ignore")
+    else:
+        yield Path(source).read_text(encoding="utf-8", errors="ignore")
+
+
+def iter_pages(path: str) -> Iterator[str]:
+    """Stream page texts of a document; served from the parse cache when the content was seen before."""
+    p = Path(path)
+    if not p.exists():
+        return
+    digest = file_digest(str(p))
+    cached = parse_cache.get(digest)
+    if cached is not None:
+        yield from cached
+        return
+    pages = []
+    for page in _iter_uncached(str(p), p.suffix.lower()):
+        pages.append(page)
+        yield page
+    parse_cache.put(digest, pages)
+
+
+def extract_document(path: str) -> str:
+    """Full text of a PDF / DOCX / text file (non-empty pages joined by newlines)."""
+    return "\n".join(page for page in iter_pages(path) if page)
+
+
+def iter_pages_bytes(data: bytes, filename: str) -> Iterator[str]:
+    """Stream page texts of an in-memory upload; the type comes from `filename`'s extension.
+    Cached in memory only (by content hash), so identical uploads are parsed once."""
+    digest = hashlib.sha256(data).hexdigest()
+    cached = parse_cache.get(digest)
+    if cached is not None:
+        yield from cached
+        return
+    pages = []
+    for page in _iter_uncached(data, Path(filename).suffix.lower()):
+        pages.append(page)
+        yield page
+    parse_cache.put(digest, pages, persist=False)
+
+
+def extract_document_bytes(data: bytes, filename: str) -> str:
+    """Full text of an uploaded PDF / DOCX / text file, parsed from memory."""
+    return "\n".join(page for page in iter_pages_bytes(data, filename) if page)
@@ -0,0 +1,58 @@
+# scripts/embed_backends.py
+
+"""
+CPU inference backends for the sentence embedding model.
+
+- "torch":     PyTorch fp32 (default, reference scores)
+- "onnx":      ONNX Runtime export of the same weights
+- "onnx-int8": ONNX Runtime with dynamically int8-quantized weights
+
+All three return a `SentenceTransformer`, so KeyBERT and `encode` callers work
+unchanged. The ONNX exports are built once and kept under CACHE_DIR/onnx.
+Select with NLP_EMBED_BACKEND; check score drift with
+`python scripts/check_backend_parity.py`.
+"""
+
+from pathlib import Path
+import os
+import re
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+EMBED_BACKEND = os.getenv("NLP_EMBED_BACKEND", "torch")
+# avx2 runs on practically every x86 server; use avx512_vnni / arm64 where available
+ONNX_QUANT_CONFIG = os.getenv("NLP_ONNX_QUANT_CONFIG", "avx2")
+ONNX_DIR = Path(".cache_nlp") / "onnx"
+
+
+def _export_dir(name: str) -> Path:
+    return ONNX_DIR / re.sub(r"[^A-Za-z0-9_.-]+", "__", name)
+
+
+def _quantized_file(config: str) -> str:
+    return f"onnx/model_qint8_{config}.onnx"
+
+
+def build_quantized_export(name: str, config: str = ONNX_QUANT_CONFIG) -> Path:
+    """Export `name` to ONNX and write a dynamically int8-quantized copy next to it (once)."""
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    out = _export_dir(name)
+    if (out / _quantized_file(config)).exists():
+        return out
+    model = SentenceTransformer(name, backend="onnx")
+    model.save(str(out))
+    export_dynamic_quantized_onnx_model(model, config, str(out))
+    return out
+
+
+def load_sentence_encoder(name: str, backend: str = EMBED_BACKEND):
+    from sentence_transformers import SentenceTransformer
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {BACKENDS}")
+    if backend == "torch":
+        return SentenceTransformer(name)
+    if backend == "onnx":
+        return SentenceTransformer(name, backend="onnx")
+    path = build_quantized_export(name, ONNX_QUANT_CONFIG)
+    return SentenceTransformer(str(path), backend="onnx", model_kwargs={"file_name": _quantized_file(ONNX_QUANT_CONFIG)})
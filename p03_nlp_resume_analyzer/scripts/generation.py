@@ -0,0 +1,170 @@
+# scripts/generation.py
+
+"""
+Time-bounded, cached resume-bullet generation.
+
+Generation calls the text-generation endpoint (HF Inference API wire format:
+POST {"inputs", "parameters"} → [{"generated_text"}]) from a background asyncio
+loop under a hard deadline. When the deadline passes or the call fails, the
+template bullets are returned instead, so a slow model never blocks analysis.
+Successful responses are cached on disk by sha256(endpoint + model + prompt),
+so switching NLP_TEXTGEN_URL (e.g. to the stand-in) never serves stale bullets.
+
+`submit_bullets` returns a `concurrent.futures.Future` right away, which lets
+the app render the rest of the analysis and fill the bullets in afterwards.
+Point NLP_TEXTGEN_URL at `scripts/textgen_standin.py` to test without a token.
+"""
+
+from typing import List, Optional
+from concurrent.futures import Future
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import urllib.request
+
+from scripts.metrics import METRICS, timer
+
+HF_TEXTGEN_MODEL = "HuggingFaceH4/zephyr-7b-beta"
+HF_API_TOKEN = os.getenv("HF_API_TOKEN", None)
+TEXTGEN_URL = os.getenv("NLP_TEXTGEN_URL") or f"https://api-inference.huggingface.co/models/{HF_TEXTGEN_MODEL}"
+# The remote call is only attempted with a token or an explicitly configured endpoint
+TEXTGEN_ENABLED = bool(HF_API_TOKEN or os.getenv("NLP_TEXTGEN_URL"))
+GENERATION_DEADLINE = float(os.getenv("NLP_GENERATION_DEADLINE_SECONDS", "8"))
+MAX_BULLETS = 6
+
+
+def _build_generation_prompt(resume_text: str, jd_text: str, missing_skills: List[str]) -> str:
+    mk = ", ".join(missing_skills) if missing_skills else "none"
+    return (
+        "You are an AI resume coach. "
+        "Given a resume and a job description, write 3–6 short action-oriented resume bullets "
+        "that incorporate the missing skills where possible.\n\n"
+        f"Job Description:\n{jd_text}\n\n"
+        f"Resume:\n{resume_text}\n\n"
+        f"Missing skills to emphasize: {mk}\n\nBullets:\n-"
+    )
+
+
+def template_bullets(missing_skills: List[str]) -> List[str]:
+    return [f"Demonstrated expertise in {s} through data-driven projects." for s in missing_skills[:MAX_BULLETS]]
+
+
+def parse_bullets(text: str) -> List[str]:
+    return [ln.strip("-• ").strip() for ln in text.splitlines() if ln.strip("-• ").strip()][:MAX_BULLETS]
+
+
+# ---------- RESPONSE CACHE ---------- #
+
+class GenerationCache:
+    """Generated bullets on disk, one JSON file per sha256(endpoint + model + prompt)."""
+
+    def __init__(self, root: Path = Path(".cache_nlp") / "generations"):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(prompt: str, model: str = HF_TEXTGEN_MODEL, url: str = TEXTGEN_URL) -> str:
+        return hashlib.sha256(f"{url}\x00{model}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        try:
+            return json.loads((self.root / f"{key}.json").read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    def put(self, key: str, bullets: List[str]):
+        path = self.root / f"{key}.json"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(bullets), encoding="utf-8")
+            os.replace(tmp, path)
+        except Exception:
+            tmp.unlink(missing_ok=True)
+
+
+_generation_cache: Optional[GenerationCache] = None
+
+
+def get_generation_cache() -> GenerationCache:
+    global _generation_cache
+    if _generation_cache is None:
+        _generation_cache = GenerationCache()
+    return _generation_cache
+
+
+# ---------- ASYNC GENERATION ---------- #
+
+def _post_textgen(prompt: str, timeout: float) -> str:
+    body = json.dumps({
+        "inputs": prompt,
+        "parameters": {"max_new_tokens": 200, "return_full_text": False},
+    }).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if HF_API_TOKEN:
+        headers["Authorization"] = f"Bearer {HF_API_TOKEN}"
+    req = urllib.request.Request(TEXTGEN_URL, data=body, headers=headers, method="POST")
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        result = json.loads(resp.read().decode("utf-8"))
+    if isinstance(result, list):
+        result = result[0] if result else {}
+    return result.get("generated_text", "") if isinstance(result, dict) else str(result)
+
+
+async def generate_bullets_async(
+    resume_text: str, jd_text: str, missing_skills: List[str], deadline: float = GENERATION_DEADLINE
+) -> List[str]:
+    """Generated bullets, or the template bullets if the endpoint misses `deadline` seconds."""
+    fallback = template_bullets(missing_skills)
+    if not TEXTGEN_ENABLED:
+        return fallback
+
+    prompt = _build_generation_prompt(resume_text, jd_text, missing_skills)
+    cache = get_generation_cache()
+    key = cache.key(prompt)
+    cached = cache.get(key)
+    if cached:
+        METRICS.incr("generation_cache.hits")
+        return cached
+    METRICS.incr("generation_cache.misses")
+
+    try:
+        with timer("generation.hf_call"):
+            # The socket timeout stops the worker thread soon after wait_for gives up on it
+            text = await asyncio.wait_for(asyncio.to_thread(_post_textgen, prompt, deadline), deadline)
+    except asyncio.TimeoutError:
+        METRICS.incr("generation.timeouts")
+        return fallback
+    except Exception:
+        METRICS.incr("generation.errors")
+        return fallback
+
+    bullets = parse_bullets(text)
+    if not bullets:
+        return fallback
+    cache.put(key, bullets)
+    return bullets
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _generation_loop() -> asyncio.AbstractEventLoop:
+    """One event loop per process on a daemon thread, shared by every caller."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="bullet-generation", daemon=True).start()
+    return _loop
+
+
+def submit_bullets(
+    resume_text: str, jd_text: str, missing_skills: List[str], deadline: float = GENERATION_DEADLINE
+) -> Future:
+    """Start generation in the background and return a Future of the bullet list."""
+    coro = generate_bullets_async(resume_text, jd_text, missing_skills, deadline)
+    return asyncio.run_coroutine_threadsafe(coro, _generation_loop())
@@ -0,0 +1,255 @@
+# scripts/jd_index.py
+
+"""
+Job-description corpus index: "top-k jobs for this resume".
+
+JDs are embedded in batches with `load_embed_model` and stored in a FAISS
+index wrapped in IndexIDMap2, so jobs can be added, replaced and removed by
+id without a rebuild. JD texts and metadata live next to it in SQLite. A query
+retrieves a shortlist by cosine similarity. Taxonomy coverage is computed for
+the shortlisted jobs only, and they are reranked on a blend of both scores.
+Each job is one whole-document vector, so its similarity matches the default
+NLP_SIMILARITY_MODE=full scores of `analyze_resume_vs_jd`.
+
+The default index is exact inner product ("IDMap2,Flat"). Any factory string
+whose index supports `remove_ids` works (e.g. "IDMap2,IVF1024,Flat"); specs
+without an IDMap prefix are wrapped in IndexIDMap2. Indexes
+that need training buffer added jobs until there are 39 per IVF list (faiss's
+recommended minimum), or until the input ends, and train on all of them; a
+corpus with fewer JDs than lists is rejected with a ValueError. HNSW does not
+support removal.
+
+Jobs are committed to SQLite before the index file is saved. On open, jobs
+without a vector in the saved index are re-encoded and vectors of deleted jobs
+are dropped, so an interrupted run never leaves the two out of step.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from pathlib import Path
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from scripts.metrics import timed, timer
+from scripts.nlp_core import (
+    BASE_DIR, EMBED_MODEL_NAME, _coverage_from_matches, clean_text, coverage_mean_pct, load_embed_model,
+    load_taxonomy_index, taxonomy_path,
+)
+
+JD_INDEX_DIR = Path(os.getenv("NLP_JD_INDEX_DIR", os.path.join(BASE_DIR, "data", "jd_index")))
+JD_INDEX_SPEC = os.getenv("NLP_JD_INDEX_SPEC", "IDMap2,Flat")
+JD_INDEX_NPROBE = int(os.getenv("NLP_JD_INDEX_NPROBE", "16"))  # IVF lists probed per query
+RERANK_WEIGHT = float(os.getenv("NLP_JD_RERANK_WEIGHT", "0.3"))  # share of taxonomy coverage in the final score
+
+
+class JDIndex:
+    def __init__(self, root: Path = JD_INDEX_DIR, spec: str = JD_INDEX_SPEC, model_name: str = EMBED_MODEL_NAME):
+        import faiss
+
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "jobs.faiss"
+        self.spec = spec
+        self.model_name = model_name
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.root / "jobs.sqlite"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY, job_id TEXT UNIQUE NOT NULL, "
+            "text TEXT NOT NULL, meta TEXT)"
+        )
+        self.index = faiss.read_index(str(self.index_path)) if self.index_path.exists() else None
+        # job_id -> (text, meta, embedding) waiting for an untrained index to see enough vectors
+        self._pending: Dict[str, Tuple[str, Optional[Dict], np.ndarray]] = {}
+        self._set_nprobe()
+        self._reconcile()
+
+    def __len__(self) -> int:
+        return self.index.ntotal if self.index is not None else 0
+
+    def _new_index(self, dim: int):
+        import faiss
+        index = faiss.index_factory(dim, self.spec, faiss.METRIC_INNER_PRODUCT)
+        return index if hasattr(index, "id_map") else faiss.IndexIDMap2(index)
+
+    def _index_ids(self) -> set:
+        """Job ids stored in the index (IDMap id table, or the inverted lists of a bare IVF index)."""
+        import faiss
+        if self.index is None:
+            return set()
+        if hasattr(self.index, "id_map"):
+            return set(faiss.vector_to_array(self.index.id_map).tolist())
+        ivf = faiss.extract_index_ivf(self.index)  # saved before specs were IDMap-wrapped
+        ids = set()
+        for lst in range(ivf.nlist):
+            n = ivf.invlists.list_size(lst)
+            if n:
+                ids.update(faiss.rev_swig_ptr(ivf.invlists.get_ids(lst), n).tolist())
+        return ids
+
+    def _set_nprobe(self):
+        import faiss
+        try:
+            faiss.extract_index_ivf(self.index).nprobe = JD_INDEX_NPROBE
+        except Exception:
+            pass  # flat (or missing) index: nothing to tune
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        with timer("jd_index.encode"):
+            embs = load_embed_model(self.model_name).encode(texts, batch_size=batch_size, convert_to_numpy=True)
+        embs = np.asarray(embs, dtype=np.float32)
+        norms = np.linalg.norm(embs, axis=1, keepdims=True)
+        return embs / np.where(norms == 0, 1.0, norms)
+
+    def _train_size(self) -> Tuple[int, int]:
+        """(recommended, minimum) number of vectors to train the index on."""
+        import faiss
+        try:
+            nlist = faiss.extract_index_ivf(self.index).nlist
+        except Exception:
+            return 10_000, 1  # other trained indexes (e.g. PQ): a large sample, or whatever the input has
+        return 39 * nlist, nlist
+
+    def add_jobs(self, jobs: Iterable[Tuple[str, str, Optional[Dict]]], batch_size: int = 256) -> int:
+        """Add or replace (job_id, text, meta) records; returns the number indexed."""
+        added, batch = 0, []
+        for job in jobs:
+            batch.append(job)
+            if len(batch) >= batch_size:
+                added += self._add_batch(batch, batch_size)
+                batch = []
+        if batch:
+            added += self._add_batch(batch, batch_size)
+        with self._lock:
+            self._train_pending(final=True)
+        return added
+
+    def _add_batch(self, batch: List[Tuple[str, str, Optional[Dict]]], batch_size: int) -> int:
+        batch = list({str(job_id): (str(job_id), text, meta) for job_id, text, meta in batch}.values())
+        embs = self._encode([clean_text(text) for _, text, _ in batch], batch_size)
+        with self._lock:
+            if self.index is None:
+                self.index = self._new_index(embs.shape[1])
+                self._set_nprobe()
+            if self.index.is_trained:
+                self._insert(batch, embs)
+            else:
+                for (job_id, text, meta), emb in zip(batch, embs):
+                    self._pending.pop(job_id, None)
+                    self._pending[job_id] = (text, meta, emb)
+                self._train_pending(final=False)
+        return len(batch)
+
+    def _train_pending(self, final: bool):
+        """Train on the buffered jobs once there are enough of them (or the input has ended), then add them."""
+        if not self._pending:
+            return
+        recommended, minimum = self._train_size()
+        if len(self._pending) < recommended and not final:
+            return
+        if len(self._pending) < minimum:
+            n = len(self._pending)
+            self._pending.clear()
+            raise ValueError(f"Index spec {self.spec!r} needs at least {minimum:,} JDs to train, got {n:,}; "
+                             "use fewer IVF lists or 'IDMap2,Flat'")
+        batch = [(job_id, text, meta) for job_id, (text, meta, _) in self._pending.items()]
+        embs = np.vstack([emb for _, _, emb in self._pending.values()])
+        self._pending.clear()
+        with timer("jd_index.train"):
+            self.index.train(embs)
+        self._set_nprobe()
+        self._insert(batch, embs)
+
+    def _insert(self, batch: List[Tuple[str, str, Optional[Dict]]], embs: np.ndarray):
+        # Replaced jobs are only removed once their new vectors are ready (not while buffered for training)
+        self.remove_jobs([job_id for job_id, _, _ in batch])
+        with self._db:
+            ids = []
+            for job_id, text, meta in batch:
+                cur = self._db.execute("INSERT INTO jobs (job_id, text, meta) VALUES (?, ?, ?)",
+                                       (job_id, text, json.dumps(meta or {})))
+                ids.append(cur.lastrowid)
+        self.index.add_with_ids(embs, np.asarray(ids, dtype=np.int64))
+
+    def _reconcile(self):
+        """Re-index jobs whose vectors never reached the saved index; drop vectors of deleted jobs."""
+        db_ids = {r[0] for r in self._db.execute("SELECT id FROM jobs")}
+        index_ids = self._index_ids()
+        stale = sorted(index_ids - db_ids)
+        missing = sorted(db_ids - index_ids)
+        if stale:
+            self.index.remove_ids(np.asarray(stale, dtype=np.int64))
+        if missing:
+            jobs = {}
+            for i in range(0, len(missing), 500):
+                jobs.update(self._jobs(missing[i:i + 500]))
+            self.add_jobs(jobs.values())  # re-added under their job ids; the old rows are replaced
+        if stale or missing:
+            self.save()
+
+    def remove_jobs(self, job_ids: Iterable[str]) -> int:
+        job_ids = [str(j) for j in job_ids]
+        if not job_ids:
+            return 0
+        with self._lock:
+            marks = ",".join("?" * len(job_ids))
+            ids = [r[0] for r in self._db.execute(f"SELECT id FROM jobs WHERE job_id IN ({marks})", job_ids)]
+            if not ids:
+                return 0
+            with self._db:
+                self._db.execute(f"DELETE FROM jobs WHERE id IN ({','.join('?' * len(ids))})", ids)
+            if self.index is not None:
+                self.index.remove_ids(np.asarray(ids, dtype=np.int64))
+            return len(ids)
+
+    def save(self):
+        import faiss
+        with self._lock:
+            if self.index is not None:
+                tmp = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+                faiss.write_index(self.index, str(tmp))
+                os.replace(tmp, self.index_path)
+
+    def _jobs(self, ids: List[int]) -> Dict[int, Tuple[str, str, Dict]]:
+        marks = ",".join("?" * len(ids))
+        rows = self._db.execute(f"SELECT id, job_id, text, meta FROM jobs WHERE id IN ({marks})", ids)
+        return {r[0]: (r[1], r[2], json.loads(r[3] or "{}")) for r in rows}
+
+    @timed("jd_index.query")
+    def top_jobs(self, resume_text: str, k: int = 10, shortlist: int = 50, rerank: bool = True,
+                 skills_yaml_path: str = taxonomy_path, threshold: int = 70,
+                 rerank_weight: float = RERANK_WEIGHT) -> List[Dict]:
+        """Best-fitting jobs for a resume: ANN shortlist by cosine, then taxonomy rerank of the shortlist."""
+        if not len(self):
+            return []
+        resume_clean = clean_text(resume_text)
+        query = self._encode([resume_clean], 1)
+        with self._lock:
+            sims, ids = self.index.search(query, min(max(shortlist, k), len(self)))
+            found = [(int(i), float(s)) for i, s in zip(ids[0], sims[0]) if i != -1]
+            jobs = self._jobs([i for i, _ in found])
+
+        rows = []
+        tax = load_taxonomy_index(skills_yaml_path) if rerank else None
+        matched_resume = tax.match(resume_clean, threshold) if tax is not None else None
+        with timer("jd_index.rerank"):
+            for i, sim in found:
+                if i not in jobs:
+                    continue
+                job_id, text, meta = jobs[i]
+                row = {"job_id": job_id, "similarity": round(sim * 100, 2), "meta": meta}
+                if tax is not None:
+                    cov = _coverage_from_matches(matched_resume, tax.match(clean_text(text), threshold))
+                    row["taxonomy_coverage_pct"] = coverage_mean_pct(cov)
+                    row["missing_skills"] = sorted({m for v in cov.values() for m in v["missing"]})
+                    row["score"] = round((1 - rerank_weight) * row["similarity"]
+                                         + rerank_weight * row["taxonomy_coverage_pct"], 2)
+                else:
+                    row["score"] = row["similarity"]
+                rows.append(row)
+        rows.sort(key=lambda r: r["score"], reverse=True)
+        for rank, r in enumerate(rows[:k], 1):
+            r["rank"] = rank
+        return rows[:k]
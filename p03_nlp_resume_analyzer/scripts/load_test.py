@@ -0,0 +1,115 @@
+# scripts/load_test.py
+
+"""
+Load generator for the analysis service (scripts/service.py).
+
+For each concurrency level, keeps that many requests in flight against
+POST /analyze and reports throughput, p50/p99 latency and 503 rejections.
+The service's batching counters are read from /metrics.json before and after
+each level to report the mean encoder batch size.
+
+    python scripts/load_test.py --url http://localhost:8000 --levels 1 4 16 32 --requests 200
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+SKILLS = [
+    "python", "sql", "pandas", "scikit-learn", "pytorch", "tensorflow", "mlflow", "docker", "kubernetes",
+    "airflow", "spark", "aws", "gcp", "tableau", "statistics", "a/b testing", "feature engineering",
+    "model deployment", "data visualization", "communication", "stakeholder management",
+]
+VERBS = ["Built", "Designed", "Led", "Deployed", "Automated", "Analyzed", "Optimized", "Maintained"]
+
+
+def synthetic_pair(rng: random.Random):
+    resume = "\n\n".join(
+        " ".join(f"{rng.choice(VERBS)} {', '.join(rng.sample(SKILLS, 3))} solutions for product teams." for _ in range(4))
+        for _ in range(rng.randint(3, 8))
+    )
+    jd = "We are hiring a data scientist.\n\nRequirements: " + ", ".join(rng.sample(SKILLS, 8)) + "."
+    return resume, jd
+
+
+def post(url: str, payload: dict, timeout: float):
+    req = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"),
+                                 headers={"Content-Type": "application/json"}, method="POST")
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = 0
+    return status, time.perf_counter() - start
+
+
+def batch_counters(base: str):
+    try:
+        with urllib.request.urlopen(f"{base}/metrics.json", timeout=5) as resp:
+            counters = json.loads(resp.read())["counters"]
+        return counters.get("batch.calls", 0.0), counters.get("batch.texts", 0.0)
+    except Exception:
+        return None
+
+
+def run_level(base: str, concurrency: int, n_requests: int, timeout: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    payloads = [dict(zip(("resume_text", "jd_text"), synthetic_pair(rng))) for _ in range(n_requests)]
+    before = batch_counters(base)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda p: post(f"{base}/analyze", p, timeout), payloads))
+    wall = time.perf_counter() - start
+    after = batch_counters(base)
+
+    ok = [lat for status, lat in results if status == 200]
+    row = {
+        "concurrency": concurrency,
+        "ok": len(ok),
+        "rejected": sum(1 for status, _ in results if status == 503),
+        "errors": sum(1 for status, _ in results if status not in (200, 503)),
+        "throughput_rps": round(len(ok) / wall, 2),
+        "p50_ms": round(float(np.percentile(ok, 50)) * 1000, 1) if ok else None,
+        "p99_ms": round(float(np.percentile(ok, 99)) * 1000, 1) if ok else None,
+    }
+    if before and after and after[0] > before[0]:
+        row["mean_batch"] = round((after[1] - before[1]) / (after[0] - before[0]), 1)
+    return row
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="http://localhost:8000")
+    ap.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 32])
+    ap.add_argument("--requests", type=int, default=200, help="Requests per concurrency level")
+    ap.add_argument("--timeout", type=float, default=120.0)
+    ap.add_argument("--out", help="Optional JSON file for the results")
+    args = ap.parse_args()
+
+    base = args.url.rstrip("/")
+    rows = []
+    print(f"{'conc':>5} {'ok':>6} {'503':>5} {'err':>5} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'batch':>6}")
+    for i, level in enumerate(args.levels):
+        row = run_level(base, level, args.requests, args.timeout, seed=i)
+        rows.append(row)
+        print(f"{row['concurrency']:>5} {row['ok']:>6} {row['rejected']:>5} {row['errors']:>5} "
+              f"{row['throughput_rps']:>8} {row['p50_ms'] or '-':>9} {row['p99_ms'] or '-':>9} "
+              f"{row.get('mean_batch', '-'):>6}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        print(f"💾 Results saved → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# scripts/match_jobs.py
+
+"""
+Maintain a job-description index and query it with resumes.
+
+JDs come from a directory (pdf/docx/txt) or a manifest (.csv / .jsonl /
+one path per line), the same formats `rank_resumes.py` accepts for resumes.
+
+    python scripts/match_jobs.py add --jds jds/ --batch-size 256
+    python scripts/match_jobs.py remove job-123.txt job-456.txt
+    python scripts/match_jobs.py query --resume resume.pdf --top-k 10 --shortlist 50
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.jd_index import JD_INDEX_DIR, JD_INDEX_SPEC, RERANK_WEIGHT, JDIndex  # noqa: E402
+from scripts.nlp_core import iter_resume_sources, read_resume, taxonomy_path  # noqa: E402
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Job-description index: add, remove and query.")
+    ap.add_argument("--index-dir", default=str(JD_INDEX_DIR), help="Directory holding the index and job store")
+    ap.add_argument("--spec", default=JD_INDEX_SPEC, help="FAISS index factory string (new indexes only)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    add = sub.add_parser("add", help="Add or replace JDs")
+    add.add_argument("--jds", required=True, help="Directory of JDs or manifest file")
+    add.add_argument("--batch-size", type=int, default=256)
+
+    rm = sub.add_parser("remove", help="Remove JDs by id")
+    rm.add_argument("job_ids", nargs="+")
+
+    q = sub.add_parser("query", help="Top-k jobs for a resume")
+    q.add_argument("--resume", required=True, help="Resume file (pdf/docx/txt)")
+    q.add_argument("--top-k", type=int, default=10)
+    q.add_argument("--shortlist", type=int, default=50, help="ANN candidates reranked by taxonomy coverage")
+    q.add_argument("--rerank-weight", type=float, default=RERANK_WEIGHT, help="Share of coverage in the score")
+    q.add_argument("--skills", default=taxonomy_path, help="Skill taxonomy YAML")
+    q.add_argument("--out", help="Optional JSON file for the results")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    index = JDIndex(args.index_dir, args.spec)
+
+    if args.cmd == "add":
+        start = time.perf_counter()
+        print(f"🚀 Indexing JDs from {args.jds} (batch size {args.batch_size})...")
+        jobs = ((job_id, text, {"source": job_id}) for job_id, text in iter_resume_sources(args.jds))
+        added = index.add_jobs(jobs, args.batch_size)
+        index.save()
+        print(f"✅ {added:,} JDs indexed in {time.perf_counter() - start:.1f}s ({len(index):,} total)")
+
+    elif args.cmd == "remove":
+        removed = index.remove_jobs(args.job_ids)
+        index.save()
+        print(f"🗑️ {removed} JDs removed ({len(index):,} left)")
+
+    else:
+        rows = index.top_jobs(read_resume(args.resume), args.top_k, args.shortlist,
+                              skills_yaml_path=args.skills, rerank_weight=args.rerank_weight)
+        print(f"\n🏆 Top {len(rows)} of {len(index):,} jobs for {args.resume}")
+        for r in rows:
+            print(f"{r['rank']:>3}. {r['job_id']}  score={r['score']:.2f}  similarity={r['similarity']:.2f}%  "
+                  f"coverage={r.get('taxonomy_coverage_pct', 0.0):.1f}%")
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(rows, f, indent=2)
+            print(f"💾 Results saved → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# scripts/metrics.py
+
+"""
+In-process latency instrumentation for the resume analyzer.
+
+Every timed stage keeps a rolling window of its most recent durations, from
+which p50/p90/p99 are computed on demand. Snapshots can be dumped as JSON or
+Prometheus text exposition, and `start_metrics_server` exposes both over HTTP
+(`/metrics`, `/metrics.json`) for scrapers.
+"""
+
+from typing import Dict, Optional
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import threading
+import time
+
+WINDOW = int(os.getenv("NLP_METRICS_WINDOW", "500"))
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _quantile(sorted_vals, q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[idx]
+
+
+class StageStats:
+    """Rolling window of durations (seconds) plus lifetime count / sum."""
+
+    def __init__(self, window: int = WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def summary(self) -> Dict:
+        vals = sorted(self.samples)
+        out = {"count": self.count, "sum_s": round(self.total, 6)}
+        for q in QUANTILES:
+            out[f"p{int(q * 100)}_ms"] = round(_quantile(vals, q) * 1000, 3)
+        return out
+
+
+class MetricsRegistry:
+    def __init__(self, window: int = WINDOW):
+        self.window = window
+        self._stages: Dict[str, StageStats] = {}
+        self._counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats(self.window)
+            stats.observe(seconds)
+
+    def incr(self, name: str, value: float = 1.0):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0.0) + value
+
+    @contextmanager
+    def timer(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timed(self, stage: str):
+        """Decorator form of `timer`."""
+        def deco(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counters = dict(sorted(self._counters.items()))
+            stages = {name: s.summary() for name, s in sorted(self._stages.items())}
+        # Every "<cache>.hits" / "<cache>.misses" counter pair also reports a hit rate
+        hit_rates = {}
+        for name, hits in counters.items():
+            if name.endswith(".hits"):
+                cache = name[: -len(".hits")]
+                total = hits + counters.get(f"{cache}.misses", 0.0)
+                if total:
+                    hit_rates[cache] = round(hits / total, 4)
+        return {"stages": stages, "counters": counters, "hit_rates": hit_rates}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix: str = "nlp_analyzer") -> str:
+        snap = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Rolling latency of analyzer stages.",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for name, s in snap["stages"].items():
+            for q in QUANTILES:
+                val = s[f"p{int(q * 100)}_ms"] / 1000
+                lines.append(f'{prefix}_stage_seconds{{stage="{name}",quantile="{q}"}} {val:.6f}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {s["sum_s"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {s["count"]}')
+        for name, val in snap["counters"].items():
+            metric = f"{prefix}_{name.replace('.', '_')}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {val:g}")
+        if snap["hit_rates"]:
+            lines.append(f"# TYPE {prefix}_cache_hit_ratio gauge")
+            for cache, rate in snap["hit_rates"].items():
+                lines.append(f'{prefix}_cache_hit_ratio{{cache="{cache}"}} {rate:g}')
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+timer = METRICS.timer
+timed = METRICS.timed
+
+
+# ---------- HTTP EXPORT ---------- #
+
+_server: Optional[ThreadingHTTPServer] = None
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/metrics.json"):
+            body, ctype = METRICS.to_json(), "application/json"
+        elif self.path.startswith("/metrics"):
+            body, ctype = METRICS.to_prometheus(), "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve /metrics (Prometheus) and /metrics.json from a daemon thread; idempotent per process."""
+    global _server
+    if _server is None:
+        _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
@@ -1,49 +1,56 @@
 # scripts/nlp_core.py
 
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator
+from collections import OrderedDict
+from functools import cached_property
 import os
 import re
 import yaml
+import csv
 import json
+import hashlib
+import atexit
+import threading
+import time
+import warnings
+import numpy as np
 from pathlib import Path
-from sentence_transformers import SentenceTransformer, util
-from keybert import KeyBERT
-from rapidfuzz import fuzz
-import streamlit as st
+from rapidfuzz import fuzz, process
+from scripts.caching import cache_resource
+from scripts.doc_extract import extract_document, extract_document_bytes, iter_pdf_pages, iter_docx_pages
+from scripts.embed_backends import EMBED_BACKEND, load_sentence_encoder
+from scripts.generation import submit_bullets
+from scripts.metrics import METRICS, timed, timer
+from scripts.phrase_store import embed_phrases
 
-# Optional dependencies
-try:
-    from transformers import pipeline
-except Exception:
-    pipeline = None
-
-try:
-    import pdfplumber
-except Exception:
-    pdfplumber = None
-
-try:
-    import docx
-except Exception:
-    docx = None
+# Heavy dependencies (sentence_transformers, keybert, spacy, nltk)
+# are imported inside the functions that need them, so importing this module
+# stays cheap for batch jobs and worker processes.
 
-# NEW optional dependencies
 try:
-    import spacy
-    from nltk.corpus import stopwords
+    import fcntl
 except Exception:
-    spacy, stopwords = None, None
+    fcntl = None
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 taxonomy_path = os.path.join(BASE_DIR, "data", "skills.yaml")
 
 # CONFIGURATION
 EMBED_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
-HF_TEXTGEN_MODEL = "HuggingFaceH4/zephyr-7b-beta"
-HF_API_TOKEN = os.getenv("HF_API_TOKEN", None)
 CACHE_DIR = Path(".cache_nlp")
 CACHE_DIR.mkdir(exist_ok=True)
 CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "irrelevant_terms_cache.json"
+EMBED_CACHE_MAX_ENTRIES = int(os.getenv("NLP_EMBED_CACHE_MAX_ENTRIES", "4096"))
+IRRELEVANT_FLUSH_INTERVAL = float(os.getenv("NLP_IRRELEVANT_FLUSH_SECONDS", "5"))
+# Whole-document cosine by default; "chunked" (opt-in) keeps chunks under MiniLM's 256 word-piece limit
+# and pools chunk scores, which changes score values, so it applies to every scoring path at once
+SIMILARITY_MODE = os.getenv("NLP_SIMILARITY_MODE", "full")  # "full" | "chunked"
+SIMILARITY_POOLING = os.getenv("NLP_SIMILARITY_POOLING", "max")  # "max" | "mean" | "topk"
+CHUNK_WORDS = 150
+CHUNK_OVERLAP = 30
+# Taxonomy matching: fuzzy string match, skill-embedding match, or the union of both
+TAXONOMY_MODE = os.getenv("NLP_TAXONOMY_MODE", "fuzzy")  # "fuzzy" | "semantic" | "hybrid"
+SEMANTIC_THRESHOLD = float(os.getenv("NLP_SEMANTIC_THRESHOLD", "0.45"))  # default per-category cosine bar
 
 
 # HELPERS
@@ -56,148 +63,474 @@ def clean_text(text: str) -> str:
     return t.strip().lower()
 
 
-# MODEL LOADERS (cached)
-@st.cache_resource
-def load_embed_model(name: str = EMBED_MODEL_NAME) -> SentenceTransformer:
-    return SentenceTransformer(name)
+# MODEL LOADERS (cached: st.cache_resource inside the app, process cache elsewhere)
+_embed_encoder_override = None
+
+
+def set_embed_encoder(encoder):
+    """Route every embedding and KeyBERT encode through `encoder` (e.g. the service's
+    micro-batcher); None restores the regular model. Clears the loader caches."""
+    global _embed_encoder_override
+    _embed_encoder_override = encoder
+    load_embed_model.clear()
+    load_kw_model.clear()
+
+
+@cache_resource
+@timed("load.embed_model")
+def load_embed_model(name: str = EMBED_MODEL_NAME, backend: str = EMBED_BACKEND) -> "SentenceTransformer":  # noqa: F821
+    if _embed_encoder_override is not None:
+        return _embed_encoder_override
+    # torch fp32 by default; NLP_EMBED_BACKEND=onnx / onnx-int8 for ONNX Runtime on CPU
+    return load_sentence_encoder(name, backend)
+
+@cache_resource
+@timed("load.kw_model")
+def load_kw_model(embed_name: str = EMBED_MODEL_NAME) -> "KeyBERT":  # noqa: F821
+    from keybert import KeyBERT
+    # Share the cached encoder instead of letting KeyBERT load a second MiniLM copy
+    return KeyBERT(model=load_embed_model(embed_name))
+
+@cache_resource
+@timed("load.ner_model")
+def load_ner_model(name: str = "en_core_web_sm"):
+    try:
+        import spacy
+        return spacy.load(name, disable=["parser"])
+    except Exception:
+        return None
+
+_stopword_set: Optional[frozenset] = None
+
+def english_stopwords() -> frozenset:
+    global _stopword_set
+    if _stopword_set is None:
+        try:
+            from nltk.corpus import stopwords
+            _stopword_set = frozenset(stopwords.words("english"))
+        except Exception:
+            _stopword_set = frozenset()
+    return _stopword_set
+
+
+# ---------- EMBEDDING CACHE ---------- #
+
+class EmbeddingCache:
+    """Content-addressed on-disk embedding store with size-bounded LRU eviction.
+
+    Entries are keyed by sha256(model name + cleaned text) and stored as `.npy`
+    files under CACHE_DIR. A hit touches the file mtime, so eviction drops the
+    least recently used entries once `max_entries` is exceeded.
+    """
+
+    def __init__(self, root: Path = CACHE_DIR / "embeddings", max_entries: int = EMBED_CACHE_MAX_ENTRIES):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._count = len(list(self.root.glob("*.npy")))
+
+    @staticmethod
+    def key(text: str, model_name: str) -> str:
+        return hashlib.sha256(f"{model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.npy"
+
+    def get(self, text: str, model_name: str) -> Optional[np.ndarray]:
+        path = self._path(self.key(text, model_name))
+        try:
+            emb = np.load(path)
+            os.utime(path)
+            return emb
+        except Exception:
+            return None
+
+    def put(self, text: str, model_name: str, emb: np.ndarray):
+        path = self._path(self.key(text, model_name))
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")  # unique per writer thread
+        try:
+            with open(tmp, "wb") as f:
+                np.save(f, np.asarray(emb, dtype=np.float32))
+            existed = path.exists()
+            os.replace(tmp, path)
+        except Exception:
+            tmp.unlink(missing_ok=True)
+            return
+        if not existed:
+            self._count += 1
+        if self._count > self.max_entries:
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for p in self.root.glob("*.npy"):
+            try:
+                entries.append((p.stat().st_mtime, p))
+            except FileNotFoundError:
+                continue
+        entries.sort()
+        # Trim to 90% of the bound so we don't rescan on every insert
+        target = int(self.max_entries * 0.9)
+        for _, p in entries[: max(0, len(entries) - target)]:
+            p.unlink(missing_ok=True)
+        self._count = min(len(entries), target)
 
-@st.cache_resource
-def load_kw_model(embed_name: str = EMBED_MODEL_NAME) -> KeyBERT:
-    return KeyBERT(model=embed_name)
+
+_embed_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _embed_cache
+    if _embed_cache is None:
+        _embed_cache = EmbeddingCache()
+    return _embed_cache
+
+
+def encode_cached(texts: List[str], model_name: str = EMBED_MODEL_NAME, batch_size: int = 32) -> np.ndarray:
+    """Encode cleaned texts, reading/writing the embedding cache. Only misses hit the encoder."""
+    cache = get_embedding_cache()
+    cache_key = f"{model_name}@{EMBED_BACKEND}"  # never mix fp32 and quantized vectors
+    out: List[Optional[np.ndarray]] = [cache.get(t, cache_key) for t in texts]
+    misses = [i for i, e in enumerate(out) if e is None]
+    METRICS.incr("embed_cache.hits", len(texts) - len(misses))
+    METRICS.incr("embed_cache.misses", len(misses))
+    if misses:
+        model = load_embed_model(model_name)
+        with timer("embed.encode"):
+            embs = model.encode([texts[i] for i in misses], batch_size=batch_size, convert_to_numpy=True)
+        for i, emb in zip(misses, embs):
+            cache.put(texts[i], cache_key, emb)
+            out[i] = emb
+    return np.vstack(out) if out else np.zeros((0, 0), dtype=np.float32)
 
 
 # ---------- NEW: DYNAMIC IRRELEVANT TERM FILTER ---------- #
 
-def load_irrelevant_cache() -> set:
-    if CACHE_PATH.exists():
+def load_irrelevant_cache(path: Path = CACHE_PATH) -> set:
+    if path.exists():
         try:
-            with open(CACHE_PATH, "r") as f:
+            with open(path, "r") as f:
                 return set(json.load(f))
         except Exception:
             return set()
     return set()
 
-def save_irrelevant_cache(terms: set):
+def save_irrelevant_cache(terms: set, path: Path = CACHE_PATH):
+    """Write the cache atomically (temp file + rename) so readers never see a partial file."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
     try:
-        CACHE_PATH.parent.mkdir(exist_ok=True)
-        with open(CACHE_PATH, "w") as f:
+        path.parent.mkdir(exist_ok=True)
+        with open(tmp, "w") as f:
             json.dump(sorted(list(terms)), f, indent=2)
+        os.replace(tmp, path)
     except Exception:
-        pass
+        try:
+            tmp.unlink(missing_ok=True)
+        except Exception:
+            pass
+
+
+class IrrelevantTermStore:
+    """Process-wide in-memory set of learned irrelevant terms with debounced, atomic persistence.
+
+    Sessions add terms in memory; new terms are flushed at most once per
+    `flush_interval` seconds (plus at exit). A flush re-reads the file and
+    merges under an exclusive file lock (where `fcntl` exists) before the
+    atomic rename, so concurrent sessions and worker processes never drop
+    each other's terms.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH, flush_interval: float = IRRELEVANT_FLUSH_INTERVAL):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._terms = load_irrelevant_cache(self.path)
+        self._pending: set = set()
+        self._last_flush = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+
+    def snapshot(self) -> frozenset:
+        with self._lock:
+            return frozenset(self._terms)
+
+    def add_many(self, terms: Iterable[str]):
+        with self._lock:
+            new = {t for t in terms if t not in self._terms}
+            if not new:
+                return
+            self._terms |= new
+            self._pending |= new
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+            if not due and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, set()
+            self._last_flush = time.monotonic()
+            lock_f = None
+            try:
+                if fcntl is not None:
+                    try:
+                        self.path.parent.mkdir(exist_ok=True)
+                        lock_f = open(self.path.with_name(f".{self.path.name}.lock"), "w")
+                        fcntl.flock(lock_f, fcntl.LOCK_EX)
+                    except OSError:
+                        lock_f = None
+                merged = load_irrelevant_cache(self.path) | self._terms | pending
+                save_irrelevant_cache(merged, self.path)
+                self._terms = merged
+            finally:
+                if lock_f is not None:
+                    fcntl.flock(lock_f, fcntl.LOCK_UN)
+                    lock_f.close()
+
+
+_irrelevant_store: Optional[IrrelevantTermStore] = None
+_irrelevant_store_lock = threading.Lock()
+
+
+def get_irrelevant_store() -> IrrelevantTermStore:
+    global _irrelevant_store
+    with _irrelevant_store_lock:
+        if _irrelevant_store is None:
+            _irrelevant_store = IrrelevantTermStore()
+        return _irrelevant_store
 
-def clean_keywords(jd_keywords: List[str], job_input: str) -> List[str]:
-    """Dynamic filter that removes irrelevant JD terms & updates cache, with static hard exclusions and verb exclusion."""
-    irrelevant_dynamic = load_irrelevant_cache()
+
+GENERIC_TERMS = {
+    "role", "job", "position", "employee", "team", "organization",
+    "company", "department", "manager", "associate", "engineer", "staff",
+    "worker", "individual", "professional", "hybrid", "remote", "onsite",
+    "location", "office", "headquarters", "candidate", "applicant", "employer",
+    "developing", "creating"
+}
+HARD_EXCLUSIONS = {"workplace", "environment", "culture", "diversity", "values"}
+COMPANY_LIKE = re.compile(r"\b(inc|llc|corp|corporation|ltd|co\.|company)\b", re.IGNORECASE)
+CITY_LIKE_TERMS = {
+    "new york", "los angeles", "chicago", "houston", "phoenix",
+    "philadelphia", "san antonio", "san diego", "dallas", "san jose",
+    "seattle", "austin", "boston", "denver", "atlanta", "miami",
+    "london", "paris", "berlin", "toronto", "vancouver", "tokyo", "singapore"
+}
+VERB_EXCLUSIONS = {
+    "developing", "creating", "leading", "managing", "working",
+    "supporting", "building", "designing", "using", "helping", "driving"
+}
+
+
+@timed("keywords.irrelevant_terms")
+def build_irrelevant_terms(jd_keywords: List[str], job_input: str) -> set:
+    """Collect irrelevant terms for a JD (NER, generic, stopwords, title, hard, company/city, verbs) & update cache."""
+    store = get_irrelevant_store()
+    learned = set()
 
     # 1️⃣ NER-based removal
-    if spacy is not None:
+    nlp = load_ner_model()
+    if nlp is not None:
         try:
-            nlp = spacy.load("en_core_web_sm", disable=["parser"])
-            doc = nlp(job_input)
+            with timer("ner"):
+                doc = nlp(job_input)
             for ent in doc.ents:
                 if ent.label_ in {"ORG", "GPE", "LOC", "PERSON"}:
-                    irrelevant_dynamic.add(ent.text.lower())
+                    learned.add(ent.text.lower())
         except Exception:
             pass
 
-    # 2️⃣ Generic job/HR-related words
-    generic_terms = {
-        "role", "job", "position", "employee", "team", "organization",
-        "company", "department", "manager", "associate", "engineer", "staff",
-        "worker", "individual", "professional", "hybrid", "remote", "onsite",
-        "location", "office", "headquarters", "candidate", "applicant", "employer",
-        "developing", "creating"
-    }
-    irrelevant_dynamic.update(generic_terms)
-
-    # 3️⃣ Stopwords
-    if stopwords is not None:
-        try:
-            irrelevant_dynamic.update(stopwords.words("english"))
-        except Exception:
-            pass
+    # 2️⃣ Generic job/HR-related words, 3️⃣ Stopwords, 5️⃣ 🔒 Hard exclusions (always removed)
+    # are static, so they're merged in memory below rather than persisted
 
     # 4️⃣ Add tokens from job title / intro lines
     for line in job_input.splitlines()[:3]:
         for w in line.split():
             if len(w) > 2:
-                irrelevant_dynamic.add(w.lower())
-
-    # 5️⃣ 🔒 Hard exclusions (always removed)
-    hard_exclusions = {"workplace", "environment", "culture", "diversity", "values"}
-    irrelevant_dynamic.update(hard_exclusions)
+                learned.add(w.lower())
 
     # 6️⃣ 🚫 Company & city fallback detection (case-insensitive)
-    company_like = re.compile(r"\b(inc|llc|corp|corporation|ltd|co\.|company)\b", re.IGNORECASE)
-    city_like_terms = {
-        "new york", "los angeles", "chicago", "houston", "phoenix",
-        "philadelphia", "san antonio", "san diego", "dallas", "san jose",
-        "seattle", "austin", "boston", "denver", "atlanta", "miami",
-        "london", "paris", "berlin", "toronto", "vancouver", "tokyo", "singapore"
-    }
-
+    # 7️⃣ 🚫 Verb exclusions (drop only verbs, keep nouns/adjectives)
     for kw in jd_keywords:
         kw_l = kw.lower().strip()
-        if company_like.search(kw_l):
-            irrelevant_dynamic.add(kw_l)
-        if kw_l in city_like_terms:
-            irrelevant_dynamic.add(kw_l)
+        if COMPANY_LIKE.search(kw_l) or kw_l in CITY_LIKE_TERMS or kw_l in VERB_EXCLUSIONS:
+            learned.add(kw_l)
 
-    # 7️⃣ 🚫 Verb exclusions (drop only verbs, keep nouns/adjectives)
-    verb_exclusions = {
-        "developing", "creating", "leading", "managing", "working",
-        "supporting", "building", "designing", "using", "helping", "driving"
-    }
+    # Update the shared store (persisted in the background)
+    store.add_many(learned)
+    return set(store.snapshot()) | learned | GENERIC_TERMS | english_stopwords() | HARD_EXCLUSIONS
 
-    for kw in jd_keywords:
-        kw_l = kw.lower().strip()
-        if kw_l in verb_exclusions:
-            irrelevant_dynamic.add(kw_l)
 
+def filter_keywords(keywords: List[str], irrelevant: set) -> List[str]:
+    """Drop irrelevant / non-alpha / short keywords and normalize capitalization."""
     # 8️⃣ Filter keywords (fully lowercase matching)
     filtered = [
-        kw for kw in jd_keywords
-        if kw.lower() not in irrelevant_dynamic
+        kw for kw in keywords
+        if kw.lower() not in irrelevant
         and kw.isalpha()
         and len(kw) > 2
     ]
 
     # 9️⃣ Normalize capitalization rules
-    normalized = []
-    for kw in filtered:
-        if kw.lower() == "ml":
-            normalized.append("ML")
-        else:
-            normalized.append(kw)
-
-    # Save updated cache
-    save_irrelevant_cache(irrelevant_dynamic)
+    normalized = ["ML" if kw.lower() == "ml" else kw for kw in filtered]
     return list(dict.fromkeys(normalized))  # unique + preserve orders
 
+
+def clean_keywords(jd_keywords: List[str], job_input: str) -> List[str]:
+    """Dynamic filter that removes irrelevant JD terms & updates cache, with static hard exclusions and verb exclusion."""
+    return filter_keywords(jd_keywords, build_irrelevant_terms(jd_keywords, job_input))
+
 # ---------- CORE ANALYSIS PHASES ---------- #
 
-def compute_similarity(resume_text: str, jd_text: str) -> float:
-    model = load_embed_model()
+# ---------- SECTION-AWARE CHUNKING ---------- #
+
+SECTION_NAMES = {
+    "summary", "profile", "objective", "experience", "employment", "education", "skills",
+    "projects", "certifications", "publications", "awards", "responsibilities",
+    "requirements", "qualifications", "about", "benefits", "preferred",
+}
+
+
+def _is_heading(line: str) -> bool:
+    words = line.split()
+    if not words or len(words) > 6:
+        return False
+    if line.isupper() or line.rstrip().endswith(":"):
+        return True
+    return words[0].lower().strip(":") in SECTION_NAMES and len(words) <= 4
+
+
+def split_sections(text: str) -> List[str]:
+    """Split raw text into sections at blank lines and heading-like lines."""
+    sections, current = [], []
+    for line in str(text or "").splitlines():
+        if not line.strip() or _is_heading(line):
+            if current:
+                sections.append(" ".join(current))
+            current = [line.strip()] if line.strip() else []
+        else:
+            current.append(line.strip())
+    if current:
+        sections.append(" ".join(current))
+    return sections
+
+
+def chunk_text(text: str, max_words: int = CHUNK_WORDS, overlap: int = CHUNK_OVERLAP) -> List[str]:
+    """Cleaned chunks of at most `max_words`: short sections are packed together,
+    long ones are split with a sliding window of `overlap` words."""
+    chunks, current = [], []
+    for section in split_sections(text):
+        words = clean_text(section).split()
+        if not words:
+            continue
+        if len(current) + len(words) <= max_words:
+            current.extend(words)
+            continue
+        if current:
+            chunks.append(current)
+            current = []
+        if len(words) <= max_words:
+            current = words
+            continue
+        step = max(1, max_words - overlap)
+        for i in range(0, len(words), step):
+            window = words[i:i + max_words]
+            if len(window) < max_words and i > 0:
+                current = window  # tail: let following sections pack onto it
+                break
+            chunks.append(window)
+            if i + max_words >= len(words):
+                break
+    if current:
+        chunks.append(current)
+    return [" ".join(c) for c in chunks] or [clean_text(text)]
+
+
+def _normalize_rows(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=-1, keepdims=True)
+    return m / np.where(norms == 0, 1.0, norms)
+
+
+def pool_similarity(sim: np.ndarray, pooling: str = SIMILARITY_POOLING, top_k: int = 3) -> float:
+    """Aggregate a (resume chunks × JD chunks) cosine matrix into one score.
+
+    - max:  for each JD chunk, its best-matching resume chunk; averaged over JD chunks
+    - topk: same, but the mean of the `top_k` best resume chunks per JD chunk
+    - mean: mean over the whole matrix
+    """
+    if sim.size == 0:
+        return 0.0
+    if pooling == "mean":
+        return float(sim.mean())
+    if pooling == "topk":
+        k = min(top_k, sim.shape[0])
+        return float(np.sort(sim, axis=0)[-k:].mean(axis=0).mean())
+    return float(sim.max(axis=0).mean())
+
+
+def chunked_similarity(resume_chunk_embs: np.ndarray, jd_chunk_embs: np.ndarray,
+                       pooling: str = SIMILARITY_POOLING, top_k: int = 3) -> float:
+    sim = _normalize_rows(resume_chunk_embs) @ _normalize_rows(jd_chunk_embs).T
+    return round(pool_similarity(sim, pooling, top_k) * 100, 2)
+
+
+def compute_similarity(resume_text: str, jd_text: str, mode: str = SIMILARITY_MODE,
+                       pooling: str = SIMILARITY_POOLING, top_k: int = 3) -> float:
+    if mode == "chunked":
+        r_chunks, j_chunks = chunk_text(resume_text), chunk_text(jd_text)
+        embs = encode_cached(r_chunks + j_chunks)  # one batched forward pass for both docs
+        return chunked_similarity(embs[:len(r_chunks)], embs[len(r_chunks):], pooling, top_k)
     r = clean_text(resume_text)
     j = clean_text(jd_text)
-    emb_r = model.encode(r, convert_to_tensor=True)
-    emb_j = model.encode(j, convert_to_tensor=True)
-    sim = util.cos_sim(emb_r, emb_j).item()
-    return round(sim * 100, 2)
+    emb_r, emb_j = _normalize_rows(encode_cached([r, j]))
+    return round(float(emb_r @ emb_j) * 100, 2)
 
 
-def extract_keywords(text: str, top_n: int = 20) -> List[Tuple[str, float]]:
+@timed("keybert")
+def _extract_keywords_clean(txt: str, top_n: int, doc_embedding: Optional[np.ndarray] = None,
+                            candidates: Optional[List[str]] = None) -> List[Tuple[str, float]]:
     kw = load_kw_model()
-    txt = clean_text(text)
-    kws = kw.extract_keywords(txt, top_n=top_n, stop_words="english")
-    return kws
+    # Candidate embeddings come from the shared phrase store; only unseen phrases are encoded
+    candidates = sorted(set(candidates)) if candidates is not None else candidate_vocabulary(txt)
+    if not candidates:
+        return []
+    encoder = load_embed_model()
+    # Stand-in encoders (benchmarks) carry their own `model_key` so their vectors never land under the real one
+    model_key = getattr(encoder, "model_key", None) or f"{EMBED_MODEL_NAME}@{EMBED_BACKEND}"
+    word_embeddings = embed_phrases(candidates, encoder, model_key)
+    if doc_embedding is None:
+        doc_embedding = encode_cached([txt])[0]
+    # Reuse the cached document embedding instead of letting KeyBERT re-encode the doc
+    return kw.extract_keywords(txt, candidates=candidates, top_n=top_n, stop_words="english",
+                               doc_embeddings=np.atleast_2d(doc_embedding), word_embeddings=word_embeddings)
+
+
+def candidate_vocabulary(txt: str) -> List[str]:
+    """KeyBERT's default candidates (unigrams minus English stop words) for a cleaned text."""
+    from sklearn.feature_extraction.text import CountVectorizer
+    try:
+        return list(CountVectorizer(stop_words="english").fit([txt]).get_feature_names_out())
+    except ValueError:  # empty vocabulary
+        return []
+
+
+def extract_keywords(text: str, top_n: int = 20) -> List[Tuple[str, float]]:
+    return _extract_keywords_clean(clean_text(text), top_n)
+
+
+def _missing_from(jd_kws: List[Tuple[str, float]], resume_l: str) -> List[str]:
+    return [kw for kw, _ in jd_kws if clean_text(kw) not in resume_l]
 
 
 def find_missing_semantic(resume_text: str, jd_text: str, top_n: int = 25) -> List[str]:
-    jd_kws = extract_keywords(jd_text, top_n=top_n)
-    resume_l = clean_text(resume_text)
-    missing = [kw for kw, _ in jd_kws if clean_text(kw) not in resume_l]
-    return missing
+    return _missing_from(extract_keywords(jd_text, top_n=top_n), clean_text(resume_text))
 
 
 def load_skills_yaml(path: str = taxonomy_path) -> Dict:
@@ -219,110 +552,693 @@ def _flatten_skills(raw) -> List[str]:
 
 
 def taxonomy_coverage(resume_text: str, jd_text: str, yaml_path: str = taxonomy_path, threshold: int = 75) -> Dict:
-    raw = load_skills_yaml(yaml_path)
-    if not raw:
-        return {}
-    resume_l, jd_l = clean_text(resume_text), clean_text(jd_text)
-    coverage = {}
+    chunk_embs = taxonomy_chunk_embeddings([resume_text, jd_text])
+    return _taxonomy_coverage_clean(clean_text(resume_text), clean_text(jd_text), yaml_path, threshold,
+                                    chunk_embs=None if chunk_embs is None else tuple(chunk_embs))
 
-    for cat, items in raw.items():
-        matched_resume, matched_jd = set(), set()
-        for s in _flatten_skills(items):
-            s_clean = clean_text(s)
-            if not s_clean:
-                continue
-            if fuzz.partial_ratio(s_clean, resume_l) >= threshold:
-                matched_resume.add(s_clean)
-            if fuzz.partial_ratio(s_clean, jd_l) >= threshold:
-                matched_jd.add(s_clean)
-        overlap = matched_resume & matched_jd
-        missing = sorted(list(matched_jd - matched_resume))
+
+def taxonomy_chunk_embeddings(texts: List[str], mode: str = TAXONOMY_MODE) -> Optional[List[np.ndarray]]:
+    """`chunk_text` embeddings of each raw document for semantic skill matching, whatever
+    SIMILARITY_MODE is (a whole-document vector only sees MiniLM's first 256 word pieces).
+    None in "fuzzy" mode, where no embeddings are needed."""
+    if mode == "fuzzy":
+        return None
+    chunks = [chunk_text(t) for t in texts]
+    flat = encode_cached([c for cs in chunks for c in cs])
+    bounds = np.cumsum([0] + [len(cs) for cs in chunks])
+    return [flat[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _taxonomy_coverage_clean(resume_l: str, jd_l: str, yaml_path: str = taxonomy_path, threshold: int = 75,
+                            chunk_embs: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Dict:
+    r_embs, j_embs = chunk_embs if chunk_embs is not None else (None, None)
+    return taxonomy_coverage_bulk([resume_l], jd_l, yaml_path, threshold, cleaned=True,
+                                  resume_chunk_embs=None if r_embs is None else [r_embs], jd_chunk_embs=j_embs)[0]
+
+
+# ---------- COMPILED TAXONOMY INDEX ---------- #
+
+NGRAM = 3
+# Share of a skill token's trigrams the document must contain before the skill is
+# fuzzy-scored. 0 (default) scores every skill that isn't in the text verbatim,
+# which is exactly the old per-skill scan: at the usual fuzzy thresholds no
+# trigram bound is recall-safe (a 70% partial_ratio match can share none).
+# Raise it to trade recall for speed on very large taxonomies.
+NEAR_MISS_OVERLAP = float(os.getenv("NLP_TAXONOMY_NEAR_MISS_OVERLAP", "0"))
+
+
+def _char_ngrams(text: str, n: int = NGRAM) -> set:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class TaxonomyIndex:
+    """Compiled skill taxonomy: phrase lookup table + trigram index over skill tokens.
+
+    `match` makes one pass over the document's tokens to find exact skill
+    phrases (n-gram dictionary lookups). Every other skill is scored with
+    `fuzz.partial_ratio` in a single `process.cdist` batch, so the result is
+    the same as scanning the whole taxonomy. With NEAR_MISS_OVERLAP > 0 the
+    trigram index first narrows that batch to skills with at least one token
+    (nearly) present in the document.
+    """
+
+    def __init__(self, raw: Dict):
+        self.categories: List[str] = list(raw.keys())
+        self.skills: List[str] = []
+        self.skill_cats: List[List[str]] = []
+        self.phrase_ids: Dict[Tuple[str, ...], int] = {}
+        for cat, items in raw.items():
+            for s in _flatten_skills(items):
+                s_clean = clean_text(s)
+                if not s_clean:
+                    continue
+                phrase = tuple(s_clean.split())
+                if phrase not in self.phrase_ids:
+                    self.phrase_ids[phrase] = len(self.skills)
+                    self.skills.append(s_clean)
+                    self.skill_cats.append([])
+                cats = self.skill_cats[self.phrase_ids[phrase]]
+                if cat not in cats:
+                    cats.append(cat)
+        self.max_n = max((len(p) for p in self.phrase_ids), default=0)
+
+        # Skill -> token ids, flattened for vectorized "all tokens present" checks
+        self.tokens: List[str] = []
+        token_ids: Dict[str, int] = {}
+        flat, starts = [], []
+        for phrase in self.phrase_ids:
+            starts.append(len(flat))
+            for tok in phrase:
+                if tok not in token_ids:
+                    token_ids[tok] = len(self.tokens)
+                    self.tokens.append(tok)
+                flat.append(token_ids[tok])
+        self.token_ids = token_ids
+        self.skill_tokens = np.asarray(flat, dtype=np.int32)
+        self.skill_starts = np.asarray(starts, dtype=np.int32)
+
+        postings: Dict[str, List[int]] = {}
+        n_grams = np.zeros(len(self.tokens), dtype=np.int32)
+        for tid, tok in enumerate(self.tokens):
+            grams = _char_ngrams(tok)
+            n_grams[tid] = len(grams)
+            for g in grams:
+                postings.setdefault(g, []).append(tid)
+        self.postings = {g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()}
+        self.token_n_grams = n_grams
+        self.short_tokens = np.nonzero(n_grams == 0)[0]
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def _near_miss_ids(self, words: set) -> np.ndarray:
+        """Skills with at least one token in the document or sharing enough of its trigrams."""
+        near = np.zeros(len(self.tokens), dtype=bool)
+        for w in words:
+            tid = self.token_ids.get(w)
+            if tid is not None:
+                near[tid] = True
+
+        doc_grams = set()
+        for w in words:
+            doc_grams |= _char_ngrams(w)
+        hits = [self.postings[g] for g in doc_grams if g in self.postings]
+        if hits:
+            counts = np.bincount(np.concatenate(hits), minlength=len(self.tokens))
+            near |= (counts >= self.token_n_grams * NEAR_MISS_OVERLAP) & (self.token_n_grams > 0)
+        near[self.short_tokens] = True
+        return np.nonzero(np.maximum.reduceat(near[self.skill_tokens], self.skill_starts))[0]
+
+    def match_ids(self, text_l: str, threshold: int = 75) -> set:
+        if not self.skills or not text_l:
+            return set()
+        words = text_l.split()
+
+        # Exact phrases: one pass over the document's token n-grams
+        matched = set()
+        for n in range(1, self.max_n + 1):
+            for i in range(len(words) - n + 1):
+                sid = self.phrase_ids.get(tuple(words[i:i + n]))
+                if sid is not None:
+                    matched.add(sid)
+
+        # Everything else (inflections, typos, partial phrases): one batched fuzzy pass
+        ids = self._near_miss_ids(set(words)) if NEAR_MISS_OVERLAP > 0 else range(len(self.skills))
+        todo = [int(sid) for sid in ids if sid not in matched]
+        if todo:
+            scores = process.cdist([self.skills[sid] for sid in todo], [text_l], scorer=fuzz.partial_ratio,
+                                   score_cutoff=threshold, dtype=np.float64)[:, 0]
+            matched.update(sid for sid, score in zip(todo, scores) if score >= threshold)
+        return matched
+
+    def match(self, text_l: str, threshold: int = 75) -> Dict[str, set]:
+        """Skills found in a cleaned document, grouped by category."""
+        out = {cat: set() for cat in self.categories}
+        for sid in self.match_ids(text_l, threshold):
+            for cat in self.skill_cats[sid]:
+                out[cat].add(self.skills[sid])
+        return out
+
+_taxonomy_indexes: Dict[str, Tuple[int, TaxonomyIndex]] = {}
+
+
+def load_taxonomy_index(yaml_path: str = taxonomy_path) -> TaxonomyIndex:
+    """Compiled index for a taxonomy YAML, rebuilt only when the file's mtime changes."""
+    key = os.path.abspath(yaml_path)
+    try:
+        mtime = os.stat(key).st_mtime_ns
+    except OSError:
+        return TaxonomyIndex({})
+    cached = _taxonomy_indexes.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    index = TaxonomyIndex(load_skills_yaml(key))
+    _taxonomy_indexes[key] = (mtime, index)
+    return index
+
+
+# ---------- SEMANTIC TAXONOMY MATCHING ---------- #
+
+class SemanticSkillIndex:
+    """Skill embeddings for a taxonomy, matched against document chunks in one matmul.
+
+    The L2-normalized skill matrix is stored next to the YAML as
+    `<stem>.<model>.npy` and opened memory-mapped. A sidecar JSON records the
+    YAML digest it was built from, so skills are only re-encoded when the
+    taxonomy changes. Thresholds are per category, read from
+    `<stem>.thresholds.yaml` (SEMANTIC_THRESHOLD for unlisted categories).
+    """
+
+    def __init__(self, index: TaxonomyIndex, yaml_path: str, model_name: str = EMBED_MODEL_NAME):
+        self.index = index
+        self.model_key = f"{model_name}@{EMBED_BACKEND}"
+        stem = Path(yaml_path).with_suffix("")
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.model_key.split("/")[-1])
+        self.matrix_path = stem.with_name(f"{stem.name}.{slug}.npy")
+        self.meta_path = self.matrix_path.with_suffix(".json")
+        self.matrix = self._load_or_build(Path(yaml_path), model_name)
+
+        thresholds = load_skills_yaml(str(stem.with_name(f"{stem.name}.thresholds.yaml")))
+        # One (skill, category) pair per entry: a skill listed twice can clear one category's bar but not the other's
+        pairs = [(sid, cat) for sid, cats in enumerate(index.skill_cats) for cat in cats]
+        self.pair_skill = np.asarray([sid for sid, _ in pairs], dtype=np.int64)
+        self.pair_cat = [cat for _, cat in pairs]
+        self.pair_threshold = np.asarray(
+            [float(thresholds.get(cat, SEMANTIC_THRESHOLD)) for _, cat in pairs], dtype=np.float32
+        )
+
+    def _load_or_build(self, yaml_path: Path, model_name: str) -> np.ndarray:
+        digest = hashlib.sha256(yaml_path.read_bytes()).hexdigest()
+        try:
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+            if meta["yaml_sha256"] == digest and meta["model"] == self.model_key and meta["skills"] == self.index.skills:
+                return np.load(self.matrix_path, mmap_mode="r")
+        except Exception:
+            pass
+
+        if not self.index.skills:
+            return np.zeros((0, 0), dtype=np.float32)
+        with timer("taxonomy.embed_skills"):
+            matrix = _normalize_rows(encode_cached(self.index.skills, model_name)).astype(np.float32)
+        tmp = self.matrix_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                np.save(f, matrix)
+            os.replace(tmp, self.matrix_path)
+            meta = {"yaml_sha256": digest, "model": self.model_key, "skills": self.index.skills}
+            tmp.write_text(json.dumps(meta), encoding="utf-8")
+            os.replace(tmp, self.meta_path)  # written last: a matrix without meta is never trusted
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return matrix
+        return np.load(self.matrix_path, mmap_mode="r")
+
+    def match(self, chunk_embs: np.ndarray) -> Dict[str, set]:
+        """Skills whose best-matching chunk clears their category threshold, grouped by category."""
+        out = {cat: set() for cat in self.index.categories}
+        if not len(self.pair_skill) or chunk_embs is None or not len(chunk_embs):
+            return out
+        # (chunks × dim) @ (dim × skills): every skill scored against every chunk at once
+        scores = (_normalize_rows(np.asarray(chunk_embs, dtype=np.float32)) @ self.matrix.T).max(axis=0)
+        for i in np.nonzero(scores[self.pair_skill] >= self.pair_threshold)[0]:
+            out[self.pair_cat[i]].add(self.index.skills[self.pair_skill[i]])
+        return out
+
+
+_semantic_indexes: Dict[str, Tuple[Tuple[int, int], SemanticSkillIndex]] = {}
+
+
+def load_semantic_index(yaml_path: str = taxonomy_path) -> SemanticSkillIndex:
+    """Semantic index for a taxonomy YAML, reloaded when the YAML or its thresholds file changes."""
+    key = os.path.abspath(yaml_path)
+    stem = Path(key).with_suffix("")
+    thresholds = stem.with_name(f"{stem.name}.thresholds.yaml")
+    version = (os.stat(key).st_mtime_ns, thresholds.stat().st_mtime_ns if thresholds.exists() else 0)
+    cache_key = f"{key}@{EMBED_BACKEND}"
+    cached = _semantic_indexes.get(cache_key)
+    if cached and cached[0] == version:
+        return cached[1]
+    index = SemanticSkillIndex(load_taxonomy_index(key), key)
+    _semantic_indexes[cache_key] = (version, index)
+    return index
+
+
+def _coverage_from_matches(matched_resume: Dict[str, set], matched_jd: Dict[str, set]) -> Dict:
+    coverage = {}
+    for cat, jd_set in matched_jd.items():
+        resume_set = matched_resume.get(cat, set())
+        overlap = resume_set & jd_set
         coverage[cat] = {
-            "job_count": len(matched_jd),
-            "resume_count": len(matched_resume),
+            "job_count": len(jd_set),
+            "resume_count": len(resume_set),
             "overlap_count": len(overlap),
-            "coverage_pct": round(len(overlap) / len(matched_jd) * 100, 2) if matched_jd else 0.0,
-            "missing": missing,
+            "coverage_pct": round(len(overlap) / len(jd_set) * 100, 2) if jd_set else 0.0,
+            "missing": sorted(list(jd_set - resume_set)),
         }
     return coverage
 
 
-def _build_generation_prompt(resume_text: str, jd_text: str, missing_skills: List[str]) -> str:
-    mk = ", ".join(missing_skills) if missing_skills else "none"
-    return (
-        "You are an AI resume coach. "
-        "Given a resume and a job description, write 3–6 short action-oriented resume bullets "
-        "that incorporate the missing skills where possible.\n\n"
-        f"Job Description:\n{jd_text}\n\n"
-        f"Resume:\n{resume_text}\n\n"
-        f"Missing skills to emphasize: {mk}\n\nBullets:\n-"
-    )
+def coverage_mean_pct(coverage: Dict) -> float:
+    """Average coverage_pct over every taxonomy category (the headline coverage number)."""
+    pcts = [v["coverage_pct"] for v in coverage.values()]
+    return round(sum(pcts) / len(pcts), 2) if pcts else 0.0
 
 
-def suggest_resume_bullets(resume_text: str, jd_text: str, missing_skills: List[str]) -> List[str]:
-    prompt = _build_generation_prompt(resume_text, jd_text, missing_skills)
+@timed("taxonomy")
+def taxonomy_coverage_bulk(resume_texts: List[str], jd_text: str, yaml_path: str = taxonomy_path,
+                           threshold: int = 75, cleaned: bool = False, mode: str = TAXONOMY_MODE,
+                           resume_chunk_embs: Optional[List[np.ndarray]] = None,
+                           jd_chunk_embs: Optional[np.ndarray] = None) -> List[Dict]:
+    """Taxonomy coverage of many resumes against one JD; the taxonomy and JD matches are computed once.
 
-    if HF_API_TOKEN:
-        try:
-            from huggingface_hub import InferenceClient
-            client = InferenceClient(token=HF_API_TOKEN)
-            result = client.text_generation(model=HF_TEXTGEN_MODEL, inputs=prompt, parameters={"max_new_tokens": 200})
-            text = result[0]["generated_text"] if isinstance(result, list) else str(result)
-            return [ln.strip("-• ").strip() for ln in text.splitlines() if ln.strip()][:6]
-        except Exception:
-            pass
+    In "semantic"/"hybrid" mode, pass the documents' chunk embeddings if they are
+    already computed; otherwise the texts are chunked and encoded here.
+    """
+    index = load_taxonomy_index(yaml_path)
+    if not index.categories:
+        return [{} for _ in resume_texts]
+    semantic = load_semantic_index(yaml_path) if mode in ("semantic", "hybrid") else None
+
+    def _match(text_l: str, chunk_embs: Optional[np.ndarray]) -> Dict[str, set]:
+        if mode == "semantic":
+            matched = {cat: set() for cat in index.categories}
+        else:
+            matched = index.match(text_l, threshold)
+        if semantic is not None:
+            if chunk_embs is None:
+                chunk_embs = encode_cached(chunk_text(text_l))
+            for cat, skills in semantic.match(chunk_embs).items():
+                matched[cat] |= skills
+        return matched
+
+    jd_l = jd_text if cleaned else clean_text(jd_text)
+    matched_jd = _match(jd_l, jd_chunk_embs)
+    results = []
+    for i, r in enumerate(resume_texts):
+        resume_l = r if cleaned else clean_text(r)
+        embs = resume_chunk_embs[i] if resume_chunk_embs is not None else None
+        results.append(_coverage_from_matches(_match(resume_l, embs), matched_jd))
+    return results
 
-    return [f"Demonstrated expertise in {s} through data-driven projects." for s in missing_skills[:6]]
+
+@timed("generation")
+def suggest_resume_bullets(resume_text: str, jd_text: str, missing_skills: List[str]) -> List[str]:
+    # Bounded by NLP_GENERATION_DEADLINE_SECONDS; template bullets on timeout or error
+    return submit_bullets(resume_text, jd_text, missing_skills).result()
 
 
 def extract_text_from_pdf(path: str) -> str:
-    if pdfplumber is None:
-        return ""
-    text = []
-    with pdfplumber.open(path) as pdf:
-        for p in pdf.pages:
-            txt = p.extract_text()
-            if txt:
-                text.append(txt)
-    return "\n".join(text)
+    return "\n".join(txt for txt in iter_pdf_pages(path) if txt)
 
 
 def extract_text_from_docx(path: str) -> str:
-    if docx is None:
-        return ""
-    d = docx.Document(path)
-    return "\n".join([p.text for p in d.paragraphs if p.text])
+    return "\n".join(iter_docx_pages(path))
 
 
+@timed("extract.document")
 def read_resume(path: str) -> str:
-    p = Path(path)
-    if not p.exists():
-        return ""
-    ext = p.suffix.lower()
-    if ext == ".pdf":
-        return extract_text_from_pdf(str(p))
-    if ext in [".docx", ".doc"]:
-        return extract_text_from_docx(str(p))
-    return p.read_text(encoding="utf-8", errors="ignore")
+    # Parse-cached by content hash; long PDFs are extracted page-parallel (see doc_extract)
+    return extract_document(path)
+
+
+@timed("extract.document")
+def read_resume_bytes(data: bytes, filename: str) -> str:
+    # Uploads: parsed from memory, cached by content hash (never written to disk)
+    return extract_document_bytes(data, filename)
+
+
+# ---------- BATCH RANKING ---------- #
+
+RESUME_EXTENSIONS = {".pdf", ".docx", ".doc", ".txt", ".md"}
+
+
+def iter_resume_sources(source: str) -> Iterator[Tuple[str, str]]:
+    """Yield (resume_id, raw_text) from a directory of resumes or a manifest file.
+
+    Manifests: `.csv` with a `path` or `text` column (optional `id`), `.jsonl` with
+    the same keys per line, or any other file with one resume path per line.
+    Relative paths in a manifest are resolved against the manifest's directory.
+    Records with neither text nor a path are skipped with a warning.
+    """
+    src = Path(source)
+    if src.is_dir():
+        for p in sorted(src.rglob("*")):
+            if p.is_file() and p.suffix.lower() in RESUME_EXTENSIONS:
+                yield str(p.relative_to(src)), read_resume(str(p))
+        return
+
+    def _resolve(path: str) -> str:
+        p = Path(path)
+        return str(p if p.is_absolute() else src.parent / p)
+
+    def _from_record(rec: Dict, line_no: int) -> Optional[Tuple[str, str]]:
+        if rec.get("text"):
+            return str(rec.get("id") or line_no), rec["text"]
+        path = (rec.get("path") or "").strip()
+        if not path:  # would resolve to the manifest's own directory
+            warnings.warn(f"{src.name} record {line_no} ({rec.get('id') or 'no id'}) has no text or path; skipped")
+            return None
+        return str(rec.get("id") or path), read_resume(_resolve(path))
+
+    ext = src.suffix.lower()
+    with open(src, "r", encoding="utf-8", newline="") as f:
+        if ext in (".csv", ".jsonl"):
+            if ext == ".csv":
+                records = enumerate(csv.DictReader(f))
+            else:
+                records = ((i, json.loads(line)) for i, line in enumerate(f) if line.strip())
+            for i, rec in records:
+                item = _from_record(rec, i)
+                if item is not None:
+                    yield item
+        else:
+            for line in f:
+                path = line.strip()
+                if path and not path.startswith("#"):
+                    yield path, read_resume(_resolve(path))
+
+
+def score_resumes(jd_text: str, resumes: Iterable[Tuple[str, str]], skills_yaml_path: str = taxonomy_path,
+                  batch_size: int = 64, threshold: int = 70, similarity_mode: str = SIMILARITY_MODE,
+                  pooling: str = SIMILARITY_POOLING) -> Iterator[List[Dict]]:
+    """Score resumes against one JD, yielding a list of result dicts per finished batch.
+
+    Scores match `analyze_resume_vs_jd` for the same `similarity_mode`. The JD
+    is encoded once; each batch of resumes (or all of their chunks) goes
+    through a single `encode` call.
+    """
+    jd_clean = clean_text(jd_text)
+    chunked = similarity_mode == "chunked"
+    jd_embs = encode_cached(chunk_text(jd_text) if chunked else [jd_clean])
+
+    # Semantic skill matching always uses chunk embeddings (see taxonomy_chunk_embeddings)
+    semantic = TAXONOMY_MODE != "fuzzy"
+    jd_tax_embs = (jd_embs if chunked else encode_cached(chunk_text(jd_text))) if semantic else None
+
+    def _flush(ids: List[str], texts: List[str]) -> List[Dict]:
+        cleaned = [clean_text(t) for t in texts]
+        text_chunks = [chunk_text(t) for t in texts] if chunked or semantic else []
+        chunks = text_chunks if chunked else [[c] for c in cleaned]
+        if semantic and not chunked:
+            chunks = chunks + text_chunks  # one encode call for the document vectors and the taxonomy chunks
+        flat = encode_cached([c for cs in chunks for c in cs], batch_size=batch_size)
+        bounds = np.cumsum([0] + [len(cs) for cs in chunks])
+        embs = [flat[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+        n = len(texts)
+        if chunked:
+            sims = [chunked_similarity(e, jd_embs, pooling=pooling) for e in embs]
+        else:  # one vector per document: the cosine scores are one matrix-vector product
+            sims = [round(float(x) * 100, 2) for x in _normalize_rows(flat[:n]) @ _normalize_rows(jd_embs)[0]]
+        tax_embs = (embs if chunked else embs[n:]) if semantic else None
+        coverages = taxonomy_coverage_bulk(cleaned, jd_clean, skills_yaml_path, threshold, cleaned=True,
+                                           resume_chunk_embs=tax_embs, jd_chunk_embs=jd_tax_embs)
+        rows = []
+        for rid, sim, cov in zip(ids, sims, coverages):
+            rows.append({
+                "id": rid,
+                "similarity": float(sim),
+                "taxonomy_coverage_pct": coverage_mean_pct(cov),
+                "missing_skills": sorted({m for v in cov.values() for m in v["missing"]}),
+                "taxonomy_coverage": cov,
+            })
+        return rows
+
+    ids, texts = [], []
+    for rid, text in resumes:
+        ids.append(rid)
+        texts.append(text)
+        if len(ids) >= batch_size:
+            yield _flush(ids, texts)
+            ids, texts = [], []
+    if ids:
+        yield _flush(ids, texts)
+
+
+def rank_resumes(jd_text: str, resumes: Iterable[Tuple[str, str]], skills_yaml_path: str = taxonomy_path,
+                 batch_size: int = 64, top_k: Optional[int] = None) -> List[Dict]:
+    """Rank a pool of resumes against one JD by similarity (ties broken by taxonomy coverage)."""
+    rows = [r for batch in score_resumes(jd_text, resumes, skills_yaml_path, batch_size) for r in batch]
+    rows.sort(key=lambda r: (r["similarity"], r["taxonomy_coverage_pct"]), reverse=True)
+    for i, r in enumerate(rows, 1):
+        r["rank"] = i
+    return rows[:top_k] if top_k else rows
 
 
 # ONE-CALL ANALYZER
-def analyze_resume_vs_jd(resume_text: str, jd_text: str, skills_yaml_path: str = taxonomy_path) -> Dict:
+class AnalysisContext:
+    """Per-request memo for the analysis pipeline.
+
+    Each intermediate (cleaned text, document embeddings, JD keyword candidates,
+    irrelevant-term set) is computed once on first access and shared by every
+    stage that needs it.
+    """
+
+    def __init__(self, resume_text: str, jd_text: str, skills_yaml_path: str = taxonomy_path, top_n: int = 25,
+                 similarity_mode: str = SIMILARITY_MODE, pooling: str = SIMILARITY_POOLING):
+        self.resume_text = resume_text
+        self.jd_text = jd_text
+        self.skills_yaml_path = skills_yaml_path
+        self.top_n = top_n
+        self.similarity_mode = similarity_mode
+        self.pooling = pooling
+
+    @cached_property
+    def resume_clean(self) -> str:
+        return clean_text(self.resume_text)
+
+    @cached_property
+    def jd_clean(self) -> str:
+        return clean_text(self.jd_text)
+
+    @cached_property
+    def resume_chunks(self) -> List[str]:
+        return chunk_text(self.resume_text) if self.similarity_mode == "chunked" else [self.resume_clean]
+
+    @cached_property
+    def jd_chunks(self) -> List[str]:
+        return chunk_text(self.jd_text) if self.similarity_mode == "chunked" else [self.jd_clean]
+
+    @cached_property
+    def chunk_embeddings(self) -> Tuple[np.ndarray, np.ndarray]:
+        embs = encode_cached(self.resume_chunks + self.jd_chunks)
+        n = len(self.resume_chunks)
+        return embs[:n], embs[n:]
+
+    @cached_property
+    def embeddings(self) -> np.ndarray:
+        """Document-level embeddings (resume, JD): the mean of each document's chunk embeddings."""
+        r, j = self.chunk_embeddings
+        return np.vstack([r.mean(axis=0), j.mean(axis=0)])
+
+    @cached_property
+    def jd_candidates(self) -> List[Tuple[str, float]]:
+        return _extract_keywords_clean(self.jd_clean, self.top_n, doc_embedding=self.embeddings[1])
+
+    @cached_property
+    def irrelevant_terms(self) -> set:
+        return build_irrelevant_terms([k for k, _ in self.jd_candidates], self.jd_text)
+
+
+def stage_similarity(ctx: AnalysisContext) -> float:
+    return chunked_similarity(*ctx.chunk_embeddings, pooling=ctx.pooling)
+
+
+def stage_keywords(ctx: AnalysisContext) -> Tuple[List[str], List[str]]:
+    jd_raw = [k for k, _ in ctx.jd_candidates]
+    sem_missing_raw = _missing_from(ctx.jd_candidates, ctx.resume_clean)
+    # semantic_missing ⊆ jd_raw, so a single irrelevant-term set serves both lists
+    return filter_keywords(jd_raw, ctx.irrelevant_terms), filter_keywords(sem_missing_raw, ctx.irrelevant_terms)
+
+
+def stage_taxonomy(ctx: AnalysisContext) -> Dict:
+    # Semantic matching always uses chunk_text embeddings; in chunked mode they are the similarity stage's
+    if TAXONOMY_MODE == "fuzzy":
+        chunk_embs = None
+    elif ctx.similarity_mode == "chunked":
+        chunk_embs = ctx.chunk_embeddings
+    else:
+        chunk_embs = tuple(taxonomy_chunk_embeddings([ctx.resume_text, ctx.jd_text]))
+    return _taxonomy_coverage_clean(ctx.resume_clean, ctx.jd_clean, yaml_path=ctx.skills_yaml_path, threshold=70,
+                                    chunk_embs=chunk_embs)
+
+
+def generation_targets(out: Dict) -> List[str]:
+    """Skills the bullet generator should emphasize: taxonomy gaps, else semantic misses."""
+    taxonomy_missing = sorted({m for info in out["taxonomy_coverage"].values() for m in info.get("missing", [])})
+    return taxonomy_missing or out["semantic_missing"][:8]
+
+
+@timed("analyze.total")
+def analyze_resume_vs_jd(
+    resume_text: str, jd_text: str, skills_yaml_path: str = taxonomy_path, generate_bullets: bool = True
+) -> Dict:
+    """Full analysis. With generate_bullets=False the (slow) bullet generation is skipped
+    and left to the caller, e.g. `submit_bullets(resume, jd, generation_targets(out))`."""
+    ctx = AnalysisContext(resume_text, jd_text, skills_yaml_path)
     out = {}
-    out["similarity"] = compute_similarity(resume_text, jd_text)
-    jd_raw = [k for k, _ in extract_keywords(jd_text, top_n=25)]
-    sem_missing_raw = find_missing_semantic(resume_text, jd_text, top_n=25)
-
-    # Apply dynamic cleaning
-    out["jd_keywords"] = clean_keywords(jd_raw, jd_text)
-    out["semantic_missing"] = clean_keywords(sem_missing_raw, jd_text)
-
-    out["taxonomy_coverage"] = taxonomy_coverage(resume_text, jd_text, yaml_path=skills_yaml_path, threshold=70)
-
-    taxonomy_missing = []
-    for cat, info in out["taxonomy_coverage"].items():
-        taxonomy_missing += info.get("missing", [])
-    taxonomy_missing = sorted(set(taxonomy_missing))
-    missing_for_gen = taxonomy_missing or out["semantic_missing"][:8]
-    out["suggested_bullets"] = suggest_resume_bullets(resume_text, jd_text, missing_for_gen)
+    with timer("analyze.similarity"):
+        out["similarity"] = stage_similarity(ctx)
+    with timer("analyze.keywords"):
+        out["jd_keywords"], out["semantic_missing"] = stage_keywords(ctx)
+    with timer("analyze.taxonomy"):
+        out["taxonomy_coverage"] = stage_taxonomy(ctx)
+
+    if generate_bullets:
+        out["suggested_bullets"] = suggest_resume_bullets(resume_text, jd_text, generation_targets(out))
     return out
+
+
+# ---------- INCREMENTAL ANALYSIS ---------- #
+
+PARAGRAPH_CACHE_MAX = 512
+
+
+def split_paragraphs(text: str) -> List[str]:
+    return [p.strip() for p in re.split(r"\n\s*\n", str(text or "")) if p.strip()]
+
+
+class IncrementalAnalyzer:
+    """Analysis memo for edit-and-rerun loops; keep one per user session.
+
+    Both documents are split into blank-line paragraphs keyed by content hash,
+    in every similarity mode. Each paragraph's chunk embeddings, keyword
+    candidates and taxonomy hits are kept, so a rerun only encodes the
+    paragraphs that changed (a short paragraph is one text) and recombines
+    document-level results from the per-paragraph parts: similarity pools over
+    the concatenated chunk embeddings ("chunked") or compares the mean chunk
+    embeddings ("full"), taxonomy matches are the union of paragraph matches,
+    and KeyBERT scores the union of the paragraphs' candidates. JD keywords and
+    irrelevant terms are reused while the JD is unchanged.
+
+    Paragraphs are encoded independently, so scores can differ slightly from
+    `analyze_resume_vs_jd`, which chunks (or in "full" mode encodes) the whole
+    document.
+    """
+
+    def __init__(self, skills_yaml_path: str = taxonomy_path, top_n: int = 25,
+                 similarity_mode: str = SIMILARITY_MODE, pooling: str = SIMILARITY_POOLING,
+                 max_paragraphs: int = PARAGRAPH_CACHE_MAX):
+        self.skills_yaml_path = skills_yaml_path
+        self.top_n = top_n
+        self.similarity_mode = similarity_mode
+        self.pooling = pooling
+        self.max_paragraphs = max_paragraphs
+        self._paragraphs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._jd_key: Optional[str] = None
+        self._jd_keywords: Optional[Tuple[List[Tuple[str, float]], set]] = None
+
+    @staticmethod
+    def _key(paragraph: str) -> str:
+        return hashlib.sha256(paragraph.encode("utf-8")).hexdigest()
+
+    def _paragraph_records(self, docs: List[List[str]]) -> List[List[Dict]]:
+        """Records for each document's paragraphs; new paragraphs are encoded in one batch."""
+        new: Dict[str, Dict] = {}
+        keyed = []
+        for paragraphs in docs:
+            keys = []
+            for p in paragraphs:
+                key = self._key(p)
+                if key in self._paragraphs:
+                    self._paragraphs.move_to_end(key)
+                elif key not in new:
+                    new[key] = {"clean": clean_text(p), "chunks": chunk_text(p)}
+                keys.append(key)
+            keyed.append(keys)
+        METRICS.incr("incremental.paragraph_hits", sum(len(k) for k in keyed) - len(new))
+        METRICS.incr("incremental.paragraph_misses", len(new))
+
+        if new:
+            chunks = [c for rec in new.values() for c in rec["chunks"]]
+            embs = encode_cached(chunks)
+            i = 0
+            for rec in new.values():
+                rec["embs"] = embs[i:i + len(rec["chunks"])]
+                i += len(rec["chunks"])
+            self._paragraphs.update(new)
+        records = [[self._paragraphs[k] for k in keys] for keys in keyed]
+        while len(self._paragraphs) > self.max_paragraphs:
+            self._paragraphs.popitem(last=False)
+        return records
+
+    def _taxonomy_hits(self, rec: Dict, index: TaxonomyIndex, threshold: int) -> Dict[str, set]:
+        # Cached per compiled index, so an edited skills.yaml invalidates every paragraph's hits
+        if rec.get("taxonomy_index") is not index:
+            if TAXONOMY_MODE == "semantic":
+                hits = {cat: set() for cat in index.categories}
+            else:
+                hits = index.match(rec["clean"], threshold)
+            if TAXONOMY_MODE in ("semantic", "hybrid"):
+                for cat, skills in load_semantic_index(self.skills_yaml_path).match(rec["embs"]).items():
+                    hits[cat] |= skills
+            rec["taxonomy"], rec["taxonomy_index"] = hits, index
+        return rec["taxonomy"]
+
+    def _doc_taxonomy(self, records: List[Dict], index: TaxonomyIndex, threshold: int) -> Dict[str, set]:
+        out = {cat: set() for cat in index.categories}
+        for rec in records:
+            for cat, skills in self._taxonomy_hits(rec, index, threshold).items():
+                out[cat] |= skills
+        return out
+
+    def _jd_candidates(self, jd_text: str, jd_clean: str, records: List[Dict], doc_embedding: np.ndarray):
+        key = self._key(jd_text)
+        if key != self._jd_key:
+            vocab = set()
+            for rec in records:
+                if "vocab" not in rec:
+                    rec["vocab"] = candidate_vocabulary(rec["clean"])
+                vocab.update(rec["vocab"])
+            candidates = _extract_keywords_clean(jd_clean, self.top_n, doc_embedding=doc_embedding,
+                                                 candidates=sorted(vocab))
+            irrelevant = build_irrelevant_terms([k for k, _ in candidates], jd_text)
+            self._jd_key, self._jd_keywords = key, (candidates, irrelevant)
+        return self._jd_keywords
+
+    @timed("analyze.incremental")
+    def analyze(self, resume_text: str, jd_text: str, generate_bullets: bool = True) -> Dict:
+        """Same result keys as `analyze_resume_vs_jd`."""
+        resume_recs, jd_recs = self._paragraph_records([split_paragraphs(resume_text), split_paragraphs(jd_text)])
+        resume_clean, jd_clean = clean_text(resume_text), clean_text(jd_text)
+        r_embs = np.vstack([rec["embs"] for rec in resume_recs]) if resume_recs else encode_cached([resume_clean])
+        j_embs = np.vstack([rec["embs"] for rec in jd_recs]) if jd_recs else encode_cached([jd_clean])
+
+        out = {}
+        with timer("analyze.similarity"):
+            if self.similarity_mode == "chunked":
+                out["similarity"] = chunked_similarity(r_embs, j_embs, pooling=self.pooling)
+            else:
+                out["similarity"] = chunked_similarity(r_embs.mean(axis=0)[None], j_embs.mean(axis=0)[None])
+        with timer("analyze.keywords"):
+            candidates, irrelevant = self._jd_candidates(jd_text, jd_clean, jd_recs, j_embs.mean(axis=0))
+            out["jd_keywords"] = filter_keywords([k for k, _ in candidates], irrelevant)
+            out["semantic_missing"] = filter_keywords(_missing_from(candidates, resume_clean), irrelevant)
+        with timer("analyze.taxonomy"):
+            index = load_taxonomy_index(self.skills_yaml_path)
+            out["taxonomy_coverage"] = _coverage_from_matches(
+                self._doc_taxonomy(resume_recs, index, 70), self._doc_taxonomy(jd_recs, index, 70)
+            ) if index.categories else {}
+
+        if generate_bullets:
+            out["suggested_bullets"] = suggest_resume_bullets(resume_text, jd_text, generation_targets(out))
+        return out
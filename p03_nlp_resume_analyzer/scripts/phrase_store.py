@@ -0,0 +1,145 @@
+# scripts/phrase_store.py
+
+"""
+Shared phrase-embedding store for KeyBERT candidates.
+
+Candidate phrases ("machine learning", "data pipelines", ...) recur across
+thousands of JDs. Their embeddings are kept in SQLite (.cache_nlp/phrases.sqlite
+in the project directory, one float32 BLOB per (model, phrase)) and shared by
+every session and process.
+`embed_phrases` looks all candidates up in one query and encodes only the
+unseen ones, in one batch. The store is bounded by entry count and by total
+vector bytes; least recently used phrases are evicted first. Hits and misses
+are counted as `phrase_cache.hits` / `phrase_cache.misses`.
+"""
+
+from typing import Dict, List, Optional
+from pathlib import Path
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from scripts.metrics import METRICS, timer
+
+PHRASE_DB_PATH = Path(__file__).resolve().parent.parent / ".cache_nlp" / "phrases.sqlite"
+PHRASE_CACHE_MAX_ENTRIES = int(os.getenv("NLP_PHRASE_CACHE_MAX_ENTRIES", "200000"))
+PHRASE_CACHE_MAX_MB = float(os.getenv("NLP_PHRASE_CACHE_MAX_MB", "256"))
+_SQL_VARS = 500  # stay well under SQLite's bound-parameter limit
+
+
+class PhraseEmbeddingStore:
+    def __init__(self, path: Path = PHRASE_DB_PATH, max_entries: int = PHRASE_CACHE_MAX_ENTRIES,
+                 max_bytes: int = int(PHRASE_CACHE_MAX_MB * 1024 * 1024)):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS phrases ("
+                " model TEXT NOT NULL, phrase TEXT NOT NULL, vec BLOB NOT NULL,"
+                " nbytes INTEGER NOT NULL, last_used REAL NOT NULL,"
+                " PRIMARY KEY (model, phrase)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS phrases_last_used ON phrases (last_used)")
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets readers in other processes run during writes
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, phrases: List[str], model_key: str) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        if not phrases:
+            return found
+        try:
+            conn = self._conn()
+            with conn:
+                for i in range(0, len(phrases), _SQL_VARS):
+                    part = phrases[i:i + _SQL_VARS]
+                    marks = ",".join("?" * len(part))
+                    rows = conn.execute(
+                        f"SELECT phrase, vec FROM phrases WHERE model = ? AND phrase IN ({marks})", [model_key, *part]
+                    ).fetchall()
+                    for phrase, vec in rows:
+                        found[phrase] = np.frombuffer(vec, dtype=np.float32)
+                    hit = [p for p in part if p in found]
+                    if hit:
+                        conn.execute(
+                            f"UPDATE phrases SET last_used = ? WHERE model = ? AND phrase IN ({','.join('?' * len(hit))})",
+                            [time.time(), model_key, *hit],
+                        )
+        except sqlite3.Error:
+            pass  # a locked or unreadable store only costs re-encoding
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray], model_key: str):
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for phrase, emb in items.items():
+            blob = np.asarray(emb, dtype=np.float32).tobytes()
+            rows.append((model_key, phrase, blob, len(blob), now))
+        try:
+            conn = self._conn()
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO phrases VALUES (?, ?, ?, ?, ?)", rows)
+            self._evict(conn)
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, conn: sqlite3.Connection):
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM phrases").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Evict down to 90% of both bounds so eviction doesn't run on every insert
+        avg = total / count if count else 1
+        keep = int(min(self.max_entries, self.max_bytes / max(avg, 1)) * 0.9)
+        with conn:
+            conn.execute(
+                "DELETE FROM phrases WHERE (model, phrase) IN "
+                "(SELECT model, phrase FROM phrases ORDER BY last_used LIMIT ?)",
+                (count - keep,),
+            )
+
+    def stats(self) -> Dict:
+        count, total = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM phrases").fetchone()
+        return {"entries": count, "bytes": total, "max_entries": self.max_entries, "max_bytes": self.max_bytes}
+
+
+_store: Optional[PhraseEmbeddingStore] = None
+_store_lock = threading.Lock()
+
+
+def get_phrase_store() -> PhraseEmbeddingStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PhraseEmbeddingStore()
+    return _store
+
+
+def embed_phrases(phrases: List[str], encoder, model_key: str, batch_size: int = 64) -> np.ndarray:
+    """Embeddings for `phrases` (in order): store hits plus one batched encode of the misses."""
+    store = get_phrase_store()
+    found = store.get_many(phrases, model_key)
+    misses = [p for p in phrases if p not in found]
+    METRICS.incr("phrase_cache.hits", len(phrases) - len(misses))
+    METRICS.incr("phrase_cache.misses", len(misses))
+    if misses:
+        with timer("keybert.encode_phrases"):
+            embs = np.asarray(encoder.encode(misses, batch_size=batch_size, convert_to_numpy=True), dtype=np.float32)
+        new = dict(zip(misses, embs))
+        store.put_many(new, model_key)
+        found.update(new)
+    return np.vstack([found[p] for p in phrases]) if phrases else np.zeros((0, 0), dtype=np.float32)
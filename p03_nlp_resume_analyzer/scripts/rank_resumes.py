@@ -0,0 +1,69 @@
+# scripts/rank_resumes.py
+
+"""
+Rank a pool of resumes against one job description.
+
+Resumes come from a directory (pdf/docx/txt) or a manifest (.csv / .jsonl /
+one path per line). Scored rows are streamed to JSONL or CSV as each batch
+finishes; the final ranking is printed at the end.
+
+    python scripts/rank_resumes.py --jd jd.txt --resumes resumes/ --out scores.jsonl
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.nlp_core import iter_resume_sources, score_resumes, taxonomy_path  # noqa: E402
+
+CSV_FIELDS = ["id", "similarity", "taxonomy_coverage_pct", "missing_skills"]
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Rank resumes against a job description.")
+    ap.add_argument("--jd", required=True, help="Path to the job description text file")
+    ap.add_argument("--resumes", required=True, help="Directory of resumes or manifest file")
+    ap.add_argument("--out", required=True, help="Output file (.jsonl or .csv)")
+    ap.add_argument("--skills", default=taxonomy_path, help="Skill taxonomy YAML")
+    ap.add_argument("--batch-size", type=int, default=64)
+    ap.add_argument("--top-k", type=int, default=10, help="Number of ranked results to print")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    with open(args.jd, "r", encoding="utf-8", errors="ignore") as f:
+        jd_text = f.read()
+
+    as_csv = args.out.lower().endswith(".csv")
+    rows, start = [], time.perf_counter()
+    print(f"🚀 Scoring resumes from {args.resumes} (batch size {args.batch_size})...")
+
+    with open(args.out, "w", encoding="utf-8", newline="") as out:
+        writer = csv.DictWriter(out, fieldnames=CSV_FIELDS, extrasaction="ignore") if as_csv else None
+        if writer:
+            writer.writeheader()
+        for batch in score_resumes(jd_text, iter_resume_sources(args.resumes), args.skills, args.batch_size):
+            for r in batch:
+                if writer:
+                    writer.writerow({**r, "missing_skills": "; ".join(r["missing_skills"])})
+                else:
+                    out.write(json.dumps(r) + "\n")
+            out.flush()
+            rows.extend(batch)
+            elapsed = time.perf_counter() - start
+            print(f"✅ {len(rows):,} scored ({len(rows) / elapsed:.1f} resumes/s)")
+
+    rows.sort(key=lambda r: (r["similarity"], r["taxonomy_coverage_pct"]), reverse=True)
+    print(f"\n🏆 Top {min(args.top_k, len(rows))} of {len(rows):,} → full scores in {args.out}")
+    for i, r in enumerate(rows[: args.top_k], 1):
+        print(f"{i:>3}. {r['id']}  similarity={r['similarity']:.2f}%  coverage={r['taxonomy_coverage_pct']:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# scripts/recommendations.py
+
+"""
+Compiled recommendation engine for the targeted-skills section of the app.
+
+`RecommendationEngine` is built once per taxonomy YAML (rebuilt when its mtime
+changes) and holds:
+- the cleaned skill set of every category;
+- a token → categories index: a token belongs to a category when it contains
+  one of its skills or is contained in one. The first is answered by hashing
+  the token's substrings, the second by one `str.find` scan over all skills
+  joined into a single string;
+- the keyword → advice rule table, compiled into one regex.
+
+Token and rule lookups are memoized, so rerenders cost a few dict hits.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from bisect import bisect_right
+import os
+import re
+
+from scripts.metrics import timed
+from scripts.nlp_core import clean_text, load_skills_yaml, _flatten_skills, taxonomy_path
+
+COVERAGE_THRESHOLD = 60.0
+MIN_MATCH_LEN = 3
+
+# (trigger substrings, suggestion, example); the first rule with a trigger in the term wins
+RULES: List[Tuple[Tuple[str, ...], str, str]] = [
+    (("deploy", "deployment", "production", "monitor"),
+     "Emphasize model deployment and monitoring practices (MLOps).",
+     "💡 *Add a line like:* 'Deployed ML models with Docker and CI/CD; monitored drift with MLflow.'"),
+    (("pipeline", "etl", "airflow", "data pipeline"),
+     "Highlight ETL pipelines and data orchestration supporting ML.",
+     "💡 *Add a line like:* 'Built automated ETL pipelines and retraining workflows using Airflow.'"),
+    (("aws", "gcp", "azure", "sagemaker", "vertex"),
+     "Show cloud ML experience (AWS, GCP, Azure).",
+     "💡 *Add a line like:* 'Trained and deployed ML models using AWS SageMaker and GCP Vertex AI.'"),
+    (("git", "version", "ci", "cd"),
+     "Mention version control and CI/CD for reproducible ML workflows.",
+     "💡 *Add a line like:* 'Used Git and CI/CD to manage model lifecycle and deployment automation.'"),
+    (("metric", "validate", "test", "evaluation"),
+     "Include model evaluation and validation methods.",
+     "💡 *Add a line like:* 'Performed cross-validation and tracked performance metrics to improve accuracy.'"),
+    (("communicat", "collabor", "present"),
+     "Emphasize collaboration and stakeholder communication.",
+     "💡 *Add a line like:* 'Partnered with engineering and product teams to translate insights into deployed ML systems.'"),
+]
+
+
+class RecommendationEngine:
+    def __init__(self, raw: Dict, rules: List[Tuple[Tuple[str, ...], str, str]] = RULES):
+        self.category_skills: Dict[str, set] = {}
+        skill_cats: Dict[str, set] = {}
+        for cat, items in (raw or {}).items():
+            skills = {clean_text(s) for s in _flatten_skills(items) if s and isinstance(s, str)}
+            self.category_skills[cat] = skills
+            for s in skills:
+                if len(s) >= MIN_MATCH_LEN:
+                    skill_cats.setdefault(s, set()).add(cat)
+
+        # "skill in token": look up the token's substrings of every skill length
+        self.skill_cats = skill_cats
+        self.skill_lengths = sorted({len(s) for s in skill_cats})
+        # "token in skill": cleaned text never contains \x00, so a hit can't straddle two skills
+        self.skill_list = list(skill_cats)
+        self.haystack = "\x00".join(self.skill_list)
+        self.skill_starts = []
+        pos = 0
+        for s in self.skill_list:
+            self.skill_starts.append(pos)
+            pos += len(s) + 1
+
+        # Lookahead alternation ordered by rule priority: at each position the earliest rule's trigger is reported
+        self.rules = rules
+        self.trigger_rule = {}
+        for rid, (triggers, _, _) in enumerate(rules):
+            for t in triggers:
+                self.trigger_rule.setdefault(t, rid)
+        alternation = "|".join(re.escape(t) for t in sorted(self.trigger_rule, key=self.trigger_rule.get))
+        self.rule_re = re.compile(f"(?=({alternation}))") if alternation else None
+
+        self._token_cats: Dict[str, frozenset] = {}
+        self._rule_ids: Dict[str, Optional[int]] = {}
+
+    def categories_for(self, token: str) -> frozenset:
+        """Categories with a skill that contains, or is contained in, the cleaned token."""
+        t = clean_text(token)
+        cached = self._token_cats.get(t)
+        if cached is not None:
+            return cached
+        cats = set()
+        if len(t) >= MIN_MATCH_LEN:
+            for n in self.skill_lengths:
+                if n > len(t):
+                    break
+                for i in range(len(t) - n + 1):
+                    hit = self.skill_cats.get(t[i:i + n])
+                    if hit:
+                        cats |= hit
+            pos = self.haystack.find(t)
+            while pos != -1:
+                sid = bisect_right(self.skill_starts, pos) - 1
+                cats |= self.skill_cats[self.skill_list[sid]]
+                nxt = self.skill_starts[sid + 1] if sid + 1 < len(self.skill_starts) else len(self.haystack)
+                pos = self.haystack.find(t, nxt)
+        result = frozenset(cats)
+        self._token_cats[t] = result
+        return result
+
+    def rule_for(self, term: str) -> Optional[int]:
+        c = clean_text(term)
+        if c not in self._rule_ids:
+            rids = [self.trigger_rule[m.group(1)] for m in self.rule_re.finditer(c)] if self.rule_re else []
+            self._rule_ids[c] = min(rids) if rids else None
+        return self._rule_ids[c]
+
+    def suggestion_for(self, term: str) -> Dict:
+        rid = self.rule_for(term)
+        if rid is None:
+            suggestion = f"Add or refine a bullet highlighting experience with **{term}**."
+            example = f"💡 *Add a line like:* 'Applied {term} in an end-to-end ML project to enhance predictive performance.'"
+        else:
+            _, suggestion, example = self.rules[rid]
+        return {"term": term, "suggestion": suggestion, "example": example}
+
+    def infer_candidates(self, cat: str, out: dict) -> List[str]:
+        sem_missing = out.get("semantic_missing", []) or []
+        jd_kws = out.get("jd_keywords", []) or []
+        cands = []
+        for pool in (sem_missing, jd_kws):
+            for tok in pool:
+                if cat in self.categories_for(tok) and tok not in cands:
+                    cands.append(tok)
+            if cands:
+                return cands
+        for t in [t for t in sem_missing + jd_kws if len(clean_text(t)) > 3][:3]:
+            if t not in cands:
+                cands.append(t)
+        return cands
+
+    def recommend(self, cov: dict, out: dict, threshold: float = COVERAGE_THRESHOLD) -> dict:
+        recs = {}
+        for cat, info in cov.items():
+            pct = info.get("coverage_pct", 0.0)
+            missing = info.get("missing", []) or []
+            recs[cat] = {"coverage_pct": pct, "missing": missing, "inferred": [], "suggestions": []}
+            if pct >= threshold:
+                continue
+
+            candidates = missing or self.infer_candidates(cat, out)
+            if not missing:
+                recs[cat]["inferred"] = candidates
+            suggestions = [self.suggestion_for(c) for c in candidates]
+
+            if not suggestions:
+                sample = (out.get("jd_keywords", []) or [])[:2]
+                if sample:
+                    suggestions.append({
+                        "term": ", ".join(sample),
+                        "suggestion": f"The job emphasizes {', '.join(sample)} which aren't clearly reflected in your resume.",
+                        "example": f"💡 *Add:* 'Worked with {', '.join(sample)} in production ML workflows.'",
+                    })
+            recs[cat]["suggestions"] = suggestions
+        return recs
+
+
+_engines: Dict[str, Tuple[int, RecommendationEngine]] = {}
+
+
+def load_recommendation_engine(yaml_path: str = taxonomy_path) -> RecommendationEngine:
+    """Engine for a taxonomy YAML, rebuilt only when the file's mtime changes."""
+    key = os.path.abspath(yaml_path)
+    try:
+        mtime = os.stat(key).st_mtime_ns
+    except OSError:
+        return RecommendationEngine({})
+    cached = _engines.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    engine = RecommendationEngine(load_skills_yaml(key))
+    _engines[key] = (mtime, engine)
+    return engine
+
+
+def build_category_skill_map(yaml_path: str = taxonomy_path) -> Dict[str, set]:
+    return load_recommendation_engine(yaml_path).category_skills
+
+
+@timed("recommendations")
+def generate_recommendations(cov: dict, out: dict, yaml_path: str = taxonomy_path) -> dict:
+    return load_recommendation_engine(yaml_path).recommend(cov, out)
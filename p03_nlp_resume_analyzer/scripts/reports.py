@@ -0,0 +1,218 @@
+# scripts/reports.py
+
+"""
+PDF analysis reports: background rendering, result-hash cache, bulk generation.
+
+- `submit_report` renders on a background thread and returns a Future, so the
+  Streamlit script thread never blocks on ReportLab.
+- Rendered bytes are cached by sha256 of the analysis result and the taxonomy
+  content (in-memory LRU backed by CACHE_DIR/reports); downloading the same
+  result again is free, and editing skills.yaml invalidates the cached PDFs.
+- `render_reports_bulk` renders a batch of results in a process pool, skipping
+  the ones already cached.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+
+from scripts.metrics import METRICS, timed
+from scripts.nlp_core import coverage_mean_pct, taxonomy_path
+from scripts.recommendations import COVERAGE_THRESHOLD, generate_recommendations
+
+# CONFIGURATION
+REPORT_CACHE_DIR = Path(".cache_nlp") / "reports"
+REPORT_CACHE_MAX_ENTRIES = int(os.getenv("NLP_REPORT_CACHE_MAX_ENTRIES", "128"))
+REPORT_WORKERS = int(os.getenv("NLP_REPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+# The parts of an analysis result a report is built from
+REPORT_FIELDS = ("similarity", "taxonomy_coverage", "jd_keywords", "semantic_missing")
+
+
+_taxonomy_hashes: Dict[str, Tuple[int, str]] = {}
+
+
+def taxonomy_fingerprint(yaml_path: str = taxonomy_path) -> str:
+    """sha256 of the taxonomy file's content, re-hashed only when its mtime changes."""
+    key = os.path.abspath(yaml_path)
+    try:
+        mtime = os.stat(key).st_mtime_ns
+    except OSError:
+        return ""
+    cached = _taxonomy_hashes.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(key, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    _taxonomy_hashes[key] = (mtime, digest)
+    return digest
+
+
+def result_digest(result: Dict, yaml_path: str = taxonomy_path) -> str:
+    """sha256 of the reported fields of a result and the content of the taxonomy it is reported
+    against, so editing skills.yaml re-renders reports (recommendations and timestamp)."""
+    payload = json.dumps({k: result.get(k) for k in REPORT_FIELDS}, sort_keys=True, default=str)
+    taxonomy = f"{os.path.abspath(yaml_path)}\x00{taxonomy_fingerprint(yaml_path)}"
+    return hashlib.sha256(f"{taxonomy}\x00{payload}".encode("utf-8")).hexdigest()
+
+
+# ---------- RENDERING ---------- #
+
+@timed("report.render")
+def render_report(result: Dict, yaml_path: str = taxonomy_path) -> bytes:
+    """Render one analysis result to PDF bytes (top-level, so process-pool workers can run it)."""
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    similarity = float(result.get("similarity", 0.0))
+    cov = result.get("taxonomy_coverage") or {}
+    recs = generate_recommendations(cov, result, yaml_path)
+    improvement_cats = [c for c, v in recs.items() if v["coverage_pct"] < COVERAGE_THRESHOLD]
+    avg_cov = coverage_mean_pct(cov)
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer)
+    styles = getSampleStyleSheet()
+    story = []
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    story.append(Paragraph(f"<b>Report generated:</b> {timestamp}", styles["Normal"]))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph(f"<b>Resume–JD Similarity:</b> {similarity:.2f}%", styles["Normal"]))
+    story.append(Paragraph(f"<b>Average Taxonomy Coverage:</b> {avg_cov:.1f}%", styles["Normal"]))
+    story.append(Spacer(1, 12))
+
+    story.append(Paragraph("<b>Targeted Skill Recommendations:</b>", styles["Heading3"]))
+    for cat in improvement_cats:
+        meta = recs[cat]
+        story.append(Paragraph(f"<b>{cat.replace('_', ' ').title()}</b> — {meta['coverage_pct']:.1f}% coverage", styles["Normal"]))
+        if meta["missing"]:
+            story.append(Paragraph("Detected Gaps: " + ", ".join(meta["missing"]), styles["Normal"]))
+        if meta["inferred"]:
+            story.append(Paragraph("Inferred from JD: " + ", ".join(meta["inferred"]), styles["Normal"]))
+        for s in meta["suggestions"]:
+            story.append(Paragraph(f"- {s['term']}: {s['suggestion']}", styles["Normal"]))
+            story.append(Paragraph(f"  {s['example']}", styles["Normal"]))
+        story.append(Spacer(1, 8))
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+# ---------- REPORT CACHE ---------- #
+
+class ReportCache:
+    """result digest -> PDF bytes; bounded in-memory LRU with a copy on disk."""
+
+    def __init__(self, root: Path = REPORT_CACHE_DIR, max_entries: int = REPORT_CACHE_MAX_ENTRIES):
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self._mem: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[bytes]:
+        with self._lock:
+            if digest in self._mem:
+                self._mem.move_to_end(digest)
+                return self._mem[digest]
+        try:
+            data = (self.root / f"{digest}.pdf").read_bytes()
+        except Exception:
+            return None
+        self._remember(digest, data)
+        return data
+
+    def put(self, digest: str, data: bytes):
+        self._remember(digest, data)
+        tmp = self.root / f".{digest}.{os.getpid()}.tmp"
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(data)
+            os.replace(tmp, self.root / f"{digest}.pdf")
+        except Exception:
+            tmp.unlink(missing_ok=True)
+        self._evict_disk()
+
+    def _remember(self, digest: str, data: bytes):
+        with self._lock:
+            self._mem[digest] = data
+            self._mem.move_to_end(digest)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+
+    def _evict_disk(self):
+        entries = []
+        for p in self.root.glob("*.pdf"):
+            try:
+                entries.append((p.stat().st_mtime, p))
+            except FileNotFoundError:
+                continue  # evicted by another process since the glob
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, p in entries[: len(entries) - self.max_entries]:
+            p.unlink(missing_ok=True)
+
+
+report_cache = ReportCache()
+
+
+# ---------- BACKGROUND / BULK ---------- #
+
+_render_thread: Optional[ThreadPoolExecutor] = None
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _render_and_cache(result: Dict, yaml_path: str, digest: str) -> bytes:
+    data = render_report(result, yaml_path)
+    report_cache.put(digest, data)
+    return data
+
+
+def submit_report(result: Dict, yaml_path: str = taxonomy_path) -> Future:
+    """Future of the report's PDF bytes; already resolved when the result was rendered before."""
+    global _render_thread
+    digest = result_digest(result, yaml_path)
+    cached = report_cache.get(digest)
+    if cached is not None:
+        METRICS.incr("report_cache.hits")
+        fut: Future = Future()
+        fut.set_result(cached)
+        return fut
+    METRICS.incr("report_cache.misses")
+    with _pool_lock:
+        if _render_thread is None:
+            _render_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-render")
+    return _render_thread.submit(_render_and_cache, result, yaml_path, digest)
+
+
+def get_report_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=REPORT_WORKERS)
+        return _pool
+
+
+def render_reports_bulk(results: List[Dict], yaml_path: str = taxonomy_path) -> List[bytes]:
+    """PDF bytes for many results, in order; cache misses are rendered in the process pool."""
+    digests = [result_digest(r, yaml_path) for r in results]
+    out: List[Optional[bytes]] = [report_cache.get(d) for d in digests]
+    misses = [i for i, data in enumerate(out) if data is None]
+    METRICS.incr("report_cache.hits", len(results) - len(misses))
+    METRICS.incr("report_cache.misses", len(misses))
+    if misses:
+        pool = get_report_pool()
+        futures = {i: pool.submit(render_report, results[i], yaml_path) for i in misses}
+        for i, fut in futures.items():
+            out[i] = fut.result()
+            report_cache.put(digests[i], out[i])
+    return out
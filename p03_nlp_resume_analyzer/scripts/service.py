@@ -0,0 +1,170 @@
+# scripts/service.py
+
+"""
+HTTP analysis service (FastAPI) for calling the analyzer from other systems.
+
+Requests go into a bounded asyncio queue and are drained by a fixed number of
+analysis tasks. A full queue answers 503 with Retry-After instead of piling up
+latency. The analyses run on threads, and every embedding and KeyBERT encode
+they make goes through a shared micro-batcher. The batcher groups the calls of
+concurrent requests into batches of up to --max-batch texts, waiting at most
+--max-wait-ms, on --workers model-holding encoder threads.
+
+    python scripts/service.py --port 8000 --workers 2 --max-batch 64 --max-wait-ms 10
+    curl -X POST localhost:8000/analyze -H 'Content-Type: application/json' \\
+         -d '{"resume_text": "...", "jd_text": "..."}'
+
+Endpoints: POST /analyze, GET /health, GET /metrics (Prometheus), GET /metrics.json.
+Load-test with `python scripts/load_test.py`.
+"""
+
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi import FastAPI, HTTPException  # noqa: E402
+from fastapi.responses import PlainTextResponse, Response  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+
+from scripts import nlp_core  # noqa: E402
+from scripts.batching import ENCODER_WORKERS, MAX_BATCH, MAX_WAIT_MS, BatchingEncoder, MicroBatcher  # noqa: E402
+from scripts.embed_backends import EMBED_BACKEND, load_sentence_encoder  # noqa: E402
+from scripts.metrics import METRICS  # noqa: E402
+
+QUEUE_LIMIT = int(os.getenv("NLP_SERVICE_QUEUE_LIMIT", "64"))
+ANALYSIS_CONCURRENCY = int(os.getenv("NLP_SERVICE_CONCURRENCY", "8"))
+
+
+class AnalyzeRequest(BaseModel):
+    resume_text: str
+    jd_text: str
+    generate_bullets: bool = False
+
+
+class AnalysisService:
+    def __init__(self, workers: int = ENCODER_WORKERS, max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS,
+                 queue_limit: int = QUEUE_LIMIT, concurrency: int = ANALYSIS_CONCURRENCY,
+                 skills_yaml_path: str = nlp_core.taxonomy_path):
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.queue_limit = queue_limit
+        self.concurrency = concurrency
+        self.skills_yaml_path = skills_yaml_path
+        self.batcher: Optional[MicroBatcher] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="analysis")
+
+    async def start(self):
+        def _load():
+            factory = lambda: load_sentence_encoder(nlp_core.EMBED_MODEL_NAME, EMBED_BACKEND)  # noqa: E731
+            return MicroBatcher(factory, self.workers, self.max_batch, self.max_wait_ms / 1000)
+
+        self.batcher = await asyncio.to_thread(_load)
+        nlp_core.set_embed_encoder(BatchingEncoder(self.batcher))
+        self._queue = asyncio.Queue(maxsize=self.queue_limit)
+        self._tasks = [asyncio.create_task(self._drain()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for t in self._tasks:
+            t.cancel()
+        nlp_core.set_embed_encoder(None)
+
+    async def analyze(self, req: AnalyzeRequest) -> dict:
+        fut = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((req, fut, time.perf_counter()))
+        except asyncio.QueueFull:
+            METRICS.incr("service.rejected")
+            raise HTTPException(status_code=503, detail="Analysis queue is full", headers={"Retry-After": "1"})
+        return await fut
+
+    async def _drain(self):
+        while True:
+            req, fut, enqueued = await self._queue.get()
+            METRICS.observe("service.queue_wait", time.perf_counter() - enqueued)
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, nlp_core.analyze_resume_vs_jd, req.resume_text, req.jd_text,
+                    self.skills_yaml_path, req.generate_bullets,
+                )
+                if not fut.done():  # the client may have gone away
+                    fut.set_result(result)
+            except Exception as e:
+                if not fut.done():
+                    fut.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def health(self) -> dict:
+        return {
+            "status": "ok" if self.batcher is not None else "starting",
+            "queued": self._queue.qsize() if self._queue else 0,
+            "queue_limit": self.queue_limit,
+            "analysis_concurrency": self.concurrency,
+            "encoder_workers": self.batcher.workers if self.batcher else 0,
+            "encoder_pending": self.batcher.pending() if self.batcher else 0,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait_ms,
+        }
+
+
+def create_app(service: AnalysisService) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await service.start()
+        yield
+        await service.stop()
+
+    app = FastAPI(title="NLP Resume Analyzer", lifespan=lifespan)
+
+    @app.post("/analyze")
+    async def analyze(req: AnalyzeRequest):
+        with METRICS.timer("service.request"):
+            return await service.analyze(req)
+
+    @app.get("/health")
+    async def health():
+        return service.health()
+
+    @app.get("/metrics")
+    async def metrics():
+        return PlainTextResponse(METRICS.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+    @app.get("/metrics.json")
+    async def metrics_json():
+        return Response(METRICS.to_json(), media_type="application/json")
+
+    return app
+
+
+def main():
+    ap = argparse.ArgumentParser(description="HTTP service around analyze_resume_vs_jd with micro-batched encoding.")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--workers", type=int, default=ENCODER_WORKERS, help="Model-holding encoder threads")
+    ap.add_argument("--max-batch", type=int, default=MAX_BATCH, help="Max texts per encoder batch")
+    ap.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS, help="Max time a batch waits to fill")
+    ap.add_argument("--queue-limit", type=int, default=QUEUE_LIMIT, help="Queued requests before answering 503")
+    ap.add_argument("--concurrency", type=int, default=ANALYSIS_CONCURRENCY, help="Analyses in flight")
+    ap.add_argument("--skills", default=nlp_core.taxonomy_path, help="Skill taxonomy YAML")
+    args = ap.parse_args()
+
+    import uvicorn
+    service = AnalysisService(args.workers, args.max_batch, args.max_wait_ms, args.queue_limit, args.concurrency,
+                              args.skills)
+    print(f"🚀 Serving on http://{args.host}:{args.port} ({args.workers} encoder workers, "
+          f"batch ≤{args.max_batch} / ≤{args.max_wait_ms:g} ms, queue {args.queue_limit})")
+    uvicorn.run(create_app(service), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
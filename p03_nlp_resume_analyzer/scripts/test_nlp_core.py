@@ -1,4 +1,12 @@
-from nlp_core import compute_similarity, extract_keyword_gaps, suggest_bullets
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.nlp_core import (  # noqa: E402
+    IncrementalAnalyzer, analyze_resume_vs_jd, compute_similarity, suggest_resume_bullets,
+)
+from scripts.metrics import METRICS  # noqa: E402
 
 resume = """
 Data Scientist with experience in Python, SQL, and machine learning.
@@ -11,9 +19,23 @@ and cloud platforms such as AWS. The role involves building predictive models
 and communicating insights effectively.
 """
 
-skills_yaml = "../data/skills.yaml"
+skills_yaml = os.path.join(os.path.dirname(__file__), "..", "data", "skills.yaml")
 
 print("Similarity Score:", compute_similarity(resume, job_desc))
-missing = extract_keyword_gaps(resume, job_desc, skills_yaml)
-print("Missing Keywords:", missing)
-print("Suggested Bullets:", suggest_bullets(missing))
+out = analyze_resume_vs_jd(resume, job_desc, skills_yaml)
+missing = sorted({m for info in out["taxonomy_coverage"].values() for m in info["missing"]})
+print("Missing Keywords:", missing or out["semantic_missing"])
+print("Suggested Bullets:", suggest_resume_bullets(resume, job_desc, missing))
+
+# Incremental re-analysis: editing one paragraph must encode exactly one new text
+resume_doc = resume.strip() + "\n\nLed a team of analysts on churn prediction.\n\nCertified in Tableau."
+analyzer = IncrementalAnalyzer(skills_yaml)
+analyzer.analyze(resume_doc, job_desc, generate_bullets=False)
+before = METRICS.snapshot()["counters"]
+edited = resume_doc.replace("Certified in Tableau.", f"Certified in Tableau and Power BI ({os.getpid()}).")
+analyzer.analyze(edited, job_desc, generate_bullets=False)
+after = METRICS.snapshot()["counters"]
+encoded = after.get("embed_cache.misses", 0) - before.get("embed_cache.misses", 0)
+paragraphs = after.get("incremental.paragraph_misses", 0) - before.get("incremental.paragraph_misses", 0)
+assert paragraphs == 1 and encoded == 1, f"one-paragraph edit re-encoded {encoded} texts ({paragraphs} paragraphs)"
+print("Incremental edit: 1 paragraph re-encoded ✅")
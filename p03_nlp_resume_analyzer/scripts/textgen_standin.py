@@ -0,0 +1,66 @@
+# scripts/textgen_standin.py
+
+"""
+Local stand-in for the HF text-generation inference endpoint.
+
+Answers any POST with `[{"generated_text": ...}]` after an optional delay, so
+the deadline, fallback and response cache of bullet generation can be
+exercised offline:
+
+    python scripts/textgen_standin.py --port 8089 --delay 0.5
+    NLP_TEXTGEN_URL=http://127.0.0.1:8089/models/zephyr streamlit run app/Main.py
+
+With --delay above NLP_GENERATION_DEADLINE_SECONDS the app falls back to the
+template bullets.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import re
+import time
+
+
+def make_handler(delay: float, fail: bool):
+    class _TextGenHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            time.sleep(delay)
+            if fail:
+                self.send_error(503, "Model is loading")
+                return
+            m = re.search(r"Missing skills to emphasize: (.*)", payload.get("inputs", ""))
+            skills = [s.strip() for s in m.group(1).split(",")] if m else []
+            skills = [s for s in skills if s and s != "none"] or ["cross-functional delivery"]
+            text = "\n".join(f"- Delivered measurable results applying {s} in production work." for s in skills[:6])
+            data = json.dumps([{"generated_text": text}]).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, fmt, *args):
+            print(f"🛰️  {self.address_string()} {fmt % args}")
+
+    return _TextGenHandler
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--delay", type=float, default=0.0, help="Seconds to sleep before answering")
+    ap.add_argument("--fail", action="store_true", help="Answer every request with HTTP 503")
+    args = ap.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.delay, args.fail))
+    print(f"✅ Stand-in text-generation endpoint on http://{args.host}:{args.port}/ (delay {args.delay}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,40 @@
+import hashlib
 import os
+import sys
 import streamlit as st
-import pandas as pd
 import boto3
-from io import BytesIO
+from botocore.config import Config
 from PIL import Image
-import faiss
 import numpy as np
 from sentence_transformers import SentenceTransformer
 import requests
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.faiss_io import read_index, set_search_params  # noqa: E402
+from scripts.metadata_store import MetadataStore  # noqa: E402
+from scripts.image_fetch import FETCH_TIMEOUT, IMAGE_FETCH_WORKERS, OBJECT_STORE_URL, ImageFetcher, object_url  # noqa: E402
+
 BUCKET_NAME = "portfolio-curated-jomana"
-PROCESSED_PATH = "processed/multimodal_metadata_s3.csv"
+PROCESSED_PATH = "processed/multimodal_metadata.arrow"
+METADATA_CACHE_DIR = os.path.join(".cache", "metadata")
+RESULT_COLUMNS = ["image_path", "caption", "source", "s3_path", "thumb_s3_path"]
 INDEX_DIR = "indexes"
 MODEL_NAME = "sentence-transformers/clip-ViT-B-32"
+# Memory-map indexes read-only: pages are shared across worker processes via the OS page cache
+FAISS_MMAP = os.getenv("FAISS_MMAP", "1") != "0"
+# Query-time ANN knobs; unset keeps the defaults stored by build_faiss_index.py
+FAISS_NPROBE = int(os.environ["FAISS_NPROBE"]) if os.getenv("FAISS_NPROBE") else None
+FAISS_EF_SEARCH = int(os.environ["FAISS_EF_SEARCH"]) if os.getenv("FAISS_EF_SEARCH") else None
 
 st.set_page_config(page_title="🧠 Multimodal Search", layout="wide")
 
 @st.cache_resource(show_spinner=False)
 def get_s3_client():
     """Create a boto3 S3 client using Streamlit secrets if available."""
+    if OBJECT_STORE_URL:
+        st.sidebar.info(f"🪣 Using object store at {OBJECT_STORE_URL}.")
+        return None
     try:
         aws_secrets = st.secrets.get("aws", None)
         if aws_secrets:
@@ -28,7 +44,8 @@ def get_s3_client():
                 region_name=aws_secrets.get("AWS_DEFAULT_REGION", "us-east-1"),
             )
             st.sidebar.success("✅ AWS credentials loaded from Streamlit secrets.")
-            return session.client("s3")
+            # The client is shared by the image-fetch threads: size its connection pool to match
+            return session.client("s3", config=Config(max_pool_connections=IMAGE_FETCH_WORKERS))
         else:
             st.sidebar.warning("⚠️ No AWS credentials found in Streamlit secrets — using public URLs.")
             return None
@@ -43,33 +60,51 @@ def load_model():
     return SentenceTransformer(MODEL_NAME)
 
 @st.cache_resource(show_spinner=False)
-def load_faiss_index(index_path):
-    index = faiss.read_index(index_path)
-    return index
+def load_faiss_index(index_path, mmap=FAISS_MMAP):
+    index = read_index(index_path, mmap=mmap)
+    return set_search_params(index, nprobe=FAISS_NPROBE, ef_search=FAISS_EF_SEARCH)
 
-@st.cache_data(show_spinner=False)
-def load_metadata_from_s3(bucket_name, key):
+def metadata_version(bucket_name, key):
+    """Cache name for the remote metadata: a hash of its ETag, else of Last-Modified + Content-Length.
+    None when the store sends no validator, so the file is always re-downloaded."""
     if s3_client:
-        obj = s3_client.get_object(Bucket=bucket_name, Key=key)
-        return pd.read_csv(obj["Body"])
+        validator = s3_client.head_object(Bucket=bucket_name, Key=key)["ETag"]
     else:
-        url = f"https://{bucket_name}.s3.amazonaws.com/{key}"
-        return pd.read_csv(url)
+        response = requests.head(object_url(bucket_name, key), timeout=FETCH_TIMEOUT)
+        response.raise_for_status()
+        headers = response.headers
+        if headers.get("ETag"):
+            validator = headers["ETag"]
+        elif headers.get("Last-Modified"):
+            validator = f"{headers['Last-Modified']}|{headers.get('Content-Length', '')}"
+        else:
+            return None
+    return hashlib.sha256(validator.encode("utf-8")).hexdigest()[:16]
 
-@st.cache_data(show_spinner=False)
-def load_image_from_s3(bucket_name, key):
-    """Load an image from S3 using credentials or public URL."""
-    try:
+@st.cache_resource(show_spinner=False)
+def load_metadata_from_s3(bucket_name, key):
+    """Download the Arrow metadata once per version (ETag / Last-Modified), then memory-map it; rows are read per lookup."""
+    url = object_url(bucket_name, key)
+    version = metadata_version(bucket_name, key)
+    local_path = os.path.join(METADATA_CACHE_DIR, f"{version or 'unversioned'}.arrow")
+    if version is None or not os.path.exists(local_path):
+        os.makedirs(METADATA_CACHE_DIR, exist_ok=True)
+        tmp = f"{local_path}.{os.getpid()}.tmp"
         if s3_client:
-            obj = s3_client.get_object(Bucket=bucket_name, Key=key)
-            return Image.open(BytesIO(obj["Body"].read()))
+            s3_client.download_file(bucket_name, key, tmp)
         else:
-            url = f"https://{bucket_name}.s3.amazonaws.com/{key}"
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            return Image.open(response.raw)
-    except Exception as e:
-        raise RuntimeError(f"Could not load image {key}: {e}")
+            with requests.get(url, stream=True, timeout=FETCH_TIMEOUT) as response:
+                response.raise_for_status()
+                with open(tmp, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=1 << 20):
+                        f.write(chunk)
+        os.replace(tmp, local_path)
+    return MetadataStore(local_path)
+
+@st.cache_resource(show_spinner=False)
+def get_image_fetcher():
+    """Pooled, concurrent image downloads backed by a size-bounded disk cache (see scripts/image_fetch.py)."""
+    return ImageFetcher(BUCKET_NAME, s3_client)
 
 def search_index(index, query_vector, top_k=5):
     distances, indices = index.search(np.array([query_vector]), top_k)
@@ -118,22 +153,32 @@ def main():
 
 def show_results(metadata, indices, distances):
     st.subheader("📸 Search Results")
-    for i, idx in enumerate(indices):
-        row = metadata.iloc[idx]
-        s3_uri = row.get("s3_path") or row.get("image_path")
-
-        if pd.isna(s3_uri):
+    # FAISS ids are metadata row ids: only the k result rows are read
+    hits = []
+    for row, distance in zip(metadata.lookup(indices, RESULT_COLUMNS), distances):
+        if row is None:
             continue
-
-        s3_key = get_s3_key_from_uri(s3_uri)
-        try:
-            image = load_image_from_s3(BUCKET_NAME, s3_key)
-            st.image(image, caption=f"{row.get('caption', '')}\n{row.get('source', '')}", use_container_width=True)
-        except Exception as e:
-            st.warning(f"⚠️ Failed to load image: {s3_key} ({e})")
-
-        st.write(f"**Source:** {row.get('source', 'Unknown')} | **Distance:** {distances[i]:.4f}")
+        # Display-size derivative when built (scripts/build_thumbnails.py), else the original
+        s3_uri = row.get("thumb_s3_path") or row.get("s3_path") or row.get("image_path")
+        if not s3_uri:
+            continue
+        hits.append((row, distance, get_s3_key_from_uri(s3_uri)))
+
+    # Lay out every result in rank order, then fill images in as their downloads finish
+    slots = []
+    for row, distance, s3_key in hits:
+        slot = st.empty()
+        slot.caption(f"⏳ Loading {s3_key}...")
+        st.write(f"**Source:** {row.get('source', 'Unknown')} | **Distance:** {distance:.4f}")
         st.divider()
+        slots.append(slot)
+
+    for i, result in get_image_fetcher().fetch_many([s3_key for _, _, s3_key in hits]):
+        row, _, s3_key = hits[i]
+        if isinstance(result, Exception):
+            slots[i].warning(f"⚠️ Failed to load image: {s3_key} ({result})")
+        else:
+            slots[i].image(result, caption=f"{row.get('caption', '')}\n{row.get('source', '')}", use_container_width=True)
 
 if __name__ == "__main__":
     main()
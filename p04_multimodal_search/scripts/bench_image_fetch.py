@@ -0,0 +1,91 @@
+# scripts/bench_image_fetch.py
+
+"""
+Result-page image fetch benchmark against the stand-in object store.
+
+Compares the old serial pattern (one fresh `requests.get` per image) with
+`ImageFetcher.fetch_many` on a cold and a warm disk cache, and checks that the
+cache stays within its byte bound.
+
+    python scripts/object_store_standin.py --root data/sources --port 9000 --delay 0.1 &
+    python scripts/bench_image_fetch.py --url http://localhost:9000 --keys keys.txt --k 5
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.image_fetch import DiskLRU, ImageFetcher  # noqa: E402
+
+
+def pages(keys, k):
+    return [keys[i:i + k] for i in range(0, len(keys) - k + 1, k)]
+
+
+def run_serial(url, keys, k):
+    times = []
+    for page in pages(keys, k):
+        start = time.perf_counter()
+        for key in page:
+            response = requests.get(f"{url}/{key}", timeout=10)
+            response.raise_for_status()
+            _ = response.content
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run_fetcher(fetcher, keys, k):
+    times, first = [], []
+    for page in pages(keys, k):
+        start = time.perf_counter()
+        for n, (_, result) in enumerate(fetcher.fetch_many(page)):
+            if isinstance(result, Exception):
+                raise result
+            if n == 0:
+                first.append(time.perf_counter() - start)
+        times.append(time.perf_counter() - start)
+    return times, first
+
+
+def fmt(times):
+    return f"p50 {np.percentile(times, 50) * 1000:8.1f} ms   p99 {np.percentile(times, 99) * 1000:8.1f} ms"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark result-page image fetching.")
+    ap.add_argument("--url", default="http://localhost:9000", help="Stand-in object store URL")
+    ap.add_argument("--keys", required=True, help="File with one object key per line")
+    ap.add_argument("--k", type=int, default=5, help="Images per result page")
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--cache-mb", type=float, default=64)
+    args = ap.parse_args()
+
+    with open(args.keys) as f:
+        keys = [line.strip() for line in f if line.strip()]
+    cache_dir = tempfile.mkdtemp(prefix="image_cache_")
+    try:
+        cache = DiskLRU(cache_dir, int(args.cache_mb * 1024 * 1024))
+        fetcher = ImageFetcher("stand-in", base_url=args.url.rstrip("/"), cache=cache, workers=args.workers)
+
+        print(f"🖼️ {len(pages(keys, args.k))} pages of {args.k} images from {args.url}")
+        print(f"serial       {fmt(run_serial(args.url, keys, args.k))}")
+        cold, first = run_fetcher(fetcher, keys, args.k)
+        print(f"pooled cold  {fmt(cold)}   first image p50 {np.percentile(first, 50) * 1000:.1f} ms")
+        warm, _ = run_fetcher(fetcher, keys, args.k)
+        print(f"pooled warm  {fmt(warm)}")
+        used = sum(e.stat().st_size for e in os.scandir(cache_dir))
+        print(f"💾 cache {used / 1e6:.1f} MB on disk (bound {args.cache_mb:g} MB)")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# scripts/bench_index_load.py
+
+"""
+Startup benchmark: full-load vs memory-mapped FAISS indexes.
+
+Starts --procs worker processes per mode, the way Streamlit replicas would
+start. Each worker loads the index, answers a few queries, and reports its
+load time and memory. Memory is split into private heap (RssAnon),
+file-backed pages (RssFile) and proportional set size (Pss). All workers stay
+alive until every one has reported. Pss is the real per-process cost: shared
+mmap pages are split between the processes that map them. The run fails if
+mmap does not keep at least half of the index size out of the private heap
+(RssAnon), e.g. for flat indexes on a faiss without IO_FLAG_MMAP_IFC.
+
+    python scripts/bench_index_load.py --index indexes/image_index.faiss --procs 4
+    python scripts/bench_index_load.py --synthetic 500000 --procs 4   # no corpus needed
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import faiss
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.faiss_io import HAS_MMAP_IFC, read_index  # noqa: E402
+
+DEFAULT_INDEXES = [os.path.join("indexes", "image_index.faiss"), os.path.join("indexes", "text_index.faiss")]
+N_QUERIES = 20
+MIN_SAVED_FRACTION = 0.5  # mmap must keep at least half the index size out of each process's private heap
+
+
+def memory_kb() -> dict:
+    """RssAnon / RssFile from /proc/self/status and Pss from smaps_rollup (Linux)."""
+    out = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(("RssAnon:", "RssFile:")):
+                    out[line.split(":")[0]] = int(line.split()[1])
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    out["Pss"] = int(line.split()[1])
+    except OSError:
+        import resource
+        out["MaxRss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return out
+
+
+def worker(paths, mmap, barrier, results):
+    start = time.perf_counter()
+    indexes = [read_index(p, mmap=mmap) for p in paths]
+    load_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(os.getpid())
+    start = time.perf_counter()
+    for index in indexes:
+        q = rng.standard_normal((N_QUERIES, index.d)).astype(np.float32)
+        faiss.normalize_L2(q)
+        index.search(q, 5)
+    query_ms = (time.perf_counter() - start) / (N_QUERIES * len(indexes)) * 1000
+
+    barrier.wait()  # measure while every replica is alive
+    results.put({"load_s": load_s, "query_ms": query_ms, **memory_kb()})
+    barrier.wait()
+
+
+def run_mode(paths, mmap: bool, procs: int) -> dict:
+    ctx = mp.get_context("spawn")
+    barrier, results = ctx.Barrier(procs), ctx.Queue()
+    workers = [ctx.Process(target=worker, args=(paths, mmap, barrier, results)) for _ in range(procs)]
+    for w in workers:
+        w.start()
+    rows = [results.get() for _ in workers]
+    for w in workers:
+        w.join()
+
+    summary = {"mode": "mmap" if mmap else "full", "procs": procs}
+    for key in rows[0]:
+        vals = [r[key] for r in rows]
+        summary[key] = round(float(np.mean(vals)), 4 if key.endswith("_s") else 2)
+    return summary
+
+
+def synthetic_index(n: int, d: int = 512) -> str:
+    print(f"🧪 Building a synthetic {n:,} x {d} IndexFlatIP...")
+    x = np.random.default_rng(0).standard_normal((n, d)).astype(np.float32)
+    faiss.normalize_L2(x)
+    index = faiss.IndexFlatIP(d)
+    index.add(x)
+    path = os.path.join(tempfile.mkdtemp(prefix="faiss_bench_"), "synthetic.faiss")
+    faiss.write_index(index, path)
+    return path
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare full-load and mmap-load FAISS startup.")
+    ap.add_argument("--index", action="append", help="Index file (repeatable; default: the app's two indexes)")
+    ap.add_argument("--synthetic", type=int, default=0, help="Benchmark a synthetic flat index with N vectors")
+    ap.add_argument("--procs", type=int, default=4, help="Concurrent worker processes per mode")
+    ap.add_argument("--out", help="Optional JSON file for the results")
+    args = ap.parse_args()
+
+    paths = [synthetic_index(args.synthetic)] if args.synthetic else (args.index or DEFAULT_INDEXES)
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        raise FileNotFoundError(f"Missing index files: {missing}")
+    size_mb = sum(os.path.getsize(p) for p in paths) / 1e6
+    print(f"📦 {len(paths)} index file(s), {size_mb:,.1f} MB on disk, {args.procs} processes per mode")
+
+    rows = [run_mode(paths, mmap, args.procs) for mmap in (False, True)]
+    print(f"\n{'mode':<6} {'load s':>8} {'query ms':>9} {'anon MB':>9} {'file MB':>9} {'pss MB':>9}")
+    for r in rows:
+        print(f"{r['mode']:<6} {r['load_s']:>8.4f} {r['query_ms']:>9.2f} {r.get('RssAnon', 0) / 1024:>9.1f} "
+              f"{r.get('RssFile', 0) / 1024:>9.1f} {r.get('Pss', 0) / 1024:>9.1f}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"index_mb": round(size_mb, 1), "results": rows}, f, indent=2)
+        print(f"💾 Results saved → {args.out}")
+
+    full, mapped = rows
+    if "RssAnon" in full:
+        saved_mb = (full["RssAnon"] - mapped["RssAnon"]) * 1024 / 1e6
+        print(f"📉 mmap keeps {saved_mb:,.1f} MB per process out of the private heap")
+        if saved_mb < MIN_SAVED_FRACTION * size_mb:
+            raise SystemExit(f"❌ mmap load did not reduce private memory ({saved_mb:,.1f} of {size_mb:,.1f} MB); "
+                             f"IO_FLAG_MMAP_IFC available: {HAS_MMAP_IFC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,19 @@
 
 """
 Combine all metadata sources (COCO, Fashion, Unsplash) into a unified CSV.
-Adds full S3 paths for image access.
+Adds full S3 paths for image access, and a `row_id` (the row's position) that
+embeddings and FAISS ids carry, plus a memory-mappable Arrow copy for the app.
 """
 
 import os
+import sys
+import numpy as np
 import pandas as pd
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.metadata_store import write_metadata  # noqa: E402
+
 # Local and remote configuration
 DATA_DIR = "data/sources"
 OUT_DIR = "data/processed"
@@ -75,15 +82,20 @@ def main():
     # Add S3-compatible paths
     combined["s3_path"] = combined["image_path"].apply(convert_to_s3_path)
 
+    # Row ids become the FAISS ids (see generate_embeddings.py / build_faiss_index.py)
+    combined.insert(0, "row_id", np.arange(len(combined), dtype=np.int64))
+
     # Save both versions (local + S3)
     local_out = os.path.join(OUT_DIR, "multimodal_metadata.csv")
     s3_out = os.path.join(OUT_DIR, "multimodal_metadata_s3.csv")
+    arrow_out = os.path.join(OUT_DIR, "multimodal_metadata.arrow")
 
     combined.to_csv(local_out, index=False)
     combined.to_csv(s3_out, index=False)
+    write_metadata(combined, arrow_out)
 
     print(f"📦 Combined total entries: {len(combined):,}")
-    print(f"✅ Saved unified metadata → {s3_out}")
+    print(f"✅ Saved unified metadata → {s3_out}, {arrow_out}")
     print(combined.head())
 
 
@@ -2,56 +2,201 @@
 
 """
 Build FAISS indexes from CLIP embeddings (image + text).
+
+The index type is configurable (FAISS_INDEX_TYPE):
+- flat      exact inner product (IndexFlatIP), cost grows linearly with the corpus
+- ivf-flat  inverted file over FAISS_NLIST k-means cells, full vectors
+- ivf-pq    inverted file + product quantization (FAISS_PQ_M bytes per vector)
+- hnsw      HNSW graph (FAISS_HNSW_M links per node)
+
+IVF indexes are trained on a random sample of FAISS_TRAIN_SAMPLE vectors.
+The default query-time knobs (FAISS_NPROBE for IVF, FAISS_EF_SEARCH for HNSW)
+are stored in the index; the app can override them with the same variables.
+FAISS ids are the metadata `row_id`s carried in the embedding batches (row
+positions for batches written before row ids existed).
+
+A build report (data/indexes/build_report.json) sweeps nprobe / efSearch and
+records recall@k against the exact flat index, p50/p99 single-query latency
+and index size on disk, to pick a speed/accuracy point for the corpus.
 """
 
+import json
 import os
+import sys
+import time
+
 import numpy as np
 import pandas as pd
 import faiss
 import pyarrow.parquet as pq
-from transformers import CLIPProcessor, CLIPModel
-import torch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.faiss_io import set_search_params  # noqa: E402
 
 EMB_DIR = "data/embeddings"
 INDEX_DIR = "data/indexes"
 os.makedirs(INDEX_DIR, exist_ok=True)
 
-DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
-model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32").to(DEVICE)
-processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+INDEX_TYPE = os.getenv("FAISS_INDEX_TYPE", "flat")
+NLIST = int(os.getenv("FAISS_NLIST", "0"))          # 0 = about 4 * sqrt(n)
+PQ_M = int(os.getenv("FAISS_PQ_M", "64"))           # sub-quantizers; must divide the dimension
+HNSW_M = int(os.getenv("FAISS_HNSW_M", "32"))
+TRAIN_SAMPLE = int(os.getenv("FAISS_TRAIN_SAMPLE", "100000"))
+NPROBE = int(os.getenv("FAISS_NPROBE", "16"))
+EF_SEARCH = int(os.getenv("FAISS_EF_SEARCH", "64"))
+
+# Build report
+REPORT_QUERIES = int(os.getenv("FAISS_REPORT_QUERIES", "1000"))
+REPORT_K = 10
+NPROBE_SWEEP = [1, 4, 16, 64]
+EF_SEARCH_SWEEP = [16, 32, 64, 128]
+
+
+def index_spec(index_type: str, n: int, d: int) -> str:
+    """FAISS index_factory string for an index type and corpus size."""
+    nlist = NLIST or max(1, min(int(4 * np.sqrt(n)), n // 39))  # k-means wants >= 39 points per cell
+    specs = {
+        "flat": "Flat",
+        "ivf-flat": f"IVF{nlist},Flat",
+        "ivf-pq": f"IVF{nlist},PQ{PQ_M}",
+        "hnsw": f"HNSW{HNSW_M},Flat",
+    }
+    if index_type not in specs:
+        raise ValueError(f"Unknown FAISS_INDEX_TYPE '{index_type}' (expected one of {sorted(specs)})")
+    if index_type == "ivf-pq" and d % PQ_M:
+        raise ValueError(f"FAISS_PQ_M={PQ_M} must divide the embedding dimension {d}")
+    return specs[index_type]
+
+
+def build_index(vectors: np.ndarray, ids: np.ndarray, index_type: str = INDEX_TYPE):
+    """Build an inner-product index over L2-normalized vectors with the given ids, training on a sample if needed."""
+    spec = index_spec(index_type, *vectors.shape)
+    if not spec.startswith("IVF"):
+        spec = f"IDMap,{spec}"  # IVF lists store ids themselves
+    index = faiss.index_factory(vectors.shape[1], spec, faiss.METRIC_INNER_PRODUCT)
+    if not index.is_trained:
+        rng = np.random.default_rng(0)
+        sample = vectors[rng.choice(len(vectors), min(TRAIN_SAMPLE, len(vectors)), replace=False)]
+        print(f"🏋️ Training {spec} on {len(sample):,} vectors...")
+        index.train(sample)
+    index.add_with_ids(vectors, ids)
+    set_search_params(index, nprobe=NPROBE, ef_search=EF_SEARCH)
+    return index, spec
+
 
-print("📦 Loading all embedding batches...")
-tables = [pq.read_table(os.path.join(EMB_DIR, f)) for f in os.listdir(EMB_DIR) if f.endswith(".parquet")]
-df = pd.concat([t.to_pandas() for t in tables])
-print(f"✅ Loaded {len(df):,} embeddings from {len(tables)} batches")
+def evaluate(index, queries: np.ndarray, ground_truth: np.ndarray, k: int = REPORT_K) -> dict:
+    """recall@k vs. exact results and p50/p99 latency of one-query-at-a-time search (as the app queries)."""
+    _, found = index.search(queries, k)
+    recall = np.mean([len(set(f) & set(g)) / k for f, g in zip(found, ground_truth)])
+    latencies = []
+    for q in queries:
+        start = time.perf_counter()
+        index.search(q[None], k)
+        latencies.append(time.perf_counter() - start)
+    return {
+        f"recall@{k}": round(float(recall), 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 3),
+    }
 
-image_embeds = np.vstack(df["image_embeds"].apply(lambda x: np.array(x, dtype=np.float32)))
-text_embeds = np.vstack(df["text_embeds"].apply(lambda x: np.array(x, dtype=np.float32)))
 
-d = image_embeds.shape[1]
-index_img = faiss.IndexFlatIP(d)
-index_txt = faiss.IndexFlatIP(d)
+def build_report(name: str, index, spec: str, vectors: np.ndarray, ids: np.ndarray, path: str) -> dict:
+    """Sweep the query-time knob for the index type and measure it against the exact flat index."""
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(len(vectors), min(REPORT_QUERIES, len(vectors)), replace=False)]
+    flat = faiss.IndexFlatIP(vectors.shape[1])
+    flat.add(vectors)
+    _, ground_truth = flat.search(queries, REPORT_K)
+    ground_truth = ids[ground_truth]
 
-# Normalize for cosine similarity
-faiss.normalize_L2(image_embeds)
-faiss.normalize_L2(text_embeds)
+    if INDEX_TYPE.startswith("ivf"):
+        knob, sweep = "nprobe", NPROBE_SWEEP
+    elif INDEX_TYPE == "hnsw":
+        knob, sweep = "efSearch", EF_SEARCH_SWEEP
+    else:
+        knob, sweep = None, [None]
 
-index_img.add(image_embeds)
-index_txt.add(text_embeds)
+    rows = []
+    for value in sweep:
+        if knob:
+            set_search_params(index, **{"nprobe" if knob == "nprobe" else "ef_search": value})
+        rows.append({knob or "exact": value if knob else True, **evaluate(index, queries, ground_truth)})
+    # Restore the default stored in the written index
+    set_search_params(index, nprobe=NPROBE, ef_search=EF_SEARCH)
 
-faiss.write_index(index_img, os.path.join(INDEX_DIR, "faiss_image.index"))
-faiss.write_index(index_txt, os.path.join(INDEX_DIR, "faiss_text.index"))
-print("💾 FAISS indexes saved successfully.")
+    return {
+        "index": name,
+        "spec": spec,
+        "vectors": len(vectors),
+        "size_mb": round(os.path.getsize(path) / 1e6, 2),
+        "flat_size_mb": round(vectors.nbytes / 1e6, 2),
+        "queries": len(queries),
+        "results": rows,
+    }
 
-def search(query, top_k=5):
-    inputs = processor(text=[query], return_tensors="pt", padding=True).to(DEVICE)
+
+def print_report(report: dict):
+    print(f"\n📊 {report['index']} — {report['spec']}, {report['vectors']:,} vectors, "
+          f"{report['size_mb']:,} MB on disk (flat: {report['flat_size_mb']:,} MB)")
+    for row in report["results"]:
+        print("   " + "  ".join(f"{k}={v}" for k, v in row.items()))
+
+
+def main():
+    print("📦 Loading all embedding batches...")
+    tables = [pq.read_table(os.path.join(EMB_DIR, f)) for f in sorted(os.listdir(EMB_DIR)) if f.endswith(".parquet")]
+    df = pd.concat([t.to_pandas() for t in tables], ignore_index=True)
+    print(f"✅ Loaded {len(df):,} embeddings from {len(tables)} batches")
+    if "row_id" not in df or df["row_id"].isna().any():
+        df["row_id"] = np.arange(len(df))
+    ids = df["row_id"].to_numpy(dtype=np.int64)
+
+    image_embeds = np.vstack(df["image_embeds"].apply(lambda x: np.array(x, dtype=np.float32)))
+    text_embeds = np.vstack(df["text_embeds"].apply(lambda x: np.array(x, dtype=np.float32)))
+
+    # Normalize for cosine similarity
+    faiss.normalize_L2(image_embeds)
+    faiss.normalize_L2(text_embeds)
+
+    reports = []
+    for name, vectors in (("image", image_embeds), ("text", text_embeds)):
+        start = time.perf_counter()
+        index, spec = build_index(vectors, ids)
+        path = os.path.join(INDEX_DIR, f"faiss_{name}.index")
+        faiss.write_index(index, path)
+        print(f"💾 {name} index ({spec}) saved → {path} in {time.perf_counter() - start:.1f}s")
+        report = build_report(name, index, spec, vectors, ids, path)
+        print_report(report)
+        reports.append(report)
+
+    report_path = os.path.join(INDEX_DIR, "build_report.json")
+    with open(report_path, "w") as f:
+        json.dump({"index_type": INDEX_TYPE, "k": REPORT_K, "indexes": reports}, f, indent=2)
+    print(f"\n📝 Build report saved → {report_path}")
+    return df
+
+
+def search(df, query, top_k=5):
+    import torch
+    from transformers import CLIPProcessor, CLIPModel
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32").to(device)
+    processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+    index_img = faiss.read_index(os.path.join(INDEX_DIR, "faiss_image.index"))
+
+    inputs = processor(text=[query], return_tensors="pt", padding=True).to(device)
     with torch.no_grad():
         q_emb = model.get_text_features(**inputs).cpu().numpy()
     faiss.normalize_L2(q_emb)
     D, indices = index_img.search(q_emb, top_k)
     print(f"\n🔍 Query: {query}")
+    rows = df.set_index("row_id")
     for idx in indices[0]:
-        print("→", df.iloc[idx]["image_path"], ":", df.iloc[idx]["caption"])
+        print("→", rows.loc[idx]["image_path"], ":", rows.loc[idx]["caption"])
+
 
 if __name__ == "__main__":
-    search("a red sports car", top_k=5)
+    df = main()
+    search(df, "a red sports car", top_k=5)
@@ -0,0 +1,130 @@
+# scripts/build_thumbnails.py
+
+"""
+Build display-size image derivatives for the search app.
+
+Run after build_combined_metadata.py. Every unique image in the combined
+metadata gets one thumbnail, at most THUMB_WIDTH pixels wide, as WebP (or
+JPEG). It is written under data/derivatives/w<width>/ with the same relative
+path as the source. The work runs in a process pool. Images whose derivative is
+newer than the source are skipped, so reruns only process new or changed
+images.
+
+The metadata CSVs and Arrow file get `thumb_path` (local) and `thumb_s3_path`
+columns, and the app displays `thumb_s3_path` when it is set. Sync the
+derivatives to the bucket afterwards:
+
+    aws s3 sync data/derivatives s3://portfolio-curated-jomana/derivatives
+"""
+
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import pandas as pd
+from PIL import Image, ImageOps, features
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.metadata_store import write_metadata  # noqa: E402
+
+PROCESSED_DIR = "data/processed"
+SOURCE_PREFIXES = ["data/sources/", "./data/sources/"]
+DERIVATIVES_DIR = "data/derivatives"
+BUCKET_NAME = "portfolio-curated-jomana"
+
+THUMB_WIDTH = int(os.getenv("THUMB_WIDTH", "512"))  # app column width in the wide layout
+EXTENSIONS = {"WEBP": ".webp", "JPEG": ".jpg"}
+THUMB_FORMAT = os.getenv("THUMB_FORMAT", "WEBP" if features.check("webp") else "JPEG").upper()
+THUMB_FORMAT = {"JPG": "JPEG"}.get(THUMB_FORMAT, THUMB_FORMAT)
+if THUMB_FORMAT not in EXTENSIONS:
+    raise ValueError(f"THUMB_FORMAT must be one of {', '.join(EXTENSIONS)} (or JPG), got {THUMB_FORMAT!r}")
+if THUMB_FORMAT == "WEBP" and not features.check("webp"):
+    raise ValueError("THUMB_FORMAT=WEBP but this Pillow build has no WebP support; use JPEG")
+THUMB_QUALITY = int(os.getenv("THUMB_QUALITY", "80"))
+WORKERS = int(os.getenv("THUMB_WORKERS", str(os.cpu_count() or 1)))
+
+
+def derivative_path(image_path: str) -> str:
+    """data/sources/coco/train2017/x.jpg → data/derivatives/w512/coco/train2017/x.webp"""
+    rel = image_path
+    for prefix in SOURCE_PREFIXES:
+        if rel.startswith(prefix):
+            rel = rel[len(prefix):]
+    rel = rel.lstrip("/")
+    return os.path.join(DERIVATIVES_DIR, f"w{THUMB_WIDTH}", os.path.splitext(rel)[0] + EXTENSIONS[THUMB_FORMAT])
+
+
+def to_s3_path(thumb_path: str) -> str:
+    return f"s3://{BUCKET_NAME}/derivatives/" + os.path.relpath(thumb_path, DERIVATIVES_DIR).replace(os.sep, "/")
+
+
+def make_thumbnail(image_path: str):
+    """Returns (image_path, status, source bytes, derivative bytes)."""
+    out = derivative_path(image_path)
+    tmp = f"{out}.{os.getpid()}.tmp"
+    try:
+        src_stat = os.stat(image_path)
+        if os.path.exists(out) and os.stat(out).st_mtime >= src_stat.st_mtime:
+            return image_path, "skipped", src_stat.st_size, os.path.getsize(out)
+
+        with Image.open(image_path) as img:
+            img.draft("RGB", (THUMB_WIDTH, THUMB_WIDTH))  # JPEG: decode at reduced scale
+            # Re-encoding drops the EXIF orientation tag, so apply it to the pixels first
+            img = ImageOps.exif_transpose(img).convert("RGB")
+            if img.width > THUMB_WIDTH:
+                img = img.resize((THUMB_WIDTH, max(1, round(img.height * THUMB_WIDTH / img.width))), Image.LANCZOS)
+            os.makedirs(os.path.dirname(out), exist_ok=True)
+            if THUMB_FORMAT == "WEBP":
+                img.save(tmp, THUMB_FORMAT, quality=THUMB_QUALITY, method=4)
+            else:
+                img.save(tmp, THUMB_FORMAT, quality=THUMB_QUALITY, optimize=True, progressive=True)
+        os.replace(tmp, out)
+        return image_path, "built", src_stat.st_size, os.path.getsize(out)
+    except Exception as e:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        print(f"⚠️ Failed {image_path}: {e}")
+        return image_path, "failed", 0, 0
+
+
+def main():
+    print(f"🖼️ Building w{THUMB_WIDTH} {THUMB_FORMAT} derivatives with {WORKERS} workers...")
+    meta_csv = os.path.join(PROCESSED_DIR, "multimodal_metadata.csv")
+    df = pd.read_csv(meta_csv)
+    images = df["image_path"].dropna().unique().tolist()  # COCO has several captions per image
+
+    start = time.perf_counter()
+    counts = {"built": 0, "skipped": 0, "failed": 0}
+    src_bytes = out_bytes = 0
+    done = set()
+    with Pool(WORKERS) as pool:
+        for i, (path, status, src_size, out_size) in enumerate(pool.imap_unordered(make_thumbnail, images, 64), 1):
+            counts[status] += 1
+            if status != "failed":
+                done.add(path)
+                src_bytes += src_size
+                out_bytes += out_size
+            if i % 5000 == 0:
+                print(f"   {i:,}/{len(images):,} ({counts['built']:,} built, {counts['skipped']:,} up to date)")
+    elapsed = time.perf_counter() - start
+
+    # Record derivatives in the metadata (rows whose derivative failed keep using the original)
+    thumbs = [derivative_path(p) if p in done else None for p in df["image_path"]]
+    df["thumb_path"] = thumbs
+    df["thumb_s3_path"] = [to_s3_path(t) if t else None for t in thumbs]
+    df.to_csv(meta_csv, index=False)
+    df.to_csv(os.path.join(PROCESSED_DIR, "multimodal_metadata_s3.csv"), index=False)
+    write_metadata(df, os.path.join(PROCESSED_DIR, "multimodal_metadata.arrow"))
+
+    print(f"✅ {counts['built']:,} built, {counts['skipped']:,} up to date, {counts['failed']:,} failed "
+          f"in {elapsed:.1f}s")
+    if src_bytes:
+        print(f"📉 {src_bytes / 1e6:,.1f} MB originals → {out_bytes / 1e6:,.1f} MB derivatives "
+              f"({out_bytes / src_bytes:.1%})")
+    print(f"💾 Metadata updated → {meta_csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# scripts/faiss_io.py
+
+"""
+FAISS index loading: full read into the heap, or memory-mapped read-only.
+
+A memory-mapped index is paged in lazily from the OS page cache, which every
+process reading the same file shares, so N Streamlit workers hold one copy
+of the vectors instead of N.
+
+- Flat / HNSW indexes: the code arrays are mapped with IO_FLAG_MMAP_IFC
+  (faiss >= 1.9). The HNSW graph itself is still read into memory.
+- IVF indexes: the inverted lists are mapped with IO_FLAG_MMAP.
+
+Without IO_FLAG_MMAP_IFC (faiss 1.8) only IO_FLAG_MMAP is used, which maps
+IVF lists; flat and HNSW codes are then read into the heap.
+
+A mapped index is read-only: add/remove/train are not allowed on it.
+"""
+
+import faiss
+
+MMAP_FLAGS = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+# READ_ONLY alone would silently do a full load, so only use the IFC flags when they exist
+HAS_MMAP_IFC = hasattr(faiss, "IO_FLAG_MMAP_IFC")
+MMAP_IFC_FLAGS = faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY if HAS_MMAP_IFC else MMAP_FLAGS
+
+
+def read_index(path: str, mmap: bool = True):
+    """Read a FAISS index, memory-mapped (read-only) when `mmap` is set."""
+    if not mmap:
+        return faiss.read_index(path)
+    if not HAS_MMAP_IFC:
+        return faiss.read_index(path, MMAP_FLAGS)
+    try:
+        return faiss.read_index(path, MMAP_IFC_FLAGS)
+    except RuntimeError:
+        # IVF inverted lists are mapped through a different hook
+        return faiss.read_index(path, MMAP_FLAGS)
+
+
+def set_search_params(index, nprobe: int = None, ef_search: int = None):
+    """Query-time knobs: nprobe for IVF indexes, efSearch for HNSW. Ignored where they don't apply."""
+    params = faiss.ParameterSpace()
+    for name, value in (("nprobe", nprobe), ("efSearch", ef_search)):
+        if value is None:
+            continue
+        try:
+            params.set_index_parameter(index, name, value)
+        except RuntimeError:
+            pass
+    return index
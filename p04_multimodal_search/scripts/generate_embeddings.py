@@ -38,14 +38,16 @@ for batch_idx in range(start_batch, (len(df) // BATCH_SIZE) + 1):
     if batch.empty:
         break
 
-    images, texts, image_paths = [], [], []
+    images, texts, image_paths, row_ids = [], [], [], []
 
-    for _, row in batch.iterrows():
+    for idx, row in batch.iterrows():
         try:
             image = Image.open(row["image_path"]).convert("RGB")
             images.append(image)
             texts.append(str(row["caption"]))
             image_paths.append(row["image_path"])
+            # Skipped images leave gaps, so the metadata row id travels with the embedding
+            row_ids.append(int(row["row_id"]) if "row_id" in row else int(idx))
         except Exception:
             continue
 
@@ -67,6 +69,7 @@ for batch_idx in range(start_batch, (len(df) // BATCH_SIZE) + 1):
 
     # Save batch as Parquet
     data = pa.table({
+        "row_id": pa.array(row_ids, type=pa.int64()),
         "image_path": image_paths,
         "caption": texts,
         "image_embeds": [emb.tolist() for emb in img_embeds],
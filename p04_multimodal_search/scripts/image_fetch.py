@@ -0,0 +1,137 @@
+# scripts/image_fetch.py
+
+"""
+Concurrent image fetching for search results, with a bounded disk cache.
+
+`ImageFetcher.fetch_many` downloads all top-k images at once on a thread pool
+and yields them as they arrive, so the app can render results progressively.
+It uses one pooled HTTP session, or the (thread-safe) boto3 client when AWS
+credentials are configured. Downloaded bytes go to a `DiskLRU`: one file per
+key under IMAGE_CACHE_DIR, bounded by IMAGE_CACHE_MAX_MB. The least recently
+used files are evicted first, and recency is kept in file mtimes, so several
+app processes can share the directory.
+
+Set OBJECT_STORE_URL (e.g. http://localhost:9000 from
+scripts/object_store_standin.py) to fetch `<url>/<key>` instead of S3.
+"""
+
+from typing import Iterator, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+OBJECT_STORE_URL = os.getenv("OBJECT_STORE_URL", "").rstrip("/")
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", os.path.join(".cache", "images"))
+IMAGE_CACHE_MAX_MB = float(os.getenv("IMAGE_CACHE_MAX_MB", "512"))
+IMAGE_FETCH_WORKERS = int(os.getenv("IMAGE_FETCH_WORKERS", "8"))
+FETCH_TIMEOUT = 10
+
+
+def object_url(bucket_name: str, key: str, base_url: str = OBJECT_STORE_URL) -> str:
+    """Public URL of an object: the stand-in store when configured, otherwise S3."""
+    return f"{base_url}/{key}" if base_url else f"https://{bucket_name}.s3.amazonaws.com/{key}"
+
+
+class DiskLRU:
+    def __init__(self, root: str = IMAGE_CACHE_DIR, max_bytes: int = int(IMAGE_CACHE_MAX_MB * 1024 * 1024)):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._total = sum(e.stat().st_size for e in os.scandir(root) if e.is_file() and not e.name.endswith(".tmp"))
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, name + os.path.splitext(key)[1].lower())
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # mark as recently used
+            return data
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            with self._lock:
+                try:
+                    old_size = os.stat(path).st_size  # overwriting a key replaces its bytes
+                except FileNotFoundError:
+                    old_size = 0
+                os.replace(tmp, path)
+                self._total += len(data) - old_size
+                if self._total > self.max_bytes:
+                    self._evict()
+        except OSError:
+            return
+
+    def _evict(self):
+        # Rescan: other processes share the directory. Evict to 90% so this doesn't run on every put.
+        entries = []
+        for e in os.scandir(self.root):
+            try:
+                if e.is_file() and not e.name.endswith(".tmp"):
+                    st = e.stat()
+                    entries.append((st.st_mtime, st.st_size, e.path))
+            except FileNotFoundError:
+                continue  # evicted by another process since the scan
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            total -= size
+        self._total = total
+
+
+class ImageFetcher:
+    def __init__(self, bucket_name: str, s3_client=None, base_url: str = OBJECT_STORE_URL,
+                 cache: Optional[DiskLRU] = None, workers: int = IMAGE_FETCH_WORKERS):
+        self.bucket_name = bucket_name
+        self.s3_client = None if base_url else s3_client
+        self.base_url = base_url
+        self.cache = cache or DiskLRU()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-fetch")
+
+    def fetch(self, key: str) -> bytes:
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+        if self.s3_client:
+            data = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)["Body"].read()
+        else:
+            response = self.session.get(object_url(self.bucket_name, key, self.base_url), timeout=FETCH_TIMEOUT)
+            response.raise_for_status()
+            data = response.content
+        self.cache.put(key, data)
+        return data
+
+    def fetch_many(self, keys: List[str]) -> Iterator[Tuple[int, Union[bytes, Exception]]]:
+        """Yield (position, bytes or the exception) for every key, in order of arrival."""
+        futures = {self._pool.submit(self.fetch, key): i for i, key in enumerate(keys)}
+        for fut in as_completed(futures):
+            try:
+                yield futures[fut], fut.result()
+            except Exception as e:
+                yield futures[fut], e
@@ -0,0 +1,43 @@
+# scripts/metadata_store.py
+
+"""
+Row-addressable metadata for search results.
+
+build_combined_metadata.py writes the combined metadata as an uncompressed
+Arrow IPC file (multimodal_metadata.arrow), with a `row_id` column equal to
+the row's position. The same row ids are carried through the embedding
+batches and used as the FAISS ids. Opening the file memory-maps it without
+reading any column data. A lookup reads only the requested columns of the
+k result rows, so startup time and memory do not grow with the corpus.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import pyarrow as pa
+
+METADATA_COLUMNS = ["row_id", "image_path", "caption", "source", "s3_path", "thumb_path", "thumb_s3_path"]
+
+
+def write_metadata(df, path: str):
+    """Write a metadata DataFrame (with `row_id` = position) as a memory-mappable Arrow IPC file."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+class MetadataStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._source = pa.memory_map(path, "r")
+        self.table = pa.ipc.open_file(self._source).read_all()  # zero-copy: buffers point into the map
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def lookup(self, row_ids: Sequence[int], columns: Optional[List[str]] = None) -> List[Optional[Dict]]:
+        """Rows for FAISS ids, in order; None for ids that are missing (e.g. FAISS's -1 padding)."""
+        valid = [int(i) for i in row_ids if 0 <= int(i) < len(self)]
+        # Columns missing from older metadata files (e.g. thumb_s3_path) are skipped
+        table = self.table.select([c for c in columns if c in self.table.column_names]) if columns else self.table
+        rows = iter(table.take(pa.array(valid, type=pa.int64())).to_pylist())
+        return [next(rows) if 0 <= int(i) < len(self) else None for i in row_ids]
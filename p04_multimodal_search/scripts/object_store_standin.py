@@ -0,0 +1,45 @@
+# scripts/object_store_standin.py
+
+"""
+Local stand-in for the S3 bucket: serves `<root>/<key>` at `/<key>` over HTTP.
+
+    python scripts/object_store_standin.py --root data/sources --port 9000 --delay 0.1
+    OBJECT_STORE_URL=http://localhost:9000 streamlit run app/Main.py
+
+--delay adds per-request latency to mimic a remote store.
+"""
+
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import time
+
+
+class DelayedHandler(SimpleHTTPRequestHandler):
+    delay = 0.0
+
+    def send_head(self):
+        if self.delay:
+            time.sleep(self.delay)
+        return super().send_head()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve a directory as a stand-in object store.")
+    ap.add_argument("--root", default="data/sources", help="Directory whose files are the objects")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9000)
+    ap.add_argument("--delay", type=float, default=0.0, help="Seconds of latency added to every request")
+    args = ap.parse_args()
+
+    DelayedHandler.delay = args.delay
+    server = ThreadingHTTPServer((args.host, args.port), partial(DelayedHandler, directory=args.root))
+    print(f"🪣 Serving {args.root} on http://{args.host}:{args.port} (delay {args.delay:g}s)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()